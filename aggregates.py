@@ -0,0 +1,57 @@
+# aggregates.py
+# 차트용 집계 큐브: 범주형 차원 조합별 탑승자 수를 한 번의 groupby 로 미리 계산한다.
+# - 페이지는 원본 행 대신 큐브의 셀(수백~수천 개)만 다시 묶어 쓰므로 차트 데이터 비용이 행 수와 무관하다.
+# - 행이 추가되면 추가분만 집계해 기존 큐브에 더한다 (append).
+
+import pandas as pd
+
+from features import DERIVED_COLUMNS
+
+DIMENSIONS = ['Sex_Cat', 'Pclass', 'Survived', 'AgeGroup', 'FareGroup', 'Embarked', 'SibSp', 'Parch']
+
+
+def _cells(df, dims):
+    # 필요한 파생 컬럼이 없으면 (원본 행이 들어온 경우) features 정의로 계산한다
+    columns = {dim: df[dim] if dim in df else DERIVED_COLUMNS[dim](df) for dim in dims}
+    frame = pd.DataFrame(columns, index=df.index)
+    # 결측도 하나의 셀로 보존해야 전체 합계가 원본 행 수와 일치한다
+    return frame.groupby(dims, observed=True, dropna=False).size().rename('count').reset_index()
+
+
+def _merge(a, b, dims):
+    cells = pd.concat([a, b], ignore_index=True)
+    # 범주 목록이 다르면 concat 결과가 object 가 되므로 기존 범주 순서 뒤에 새 범주를 붙여 다시 맞춘다
+    for dim in dims:
+        dtype = a[dim].dtype
+        if isinstance(dtype, pd.CategoricalDtype) and not isinstance(cells[dim].dtype, pd.CategoricalDtype):
+            new = sorted(set(cells[dim].dropna()) - set(dtype.categories))
+            cells[dim] = pd.Categorical(cells[dim], categories=list(dtype.categories) + new, ordered=dtype.ordered)
+    return cells.groupby(dims, observed=True, dropna=False)['count'].sum().reset_index()
+
+
+class AggregateCube:
+    def __init__(self, cells, dims=DIMENSIONS):
+        self.cells = cells
+        self.dims = list(dims)
+        self.total = int(cells['count'].sum())
+
+    @classmethod
+    def from_frame(cls, df, dims=DIMENSIONS):
+        return cls(_cells(df, dims), dims)
+
+    def append(self, df):
+        # 추가된 행만 집계해 더한 새 큐브를 돌려준다 (기존 큐브는 여러 세션이 공유하므로 수정하지 않음)
+        return self.merge(AggregateCube.from_frame(df, self.dims))
+
+    def merge(self, other):
+        return AggregateCube(_merge(self.cells, other.cells, self.dims), self.dims)
+
+    def counts(self, *dims, observed=True, dropna=True):
+        # 지정한 차원별 탑승자 수 (value_counts / groupby().size() 와 같은 모양)
+        # observed=False 이면 범주형 차원의 모든 범주를 0 포함해 돌려준다
+        counts = self.cells.groupby(list(dims), observed=observed, dropna=dropna)['count'].sum()
+        return counts.astype('int64')
+
+    def crosstab(self, index, columns):
+        # index × columns 교차표 (없는 조합은 0)
+        return self.counts(index, columns).unstack(fill_value=0)
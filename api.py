@@ -0,0 +1,462 @@
+# api.py
+# Streamlit UI 없이 다른 시스템에서 탑승자 생존 예측 / 집계 통계를 조회하는 ASGI(비동기) 서비스.
+# - 데이터 · 집계 큐브 · 요약 통계 · 등록된 모델은 대시보드와 같은 utils 로더를 그대로 사용한다.
+# - 동시에 들어온 단일 예측 요청은 짧은 시간 동안 모아 한 번의 벡터화 predict 호출로 처리한다 (micro-batching).
+# - 요청 경로별 지연시간 히스토그램은 instrumentation 에 기록되어 /metrics 에서 Prometheus 형식으로 볼 수 있다.
+# - 웹 프레임워크 없이 ASGI 규격만 구현했으며, 서버로 uvicorn(requirements.txt)을 사용한다.
+#
+# 사용 예)
+#   python api.py --port 8000
+#   uvicorn api:app --workers 2
+#   curl -X POST localhost:8000/predict/single -d '{"sex": "female", "pclass": 1, "fare": 80}'
+#
+# 엔드포인트
+#   GET  /health                  상태, 데이터 버전, 모델 키, 모델이 데이터보다 오래되었는지
+#   POST /predict                 {"passengers": [{"Sex", "Pclass", "SibSp", "Parch", "Fare"}, ...]} → 행별 예측
+#   POST /predict/single          {"sex", "pclass", "sibsp", "parch", "fare"} → 단일 예측 (micro-batch, sibsp / parch 는 생략 시 0)
+#   GET  /stats/summary           총 탑승자 / 생존자 / 사망자 / 생존율
+#   GET  /stats/charts            대시보드 차트 id 목록
+#   GET  /stats/charts/{chart_id} 대시보드 차트와 같은 집계 값
+#   GET  /stats/counts?by=Pclass&by=Survived  집계 큐브의 임의 차원 조합
+#   GET  /metrics                 Prometheus 텍스트 형식 지표
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+import pandas as pd
+
+import chart_data
+import instrumentation
+from features import SEX_CODES
+from instrumentation import timed
+from model_registry import SINGLE_ENGINE
+import utils
+
+MAX_BODY_BYTES = 50 * 1024 * 1024
+MAX_BATCH = 512
+MAX_WAIT_MS = 2.0
+# /predict 의 탑승자 필드 (모델 입력 원본 컬럼)
+NUMERIC_FIELDS = ('Pclass', 'SibSp', 'Parch', 'Fare')
+INPUT_FIELDS = ('Sex',) + NUMERIC_FIELDS
+
+# Streamlit 런타임 밖(bare mode)에서 utils 의 st.cache_resource 를 쓸 때 나오는 경고는 숨긴다
+from streamlit.logger import set_log_level
+set_log_level("error")
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+def _current_model(engine=None):
+    # engine: 단일 예측 micro-batch 는 SINGLE_ENGINE, /predict 배치는 기본값(BATCH_ENGINE)
+    meta = utils.load_survival_model_meta()
+    if meta is None:
+        raise HTTPError(503, "등록된 예측 모델이 없습니다. python train_model.py 로 학습하세요.")
+    return meta, utils.load_survival_model(meta['key'], engine)
+
+
+def _records(frame_or_series):
+    # NaN 은 JSON null 로
+    if isinstance(frame_or_series, pd.Series):
+        frame_or_series = frame_or_series.reset_index()
+    records = frame_or_series.astype(object).where(frame_or_series.notna(), None).to_dict(orient='records')
+    return [{str(k): _plain(v) for k, v in r.items()} for r in records]
+
+
+def _plain(value):
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _chart_records(chart_id, data):
+    # 차트 집계 값(chart_data) → JSON: 범주별 명수는 행 목록, 생존 교차표는 dead / survived 컬럼, 상관계수는 행렬
+    if chart_data.CHARTS[chart_id][1] == 'stats':
+        return {'columns': list(data.columns), 'matrix': [[_plain(v) for v in row] for row in data.to_numpy()]}
+    if isinstance(data, pd.Series):
+        return _records(data)
+    table = data.copy()
+    table.columns = ['dead', 'survived'] if list(table.columns) == [0, 1] else [str(c) for c in table.columns]
+    table.index = table.index.astype(object)
+    return _records(table.reset_index())
+
+
+class MicroBatcher:
+    # 동시에 들어온 단일 예측을 모아 한 번에 예측한다.
+    # 첫 요청이 도착하면 최대 max_wait_ms 동안 (또는 max_batch 개가 찰 때까지) 더 기다린 뒤 묶어서 처리.
+    def __init__(self, predict_batch, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, executor=None):
+        self.predict_batch = predict_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.executor = executor
+        self.batches = 0
+        self.items = 0
+        self.max_seen = 0
+        self._queue = None
+        self._task = None
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue()
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def submit(self, row):
+        self.start()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+            while len(batch) < self.max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            self.batches += 1
+            self.items += len(batch)
+            self.max_seen = max(self.max_seen, len(batch))
+            rows = [row for row, _ in batch]
+            try:
+                # 모델 예측은 이벤트 루프 밖(스레드 풀)에서 실행해 다른 연결 처리를 막지 않는다
+                results = await loop.run_in_executor(self.executor, self.predict_batch, rows)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    def stats(self):
+        return {"batches": self.batches, "items": self.items, "max_batch": self.max_seen,
+                "mean_batch": self.items / self.batches if self.batches else 0.0}
+
+
+def _predict_rows(rows):
+    # 단일 예측 요청들(소문자 키)을 하나의 프레임으로 묶어 한 번에 예측
+    from predict import predict_frame
+    meta, model = _current_model(SINGLE_ENGINE)
+    df = pd.DataFrame({
+        'Sex': [r['sex'] for r in rows],
+        'Pclass': [r['pclass'] for r in rows],
+        'SibSp': [r.get('sibsp', 0) for r in rows],
+        'Parch': [r.get('parch', 0) for r in rows],
+        'Fare': pd.array([r['fare'] for r in rows], dtype='float64'),  # null → NaN
+    })
+    with timed("api.micro_batch"):
+        result = predict_frame(df, model=model, features=meta['features'])
+    return [{"survived": int(s), "probability": float(p), "model_key": meta['key']}
+            for s, p in zip(result['Survived'], result['Probability'])]
+
+
+def _is_number(value):
+    # JSON 의 NaN / Infinity 도 숫자가 아닌 것으로 본다
+    return not isinstance(value, bool) and isinstance(value, (int, float)) and math.isfinite(value)
+
+
+def _passenger_frame(passengers):
+    # 행마다 필드가 모두 있고, 숫자 필드는 숫자, 성별은 male / female 인지 확인한 뒤 숫자 컬럼을 float 로 맞춘 프레임
+    # (빠진 값을 기본값으로 채워 그럴듯한 확률을 돌려주거나, 잘못된 값이 예측 중 500 이 되지 않도록 행 번호 · 필드 이름과 함께 400)
+    for i, passenger in enumerate(passengers):
+        if not isinstance(passenger, dict):
+            raise HTTPError(400, f"passengers[{i}] 는 객체여야 합니다")
+        missing = [f for f in INPUT_FIELDS if f not in passenger]
+        if missing:
+            raise HTTPError(400, f"passengers[{i}] 필수 필드 누락: {', '.join(missing)}")
+        if passenger['Sex'] not in SEX_CODES:
+            raise HTTPError(400, f'passengers[{i}].Sex 는 "male" 또는 "female" 이어야 합니다')
+        for field in NUMERIC_FIELDS:
+            value = passenger[field]
+            # 요금은 원본 데이터에도 결측이 있어 null 을 허용한다 (학습 때와 같이 0 으로 대체)
+            if not (_is_number(value) or (field == 'Fare' and value is None)):
+                raise HTTPError(400, f"passengers[{i}].{field} 는 숫자여야 합니다")
+    df = pd.DataFrame(passengers)
+    for field in NUMERIC_FIELDS:
+        df[field] = pd.to_numeric(df[field]).astype('float64')
+    return df
+
+
+def _predict_passengers(passengers):
+    from predict import predict_frame
+    df = _passenger_frame(passengers)
+    meta, model = _current_model()
+    result = predict_frame(df, model=model, features=meta['features'])
+    return {"model_key": meta['key'], "predictions": _records(result)}
+
+
+class ScoringApp:
+    def __init__(self, max_batch=MAX_BATCH, max_wait_ms=MAX_WAIT_MS, workers=4):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="titanic-api")
+        self.batcher = MicroBatcher(_predict_rows, max_batch, max_wait_ms, self.executor)
+        self.routes = {
+            ('GET', '/health'): self.health,
+            ('POST', '/predict'): self.predict,
+            ('POST', '/predict/single'): self.predict_single,
+            ('GET', '/stats/summary'): self.summary,
+            ('GET', '/stats/charts'): self.chart_list,
+            ('GET', '/stats/counts'): self.counts,
+            ('GET', '/metrics'): self.metrics,
+        }
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            await self._lifespan(receive, send)
+        elif scope['type'] == 'http':
+            await self._http(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                self.batcher.start()
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.batcher.stop()
+                self.executor.shutdown(wait=False)
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _http(self, scope, receive, send):
+        start = time.perf_counter()
+        method, path = scope['method'], scope['path'].rstrip('/') or '/'
+        handler, route, params = self._match(method, path)
+        try:
+            if handler is None:
+                raise HTTPError(405 if route else 404, "허용되지 않는 메서드" if route else "없는 경로")
+            query = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+            body = await self._read_body(receive) if method == 'POST' else None
+            status, payload = 200, await handler(body=body, query=query, **params)
+        except HTTPError as e:
+            status, payload = e.status, {"error": e.message}
+        except Exception as e:  # 처리되지 않은 오류도 JSON 500 으로 응답
+            logging.getLogger(__name__).exception("request failed: %s %s", method, path)
+            status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+
+        if isinstance(payload, str):
+            body_bytes, content_type = payload.encode('utf-8'), b'text/plain; version=0.0.4; charset=utf-8'
+        else:
+            body_bytes, content_type = json.dumps(payload, ensure_ascii=False).encode('utf-8'), b'application/json'
+        await send({'type': 'http.response.start', 'status': status,
+                    'headers': [(b'content-type', content_type), (b'content-length', str(len(body_bytes)).encode())]})
+        await send({'type': 'http.response.body', 'body': body_bytes})
+        # 요청 경로(템플릿) 단위 지연시간 히스토그램
+        instrumentation.record(f"api.{method} {route or 'unmatched'}", time.perf_counter() - start)
+
+    def _match(self, method, path):
+        if path.startswith('/stats/charts/'):
+            handler = self.chart if method == 'GET' else None
+            return handler, '/stats/charts/{chart_id}', {'chart_id': path[len('/stats/charts/'):]}
+        handler = self.routes.get((method, path))
+        known = any(p == path for _, p in self.routes)
+        return handler, path if known else None, {}
+
+    async def _read_body(self, receive):
+        chunks, size = [], 0
+        while True:
+            message = await receive()
+            chunk = message.get('body', b'')
+            size += len(chunk)
+            if size > MAX_BODY_BYTES:
+                raise HTTPError(413, "요청 본문이 너무 큽니다")
+            chunks.append(chunk)
+            if not message.get('more_body', False):
+                break
+        try:
+            return json.loads(b''.join(chunks) or b'null')
+        except ValueError:
+            raise HTTPError(400, "JSON 본문을 읽을 수 없습니다")
+
+    async def _offload(self, func, *args):
+        return await asyncio.get_running_loop().run_in_executor(self.executor, func, *args)
+
+    # 🔹 핸들러
+    async def health(self, **_):
+        meta = utils.load_survival_model_meta()
+        return {"status": "ok", "data_version": utils.get_data_version(), "model_key": meta['key'] if meta else None,
+                "model_stale": utils.is_survival_model_stale(meta) if meta else None}
+
+    async def predict(self, body, **_):
+        passengers = body.get('passengers') if isinstance(body, dict) else body
+        if not isinstance(passengers, list) or not passengers:
+            raise HTTPError(400, '{"passengers": [...]} 형식으로 보내주세요')
+        return await self._offload(_predict_passengers, passengers)
+
+    async def predict_single(self, body, **_):
+        if not isinstance(body, dict) or body.get('sex') not in ('male', 'female'):
+            raise HTTPError(400, 'sex 는 "male" 또는 "female" 이어야 합니다')
+        # 잘못된 값 하나가 같은 배치의 다른 요청까지 실패시키지 않도록 배치에 넣기 전에 검사
+        # (sibsp / parch 는 생략하면 0, 객실 등급과 요금은 기본값으로 추측하지 않는다)
+        for field in ('pclass', 'fare'):
+            if field not in body:
+                raise HTTPError(400, f"{field} 필드가 없습니다")
+        for field in ('pclass', 'sibsp', 'parch', 'fare'):
+            value = body.get(field, 0)
+            if not (_is_number(value) or (field == 'fare' and value is None)):
+                raise HTTPError(400, f"{field} 는 숫자여야 합니다")
+        _current_model(SINGLE_ENGINE)  # 모델이 없으면 배치에 넣기 전에 503
+        return await self.batcher.submit(body)
+
+    async def summary(self, **_):
+        stats = await self._offload(utils.load_numeric_stats)
+        survived = int(round(stats.sum()['Survived']))
+        return {"total": stats.rows, "survived": survived, "dead": stats.rows - survived,
+                "survival_rate": survived / stats.rows if stats.rows else None}
+
+    async def chart_list(self, **_):
+        return {"charts": sorted(chart_data.CHARTS)}
+
+    async def chart(self, chart_id, **_):
+        if chart_id not in chart_data.CHARTS:
+            raise HTTPError(404, f"없는 차트 id: {chart_id}")
+        data = await self._offload(lambda: chart_data.build(chart_id, utils.load_aggregates(), utils.load_numeric_stats()))
+        return {"chart_id": chart_id, "data": _chart_records(chart_id, data)}
+
+    async def counts(self, query, **_):
+        cube = await self._offload(utils.load_aggregates)
+        dims = query.get('by', [])
+        unknown = [d for d in dims if d not in cube.dims]
+        if not dims or unknown:
+            raise HTTPError(400, f"by 는 {', '.join(cube.dims)} 중에서 골라주세요")
+        return {"by": dims, "total": cube.total, "data": _records(cube.counts(*dims))}
+
+    async def metrics(self, **_):
+        b = self.batcher.stats()
+        lines = [
+            "# HELP titanic_api_micro_batches Number of vectorized predict calls for single requests.",
+            "# TYPE titanic_api_micro_batches counter",
+            f"titanic_api_micro_batches {b['batches']}",
+            "# HELP titanic_api_micro_batch_items Single predict requests served by micro-batches.",
+            "# TYPE titanic_api_micro_batch_items counter",
+            f"titanic_api_micro_batch_items {b['items']}",
+        ]
+        return instrumentation.prometheus_text() + "\n".join(lines) + "\n"
+
+
+app = ScoringApp()
+
+
+class Response:
+    def __init__(self, status, headers, body):
+        self.status_code = status
+        self.headers = headers
+        self.content = body
+
+    @property
+    def text(self):
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return json.loads(self.content)
+
+
+class TestClient:
+    # 네트워크 없이 같은 프로세스에서 ASGI 앱을 호출하는 클라이언트 (로컬 테스트 / 벤치마크용)
+    #   with TestClient(app) as client:
+    #       client.post('/predict/single', {"sex": "female", "pclass": 1})
+    #       client.post_many('/predict/single', [...])   # 동시 요청 → micro-batch 확인
+    __test__ = False  # pytest 가 테스트 클래스로 수집하지 않도록
+
+    def __init__(self, asgi_app=app):
+        self.app = asgi_app
+        self.loop = asyncio.new_event_loop()
+        self._lifespan_queue = None
+        self._lifespan_task = None
+
+    def __enter__(self):
+        self.loop.run_until_complete(self._startup())
+        return self
+
+    def __exit__(self, *exc):
+        self.loop.run_until_complete(self._shutdown())
+        self.loop.close()
+
+    async def _startup(self):
+        self._lifespan_queue = asyncio.Queue()
+        sent = asyncio.Queue()
+        self._lifespan_sent = sent
+        self._lifespan_task = asyncio.get_running_loop().create_task(
+            self.app({'type': 'lifespan'}, self._lifespan_queue.get, sent.put))
+        await self._lifespan_queue.put({'type': 'lifespan.startup'})
+        await sent.get()
+
+    async def _shutdown(self):
+        await self._lifespan_queue.put({'type': 'lifespan.shutdown'})
+        await self._lifespan_sent.get()
+        await self._lifespan_task
+
+    async def request_async(self, method, path, json_body=None):
+        path, _, query = path.partition('?')
+        body = b'' if json_body is None else json.dumps(json_body).encode('utf-8')
+        messages = [{'type': 'http.request', 'body': body, 'more_body': False}]
+        sent = []
+
+        async def receive():
+            return messages.pop(0) if messages else {'type': 'http.disconnect'}
+
+        async def send(message):
+            sent.append(message)
+
+        scope = {'type': 'http', 'method': method, 'path': path, 'query_string': query.encode('latin-1'), 'headers': []}
+        await self.app(scope, receive, send)
+        start = next(m for m in sent if m['type'] == 'http.response.start')
+        content = b''.join(m.get('body', b'') for m in sent if m['type'] == 'http.response.body')
+        return Response(start['status'], dict(start['headers']), content)
+
+    def request(self, method, path, json_body=None):
+        return self.loop.run_until_complete(self.request_async(method, path, json_body))
+
+    def get(self, path):
+        return self.request('GET', path)
+
+    def post(self, path, json_body):
+        return self.request('POST', path, json_body)
+
+    def post_many(self, path, bodies):
+        async def run():
+            return await asyncio.gather(*(self.request_async('POST', path, b) for b in bodies))
+        return self.loop.run_until_complete(run())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 생존 예측 REST 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    try:
+        import uvicorn
+    except ImportError:
+        raise SystemExit("uvicorn 이 설치되어 있지 않습니다: pip install uvicorn (또는 다른 ASGI 서버로 api:app 실행)")
+    uvicorn.run(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,20 @@
+import importlib
 import streamlit as st
 from streamlit_option_menu import option_menu
-from modules.home import run_home
-from modules.eda import run_survival_data
-from modules.passenger_analysis import run_passenger_analysis
-from modules.passenger_filter import run_passenger_filter
-from modules.data_page import run_data_download
+from instrumentation import timed
+
+# 메뉴 항목 → (페이지 모듈, 실행 함수)
+# 페이지 모듈은 처음 열릴 때 import 한다 → 보지 않는 페이지의 무거운 라이브러리(plotly, sklearn 등)는 로드되지 않음
+PAGES = {
+    "홈": ("modules.home", "run_home"),
+    "탑승자 분석": ("modules.passenger_analysis", "run_passenger_analysis"),
+    "탑승자 데이터 검색": ("modules.passenger_filter", "run_passenger_filter"),
+    "생존 여부 예측 모델": ("modules.eda", "run_survival_data"),
+    "데이터 다운로드": ("modules.data_page", "run_data_download"),
+}
+
+def load_page(module_name, func_name):
+    return getattr(importlib.import_module(module_name), func_name)
 
 def main():
     with st.sidebar:
@@ -15,7 +25,7 @@ def main():
         # 메뉴
         selected = option_menu(
             None,
-            ["홈", "탑승자 분석","탑승자 데이터 검색","생존 여부 예측 모델","데이터 다운로드"],  # 메뉴 항목
+            list(PAGES),  # 메뉴 항목
             icons=["house-fill", "people-fill", "search","bar-chart-line-fill", "cloud-download-fill"],
             menu_icon="cast",
             default_index=0,
@@ -36,19 +46,17 @@ def main():
                 },
             }
         )
-    # 메뉴 선택에 따른 페이지 전환
-    if selected == "홈":
-        run_home()
-    elif selected == "탑승자 분석":
-        run_passenger_analysis()
-    elif selected == "생존 여부 예측 모델":
-        run_survival_data()
-    elif selected == "탑승자 데이터 검색":
-        run_passenger_filter()
-    elif selected == "데이터 다운로드":
-        run_data_download()
-    else:
-        st.error("⚠️ 알 수 없는 메뉴입니다.")
+    # 메뉴 선택에 따른 페이지 전환 (페이지별 실행 시간 계측)
+    with timed(f"page.{selected}"):
+        if selected in PAGES:
+            load_page(*PAGES[selected])()
+        else:
+            st.error("⚠️ 알 수 없는 메뉴입니다.")
+
+    # (선택) 성능 디버그 패널
+    with st.sidebar:
+        if st.checkbox("🛠️ 성능 디버그 보기", value=False):
+            load_page("modules.debug_panel", "run_debug_panel")()
     
     # Footer
     st.markdown("<hr>", unsafe_allow_html=True)
@@ -0,0 +1,214 @@
+# benchmarks/bench_pages.py
+# 대시보드 각 페이지(및 탭)를 Streamlit AppTest 로 헤드리스 실행하며 성능을 측정한다.
+# - 데이터 크기별(기본 891 / 10만 / 100만 / 1000만 행)로 합성 데이터를 만들고
+# - 크기마다 새 프로세스에서 페이지를 실행해 실행 시간, RSS, 열린 figure 수를 기록한다.
+# - 결과는 JSON 으로 저장되며 --compare 로 두 커밋의 결과를 비교할 수 있다.
+#
+# 사용 예)
+#   python benchmarks/bench_pages.py --sizes 891 100000
+#   python benchmarks/bench_pages.py --compare benchmarks/results/a.json benchmarks/results/b.json
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+DEFAULT_SIZES = [891, 100_000, 1_000_000, 10_000_000]
+
+# (페이지 이름, 모듈, 진입 함수, 탭 종류, 탭 목록)
+PAGES = [
+    ("home", "modules.home", "run_home", None, [None]),
+    ("passenger_analysis", "modules.passenger_analysis", "run_passenger_analysis", "radio",
+     ["탑승자 분포 & 나이대 분포", "탑승 위치 분포 & 요금 분포", "가족 동반 여부"]),
+    ("survival_data", "modules.eda", "run_survival_data", "option_menu",
+     ["전체 생존/사망 비율", "성별/객실 생존 분석", "예측 모델 정확도", "모델 설명"]),
+    ("passenger_filter", "modules.passenger_filter", "run_passenger_filter", None, [None]),
+    ("data_download", "modules.data_page", "run_data_download", None, [None]),
+]
+
+
+def make_dataset(n_rows, data_dir, seed=0):
+    # data/train.csv 의 분포를 따르는 합성 탑승자 n_rows 명을 만든다 (chunk 단위로 기록)
+    from synthetic_data import write_dataset
+    write_dataset(n_rows, data_dir, seed=seed, source_dir=os.path.join(ROOT, "data"))
+
+
+def _page_script(module_name, func_name, tab_kind, tab):
+    # AppTest 안에서 실행되는 스크립트: 카드형 메뉴(option_menu)는 테스트에서 조작할 수 없어 선택 값을 고정한다
+    import importlib
+    import os
+    import sys
+    sys.path.insert(0, os.environ["TITANIC_BENCH_ROOT"])
+    module = importlib.import_module(module_name)
+    if tab_kind == "option_menu":
+        module.option_menu = lambda *args, **kwargs: tab
+    getattr(module, func_name)()
+
+
+def _rss_mb():
+    import psutil
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def _peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 1024
+
+
+def run_worker(size, timeout):
+    # 한 데이터 크기에 대해 모든 페이지/탭을 실행 (데이터/모델 경로는 호출한 쪽에서 설정)
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    for page, module_name, func_name, tab_kind, tabs in PAGES:
+        for tab in tabs:
+            at = AppTest.from_function(
+                _page_script, args=(module_name, func_name, tab_kind if tab_kind == "option_menu" else None, tab),
+                default_timeout=timeout,
+            )
+            if tab_kind == "radio":
+                # radio 탭은 위젯이 그려진 뒤에야 선택할 수 있으므로 한 번 실행해 둔다
+                at.run()
+            timings = []
+            for _ in range(2):  # 첫 실행 + 재실행(rerun)
+                if tab_kind == "radio":
+                    at.radio[0].set_value(tab)
+                start = time.perf_counter()
+                at.run()
+                timings.append(time.perf_counter() - start)
+            results.append({
+                "size": size,
+                "page": page,
+                "tab": tab,
+                "wall_s": timings[0],
+                "rerun_wall_s": timings[1],
+                "rss_mb": _rss_mb(),
+                "peak_rss_mb": _peak_rss_mb(),
+                "open_figures": len(plt.get_fignums()),
+                "exception": [e.value for e in at.exception] or None,
+            })
+    return results
+
+
+def copy_latest_model(work_dir):
+    # 모델 탭(정확도 · 모델 설명)이 안내 문구 대신 실제로 그려지도록 저장소에 등록된 최신 모델을 작업 디렉터리로 복사
+    # (모델 설명은 합성 데이터 기준으로 새로 계산된다). 등록된 모델이 없으면 False
+    registry = os.path.join(ROOT, "model", "registry")
+    try:
+        with open(os.path.join(registry, "latest.json"), encoding="utf-8") as f:
+            key = json.load(f)["key"]
+    except (OSError, ValueError, KeyError):
+        return False
+    target = os.path.join(work_dir, "model", "registry")
+    os.makedirs(os.path.join(target, key))
+    for name in ("meta.json", "forest.npz", "model.pkl"):
+        if os.path.exists(os.path.join(registry, key, name)):
+            shutil.copy2(os.path.join(registry, key, name), os.path.join(target, key, name))
+    shutil.copy2(os.path.join(registry, "latest.json"), os.path.join(target, "latest.json"))
+    return True
+
+
+def run_size(size, timeout, keep=False):
+    work_dir = tempfile.mkdtemp(prefix=f"titanic-bench-{size}-")
+    try:
+        data_dir = os.path.join(work_dir, "data")
+        start = time.perf_counter()
+        make_dataset(size, data_dir)
+        print(f"[{size:,}] 데이터 생성 {time.perf_counter() - start:.1f}s", file=sys.stderr)
+        if not copy_latest_model(work_dir):
+            print("등록된 모델이 없어 모델 탭은 안내 문구만 측정합니다 (python train_model.py)", file=sys.stderr)
+
+        # 모델 레지스트리 등 상대 경로 산출물이 저장소를 덮어쓰지 않도록 작업 디렉터리에서 실행
+        env = dict(os.environ, TITANIC_DATA_DIR=data_dir, TITANIC_BENCH_ROOT=ROOT)
+        proc = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--worker", str(size), "--timeout", str(timeout)],
+            cwd=work_dir, env=env, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(proc.stderr, file=sys.stderr)
+            raise RuntimeError(f"benchmark worker failed for size={size}")
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    finally:
+        if not keep:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(base_path, new_path):
+    with open(base_path, encoding="utf-8") as f:
+        base = {(r["size"], r["page"], r["tab"]): r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+
+    print(f"{'size':>10} {'page':<20} {'tab':<24} {'wall(base→new)':>22} {'ratio':>7}")
+    for r in new:
+        b = base.get((r["size"], r["page"], r["tab"]))
+        if b is None:
+            continue
+        ratio = r["wall_s"] / b["wall_s"] if b["wall_s"] else float("inf")
+        flag = "  ⚠️" if ratio > 1.2 else ""
+        print(f"{r['size']:>10,} {r['page']:<20} {str(r['tab'] or '-'):<24} "
+              f"{b['wall_s']:>9.3f}s → {r['wall_s']:>7.3f}s {ratio:>6.2f}x{flag}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 대시보드 페이지 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--timeout", type=float, default=1800)
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본: benchmarks/results/<commit>.json)")
+    parser.add_argument("--keep", action="store_true", help="합성 데이터 작업 디렉터리를 지우지 않음")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    parser.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.timeout), ensure_ascii=False))
+        return
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    commit = _git_commit()
+    results = []
+    for size in args.sizes:
+        results.extend(run_size(size, args.timeout, keep=args.keep))
+
+    report = {
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{commit}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    for r in results:
+        status = "❌" if r["exception"] else "✅"
+        print(f"{status} {r['size']:>10,} {r['page']:<20} {str(r['tab'] or '-'):<24} "
+              f"{r['wall_s']:.3f}s / rerun {r['rerun_wall_s']:.3f}s  rss {r['rss_mb']:.0f}MB  figs {r['open_figures']}")
+    print(f"결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,377 @@
+# benchmarks/load_test.py
+# 로컬에서 띄운 Streamlit 서버에 동시 세션 N 개를 붙여 부하를 주고 페이지별 지연시간 · 처리량 · 서버 RSS 를 기록한다.
+# - 세션은 브라우저와 같은 웹소켓 프로토콜(/_stcore/stream, BackMsg / ForwardMsg protobuf)로 rerun 을 요청한다
+# - 화면에 그려진 위젯(사이드바 메뉴, 검색 필터 등)의 id 를 응답에서 찾아 값을 바꿔 보낸다
+#   → 사이드바 메뉴로 다섯 페이지를 오가고, 검색 페이지에서는 필터 · 검색어 · 정렬 · 페이지 번호를 바꾼다
+# - 지연시간은 rerun 요청부터 script_finished 를 받을 때까지 (서버 실행 + 전송)
+# - 서버 RSS 는 일정 간격으로 샘플링해 시작 · 최대 · 끝 값과 시계열을 저장한다
+# - 결과는 JSON 으로 저장되며 --compare 로 두 결과를 비교할 수 있다
+#
+# 사용 예)
+#   python benchmarks/load_test.py --sessions 20 --duration 60
+#   python benchmarks/load_test.py --sessions 50 --duration 120 --rows 1000000 --think 0.5
+#   python benchmarks/load_test.py --url localhost:8501 --pid 12345      # 이미 실행 중인 서버
+#   python benchmarks/load_test.py --compare benchmarks/results/load-a.json benchmarks/results/load-b.json
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import numpy as np
+import psutil
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from tornado.websocket import websocket_connect
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+
+from app import PAGES  # noqa: E402  (메뉴 항목은 앱과 같은 목록을 쓴다)
+
+FILTER_PAGE = "탑승자 데이터 검색"
+EDA_PAGE = "생존 여부 예측 모델"
+# 검색 페이지에서 바꿔 볼 문자열 검색어
+TEXT_QUERIES = {"이름 검색": ["an", "mr", "john", "william", "mrs", ""], "티켓 번호 검색": ["PC", "3", "17", ""],
+                "객실 검색": ["C", "B5", "E", ""]}
+MAX_MESSAGE_BYTES = 512 * 2**20
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port, data_dir=None, timeout=120):
+    # 새 Streamlit 서버를 띄우고 health check 가 통과할 때까지 기다린다
+    env = dict(os.environ)
+    if data_dir:
+        env["TITANIC_DATA_DIR"] = data_dir
+    cmd = [sys.executable, "-m", "streamlit", "run", "app.py", "--server.headless=true", f"--server.port={port}",
+           "--server.fileWatcherType=none", "--browser.gatherUsageStats=false"]
+    server = subprocess.Popen(cmd, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"server exited:\n{server.stderr.read().decode(errors='replace')[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return server
+        except OSError:
+            time.sleep(0.2)
+    server.kill()
+    raise RuntimeError("server did not become healthy in time")
+
+
+class Session:
+    # 브라우저 탭 하나: 위젯 상태를 들고 rerun 을 요청하고, 응답에서 위젯 id 와 옵션을 모은다
+    def __init__(self, host, index, rng):
+        self.host = host
+        self.index = index
+        self.rng = rng
+        self.ws = None
+        self.states = {}   # 위젯 id → WidgetState (보낼 값)
+        self.widgets = {}  # (위치, 종류, 라벨) → 위젯 element proto
+        self.page = None
+        self.exceptions = []  # 이번 rerun 에서 페이지가 보여준 예외 메시지
+
+    async def connect(self):
+        self.ws = await websocket_connect(f"ws://{self.host}/_stcore/stream", max_message_size=MAX_MESSAGE_BYTES)
+
+    def close(self):
+        if self.ws is not None:
+            self.ws.close()
+
+    def _record(self, msg):
+        delta = msg.delta
+        if delta.WhichOneof("type") != "new_element":
+            return False
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.exceptions.append(f"{element.exception.type}: {element.exception.message}")
+            return True
+        where = "sidebar" if msg.metadata.delta_path[:1] == [1] else "main"
+        if kind == "component_instance":
+            if "option_menu" in element.component_instance.component_name:
+                self.widgets[(where, "option_menu", None)] = element.component_instance
+        elif kind in ("multiselect", "text_input", "selectbox", "number_input", "checkbox"):
+            widget = getattr(element, kind)
+            self.widgets[(where, kind, widget.label)] = widget
+        return False
+
+    async def rerun(self):
+        # 현재 위젯 상태로 rerun 을 요청하고 script_finished 까지 기다린다 → (지연시간, 받은 바이트, 예외 수)
+        back = BackMsg()
+        back.rerun_script.query_string = ""
+        back.rerun_script.page_script_hash = ""
+        back.rerun_script.widget_states.widgets.extend(self.states.values())
+        self.exceptions = []
+        start = time.perf_counter()
+        await self.ws.write_message(back.SerializeToString(), binary=True)
+        received = errors = 0
+        while True:
+            data = await self.ws.read_message()
+            if data is None:
+                raise ConnectionError("websocket closed")
+            received += len(data)
+            msg = ForwardMsg()
+            msg.ParseFromString(data)
+            kind = msg.WhichOneof("type")
+            if kind == "delta":
+                errors += self._record(msg)
+            elif kind == "script_finished":
+                if msg.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    return time.perf_counter() - start, received, errors
+
+    def _set(self, widget, **value):
+        state = WidgetState(id=widget.id)
+        self.states[widget.id] = state
+        for field, v in value.items():
+            if field == "string_array_value":
+                state.string_array_value.data.extend(v)
+            else:
+                setattr(state, field, v)
+
+    def navigate(self, page):
+        # 사이드바 메뉴 값 변경 (option_menu 컴포넌트는 선택한 항목 이름을 JSON 값으로 보낸다)
+        self._set(self.widgets[("sidebar", "option_menu", None)], json_value=json.dumps(page))
+        self.page = page
+
+    def change_filter(self):
+        # 검색 페이지 위젯 하나를 무작위로 바꾼다 → 바꾼 위젯 종류
+        rng = self.rng
+        choices = [key for key in self.widgets if key[0] == "main" and key[1] in ("multiselect", "text_input", "selectbox",
+                                                                                  "number_input")]
+        if not choices:
+            return "rerun"
+        where, kind, label = rng.choice(choices)
+        widget = self.widgets[(where, kind, label)]
+        if kind == "multiselect":
+            options = list(widget.options)
+            picked = [o for o in options if rng.random() < 0.7] or options[:1]
+            self._set(widget, string_array_value=picked)
+        elif kind == "text_input":
+            self._set(widget, string_value=rng.choice(TEXT_QUERIES.get(label, ["", "a"])))
+        elif kind == "selectbox":
+            self._set(widget, string_value=rng.choice(list(widget.options)))
+        else:
+            self._set(widget, double_value=float(rng.randint(1, 5)))
+        return f"{kind}:{label}"
+
+    def change_tab(self):
+        # 생존 예측 페이지의 카드형 메뉴 (모델 정확도 · 모델 설명 탭이 모델 로드 / 설명 계산 경합을 만든다)
+        menu = self.widgets.get(("main", "option_menu", None))
+        if menu is None:
+            return "rerun"
+        tab = self.rng.choice(json.loads(menu.json_args)["options"])
+        self._set(menu, json_value=json.dumps(tab))
+        return f"tab:{tab}"
+
+
+async def run_session(session, deadline, think, results):
+    # 첫 화면 → (메뉴 이동 | 현재 페이지 위젯 변경) 반복. 페이지를 옮길 때는 이전 페이지 위젯 상태를 버린다
+    await session.connect()
+    latency, size, errors = await session.rerun()
+    results.append({"session": session.index, "page": "홈", "action": "open", "latency_s": latency, "bytes": size,
+                    "errors": errors, "exceptions": session.exceptions, "t": time.time()})
+    page = "홈"
+    while time.time() < deadline:
+        if think:
+            await asyncio.sleep(session.rng.uniform(0, think))
+        menu = session.widgets[("sidebar", "option_menu", None)]
+        if page == FILTER_PAGE and session.rng.random() < 0.6:
+            action = session.change_filter()
+        elif page == EDA_PAGE and session.rng.random() < 0.4:
+            action = session.change_tab()
+        else:
+            page = session.rng.choice([p for p in PAGES if p != page])
+            session.states = {menu.id: session.states.get(menu.id)} if menu.id in session.states else {}
+            session.widgets = {k: v for k, v in session.widgets.items() if k[0] == "sidebar"}
+            session.navigate(page)
+            action = "navigate"
+        latency, size, errors = await session.rerun()
+        results.append({"session": session.index, "page": page, "action": action, "latency_s": latency,
+                        "bytes": size, "errors": errors, "exceptions": session.exceptions, "t": time.time()})
+    session.close()
+
+
+async def sample_rss(pid, interval, stop, samples):
+    process = psutil.Process(pid)
+    start = time.time()
+    while not stop.is_set():
+        try:
+            samples.append({"t": time.time() - start, "rss_mb": process.memory_info().rss / 2**20,
+                            "threads": process.num_threads()})
+        except psutil.Error:
+            return
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+
+
+async def run_load(host, pid, sessions, duration, think, ramp, interval, seed):
+    results, samples, stop = [], [], asyncio.Event()
+    sampler = asyncio.create_task(sample_rss(pid, interval, stop, samples)) if pid else None
+    start = time.time()
+    deadline = start + duration
+    tasks = []
+    for i in range(sessions):
+        tasks.append(asyncio.create_task(run_session(Session(host, i, random.Random(seed + i)), deadline, think, results)))
+        if ramp:
+            await asyncio.sleep(ramp / sessions)
+    outcomes = await asyncio.gather(*tasks, return_exceptions=True)
+    wall = time.time() - start
+    stop.set()
+    if sampler:
+        await sampler
+    failures = [repr(o) for o in outcomes if isinstance(o, BaseException)]
+    return results, samples, wall, failures
+
+
+def _percentiles(values):
+    values = np.asarray(values) * 1000
+    return {"n": int(len(values)), "p50_ms": float(np.percentile(values, 50)), "p90_ms": float(np.percentile(values, 90)),
+            "p99_ms": float(np.percentile(values, 99)), "max_ms": float(values.max()), "mean_ms": float(values.mean())}
+
+
+def summarize(results, samples, wall, failures):
+    by_page = {}
+    for r in results:
+        by_page.setdefault(r["page"], []).append(r)
+    pages = {page: {**_percentiles([r["latency_s"] for r in rows]),
+                    "kb_per_rerun": float(np.mean([r["bytes"] for r in rows]) / 1024),
+                    "errors": int(sum(r["errors"] for r in rows))}
+             for page, rows in by_page.items()}
+    rss = [s["rss_mb"] for s in samples]
+    return {
+        "reruns": len(results),
+        "wall_s": wall,
+        "throughput_rps": len(results) / wall if wall else 0.0,
+        "overall": _percentiles([r["latency_s"] for r in results]) if results else None,
+        "pages": pages,
+        "errors": int(sum(r["errors"] for r in results)),
+        "failed_sessions": failures,
+        "exceptions": sorted({e for r in results for e in r["exceptions"]}),
+        "rss_mb": {"start": rss[0], "peak": max(rss), "end": rss[-1]} if rss else None,
+        "rss_samples": samples,
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_summary(summary):
+    print(f"\n총 {summary['reruns']:,}회 rerun · {summary['wall_s']:.1f}s · 처리량 {summary['throughput_rps']:.2f} rerun/s"
+          f" · 페이지 예외 {summary['errors']} · 실패한 세션 {len(summary['failed_sessions'])}")
+    if summary["rss_mb"]:
+        rss = summary["rss_mb"]
+        print(f"서버 RSS: 시작 {rss['start']:.0f}MB → 최대 {rss['peak']:.0f}MB → 끝 {rss['end']:.0f}MB")
+    print(f"{'page':<16} {'n':>6} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9} {'KB/rerun':>9}")
+    for page, p in sorted(summary["pages"].items(), key=lambda item: -item[1]["p90_ms"]):
+        print(f"{page:<16} {p['n']:>6} {p['p50_ms']:>7.0f}ms {p['p90_ms']:>7.0f}ms {p['p99_ms']:>7.0f}ms "
+              f"{p['max_ms']:>7.0f}ms {p['kb_per_rerun']:>9.1f}")
+    for exception in summary["exceptions"][:5]:
+        print(f"  ⚠️ 페이지 예외: {exception[:300]}")
+    for failure in summary["failed_sessions"][:5]:
+        print(f"  ⚠️ {failure}")
+
+
+def compare(base_path, new_path):
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)["summary"]
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["summary"]
+    print(f"처리량 {base['throughput_rps']:.2f} → {new['throughput_rps']:.2f} rerun/s")
+    if base["rss_mb"] and new["rss_mb"]:
+        print(f"최대 RSS {base['rss_mb']['peak']:.0f}MB → {new['rss_mb']['peak']:.0f}MB")
+    print(f"{'page':<16} {'p50(base→new)':>22} {'p99(base→new)':>22}")
+    for page, p in new["pages"].items():
+        b = base["pages"].get(page)
+        if b is None:
+            continue
+        print(f"{page:<16} {b['p50_ms']:>8.0f}ms → {p['p50_ms']:>7.0f}ms   {b['p99_ms']:>8.0f}ms → {p['p99_ms']:>7.0f}ms")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 대시보드 동시 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, default=10, help="동시 세션 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="부하 시간 (초)")
+    parser.add_argument("--think", type=float, default=0.0, help="rerun 사이 최대 대기 시간 (초, 0~think 균등)")
+    parser.add_argument("--ramp", type=float, default=0.0, help="세션을 이 시간(초)에 걸쳐 나눠 시작")
+    parser.add_argument("--interval", type=float, default=0.5, help="서버 RSS 샘플링 간격 (초)")
+    parser.add_argument("--rows", type=int, help="이 크기의 합성 데이터로 서버 실행 (기본: data/ 원본)")
+    parser.add_argument("--url", help="이미 실행 중인 서버 host:port (주면 서버를 띄우지 않음)")
+    parser.add_argument("--pid", type=int, help="--url 서버의 프로세스 id (RSS 샘플링용)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본: benchmarks/results/load-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    server, data_dir = None, None
+    try:
+        if args.url:
+            host, pid = args.url, args.pid
+        else:
+            if args.rows:
+                from bench_pages import make_dataset
+                data_dir = tempfile.mkdtemp(prefix="titanic-load-")
+                make_dataset(args.rows, data_dir)
+            port = _free_port()
+            server = start_server(port, data_dir)
+            host, pid = f"127.0.0.1:{port}", server.pid
+        print(f"서버 {host} · 세션 {args.sessions}개 · {args.duration:.0f}초")
+        results, samples, wall, failures = asyncio.run(
+            run_load(host, pid, args.sessions, args.duration, args.think, args.ramp, args.interval, args.seed))
+    finally:
+        if server is not None:
+            server.terminate()
+            try:
+                server.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                server.kill()
+        if data_dir:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    summary = summarize(results, samples, wall, failures)
+    print_summary(summary)
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "config": {k: v for k, v in vars(args).items() if k not in ("compare", "output")},
+        "summary": summary,
+        "reruns": results,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# benchmarks/startup_profile.py
+# 앱 / 페이지 모듈의 import 비용(콜드 스타트)을 새 프로세스에서 측정한다.
+# - python -X importtime 출력을 모아 전체 import 시간과 누적 시간이 큰 모듈 상위 N 개를 보여준다
+# - import 직후 RSS 와 무거운 라이브러리(matplotlib, seaborn, sklearn, plotly, joblib)가 실제로 로드됐는지 기록
+# - --render 를 주면 AppTest 로 홈 화면을 처음 그리는 데 걸린 시간 / RSS 도 측정
+# - 결과는 JSON 으로 저장되며 --compare 로 두 결과를 비교할 수 있다
+#
+# 사용 예)
+#   python benchmarks/startup_profile.py
+#   python benchmarks/startup_profile.py --render --top 20
+#   python benchmarks/startup_profile.py --compare benchmarks/results/startup-a.json benchmarks/results/startup-b.json
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT, "benchmarks", "results")
+TARGETS = ["app", "modules.home", "modules.passenger_analysis", "modules.eda", "modules.passenger_filter",
+           "modules.data_page"]
+HEAVY = ["matplotlib", "seaborn", "sklearn", "plotly", "joblib", "scipy", "pyarrow"]
+
+_PROBE = """
+import importlib, json, sys, time
+import psutil
+start = time.perf_counter()
+importlib.import_module(sys.argv[1])
+elapsed = time.perf_counter() - start
+print("@@" + json.dumps({"wall_s": elapsed, "rss_mb": psutil.Process().memory_info().rss / 2**20,
+                         "loaded": [m for m in sys.argv[2:] if m in sys.modules]}))
+"""
+
+_RENDER = """
+import json, sys, time
+import psutil
+start = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file("app.py", default_timeout=600)
+at.run()
+print("@@" + json.dumps({"wall_s": time.perf_counter() - start, "rss_mb": psutil.Process().memory_info().rss / 2**20,
+                         "loaded": [m for m in sys.argv[1:] if m in sys.modules],
+                         "exception": [e.value for e in at.exception] or None}))
+"""
+
+
+def parse_importtime(stderr):
+    # "import time: self [us] | cumulative | imported package" 형식의 줄을 (모듈, self, cumulative, 깊이) 로
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name[1:]  # 구분자 뒤 공백 하나를 빼면 남은 들여쓰기 = 2칸 × 깊이
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append({"module": name.strip(), "self_us": int(self_us), "cumulative_us": int(cumulative_us), "depth": depth})
+    return rows
+
+
+def profile_import(target):
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", _PROBE, target, *HEAVY],
+                          cwd=ROOT, capture_output=True, text=True, env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"))
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {target} failed:\n{proc.stderr[-2000:]}")
+    probe = json.loads(next(line[2:] for line in proc.stdout.splitlines() if line.startswith("@@")))
+    rows = parse_importtime(proc.stderr)
+    # 최상위(깊이 0) 모듈의 누적 시간 합 = 인터프리터 시작 이후 전체 import 시간
+    total_us = sum(r["cumulative_us"] for r in rows if r["depth"] == 0)
+    return {"target": target, "import_total_s": total_us / 1e6, **probe,
+            "top": sorted(rows, key=lambda r: r["cumulative_us"], reverse=True)}
+
+
+def profile_render():
+    proc = subprocess.run([sys.executable, "-c", _RENDER, *HEAVY], cwd=ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"render failed:\n{proc.stderr[-2000:]}")
+    return {"target": "render:app(home)", **json.loads(next(l[2:] for l in proc.stdout.splitlines() if l.startswith("@@")))}
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def compare(base_path, new_path):
+    with open(base_path, encoding="utf-8") as f:
+        base = {r["target"]: r for r in json.load(f)["results"]}
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)["results"]
+    print(f"{'target':<30} {'wall(base→new)':>22} {'rss(base→new)':>22}")
+    for r in new:
+        b = base.get(r["target"])
+        if b is None:
+            continue
+        print(f"{r['target']:<30} {b['wall_s']:>8.3f}s → {r['wall_s']:>7.3f}s   {b['rss_mb']:>7.1f}MB → {r['rss_mb']:>7.1f}MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 대시보드 콜드 스타트(import) 프로파일")
+    parser.add_argument("--targets", nargs="+", default=TARGETS)
+    parser.add_argument("--top", type=int, default=10, help="모듈별 누적 import 시간 상위 N 개 출력")
+    parser.add_argument("--render", action="store_true", help="AppTest 로 홈 화면 첫 렌더링도 측정")
+    parser.add_argument("-o", "--output", help="결과 JSON 경로 (기본: benchmarks/results/startup-<commit>.json)")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NEW"))
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    results = [profile_import(t) for t in args.targets]
+    if args.render:
+        results.append(profile_render())
+
+    for r in results:
+        print(f"\n▶ {r['target']}: {r['wall_s']:.3f}s · RSS {r['rss_mb']:.1f}MB · 로드된 무거운 모듈: {', '.join(r['loaded']) or '-'}")
+        if r.get("exception"):
+            print(f"   ⚠️ 예외: {r['exception']}")
+        for row in r.get("top", [])[:args.top]:
+            print(f"   {row['cumulative_us'] / 1000:9.1f}ms  {'  ' * row['depth']}{row['module']}")
+
+    report = {
+        "commit": _git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        # 상위 모듈 목록은 JSON 크기를 줄이기 위해 앞부분만 저장
+        "results": [{**r, "top": r.get("top", [])[:50]} for r in results],
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"startup-{report['commit']}.json")
+    os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n결과 저장: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+# chart_cache.py
+# matplotlib 차트를 PNG/SVG 바이트로 렌더링해 (데이터 버전, 차트 id, 파라미터) 키로 캐시한다.
+# - 렌더링 직후 figure 를 닫아 세션마다 figure 가 누적되지 않도록 한다.
+# - 바이트 예산을 넘으면 가장 오래 쓰이지 않은 차트부터 제거한다 (memory_governor 의 "charts" pool, LRU).
+# - matplotlib 은 처음 차트를 그릴 때 import 한다 (캐시가 채워진 프로세스는 로드하지 않음).
+
+import io
+import json
+import threading
+
+import memory_governor
+
+_style_lock = threading.Lock()
+_styled = False
+
+
+def get_pyplot():
+    # 한글 폰트 / 마이너스 기호 설정은 프로세스에서 처음 한 번만 적용
+    global _styled
+    import matplotlib.pyplot as plt
+    with _style_lock:
+        if not _styled:
+            plt.rcParams['font.family'] = 'Malgun Gothic'
+            plt.rcParams['axes.unicode_minus'] = False
+            _styled = True
+    return plt
+
+
+def render(fig, fmt='png', dpi=200):
+    # st.pyplot 과 같은 설정으로 저장한 뒤 figure 를 바로 닫는다
+    import matplotlib.pyplot as plt
+    try:
+        buf = io.BytesIO()
+        fig.savefig(buf, format=fmt, dpi=dpi, bbox_inches='tight')
+        return buf.getvalue()
+    finally:
+        plt.close(fig)
+
+
+def chart_key(version, chart_id, params=None):
+    return json.dumps([version, chart_id, params or {}], sort_keys=True, default=str, ensure_ascii=False)
+
+
+class ChartCache:
+    # 차트 바이트는 memory_governor 의 "charts" pool 에 둔다 (바이트 예산 + LRU, 다른 캐시와 함께 사용량 집계)
+    def __init__(self, cache=None):
+        self._cache = cache if cache is not None else memory_governor.pool("charts")
+
+    def get(self, key):
+        return self._cache.get(key)
+
+    def put(self, key, data):
+        self._cache.put(key, data)
+
+    def get_or_render(self, key, build, fmt='png'):
+        # build() 는 figure 를 돌려주는 함수 → 캐시에 없을 때만 호출된다
+        return self._cache.get_or_build(key, lambda: render(build(), fmt=fmt))
+
+    def stats(self):
+        return self._cache.stats()
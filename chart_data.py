@@ -0,0 +1,67 @@
+# chart_data.py
+# 대시보드 차트가 그리는 집계 값 (차트 id 별 함수 하나)
+# - 페이지(Plotly / matplotlib 차트)와 API(/stats/charts/{chart_id})가 같은 함수를 써서 두 결과가 어긋나지 않게 한다
+# - 집계 큐브(AggregateCube) 또는 요약 통계(RunningStats)만 읽으므로 비용은 행 수와 무관하다
+
+from features import OTHER
+
+
+def survival_counts(cube):
+    return cube.counts('Survived').sort_index()
+
+
+def sex_survival(cube):
+    # 성별 × 생존 여부 (성별 결측 '기타' 는 차트에서 제외)
+    return cube.crosstab('Sex_Cat', 'Survived').drop(index=OTHER, errors='ignore')
+
+
+def pclass_survival(cube):
+    return cube.crosstab('Pclass', 'Survived')
+
+
+def sex_counts(cube):
+    return cube.counts('Sex_Cat').drop(index=OTHER, errors='ignore').sort_values(ascending=False)
+
+
+def age_group_counts(cube):
+    return cube.counts('AgeGroup', observed=False).sort_index()
+
+
+def embarked_counts(cube):
+    return cube.counts('Embarked').sort_index()
+
+
+def fare_group_counts(cube):
+    return cube.counts('FareGroup', observed=False).sort_index()
+
+
+def sibsp_counts(cube):
+    return cube.counts('SibSp').sort_index()
+
+
+def parch_counts(cube):
+    return cube.counts('Parch').sort_index()
+
+
+def correlation(stats):
+    return stats.corr()
+
+
+# 차트 id → (집계 함수, 입력: 'cube' 또는 'stats')
+CHARTS = {
+    'eda_survival_pie': (survival_counts, 'cube'),
+    'eda_sex_survival': (sex_survival, 'cube'),
+    'eda_pclass_survival': (pclass_survival, 'cube'),
+    'analysis_sex': (sex_counts, 'cube'),
+    'analysis_age_group': (age_group_counts, 'cube'),
+    'analysis_embarked': (embarked_counts, 'cube'),
+    'analysis_fare_group': (fare_group_counts, 'cube'),
+    'analysis_sibsp': (sibsp_counts, 'cube'),
+    'analysis_parch': (parch_counts, 'cube'),
+    'home_corr_heatmap': (correlation, 'stats'),
+}
+
+
+def build(chart_id, cube, stats):
+    func, source = CHARTS[chart_id]
+    return func(cube if source == 'cube' else stats)
@@ -0,0 +1,270 @@
+# data_store.py
+# 원본 CSV 를 한 번만 타입 지정된 Parquet(컬럼 기반)으로 변환해 두고 이후에는 Parquet 에서 바로 읽는다.
+# 원본 파일의 크기/수정 시각이 바뀌면 내용 해시를 다시 계산해 변경된 경우에만 재변환한다.
+# 새 탑승자 batch 는 원본을 고치지 않고 segments/<테이블>/ 에 Parquet segment 로 덧붙인다 (append-only, ingest.py).
+# 테이블 fingerprint 는 원본 해시에 segment 해시를 차례로 이어 붙인 체인 → 이전 버전에서 추가된 행만 찾을 수 있다.
+
+import hashlib
+import json
+import os
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+DATA_DIR = os.environ.get("TITANIC_DATA_DIR", "data")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+SEGMENTS_DIR = os.path.join(DATA_DIR, "segments")
+
+SOURCES = {
+    'train': 'train.csv',
+    'test': 'test.csv',
+    'gender_submission': 'gender_submission.csv',
+}
+
+# 정수는 값 범위에 맞는 최소 폭, 실수는 float32 로 저장
+# Pclass 는 상관관계·모델 입력 등 수치 연산에 쓰이므로 범주형 대신 1바이트 정수로 둔다 (메모리는 범주형 코드와 동일)
+DTYPES = {
+    'PassengerId': 'int32',
+    'Survived': 'int8',
+    'Pclass': 'int8',
+    'Age': 'float32',
+    'SibSp': 'int8',
+    'Parch': 'int8',
+    'Fare': 'float32',
+}
+CATEGORICAL = ['Sex', 'Embarked']
+
+CHUNK_SIZE = 500_000
+
+
+def source_path(name):
+    # CSV 가 없으면 같은 이름의 Parquet 원본을 사용 (synthetic_data.py --format parquet)
+    path = os.path.join(DATA_DIR, SOURCES[name])
+    parquet = os.path.splitext(path)[0] + ".parquet"
+    if not os.path.exists(path) and os.path.exists(parquet):
+        return parquet
+    return path
+
+
+def _read_source_chunks(src):
+    if src.endswith(".parquet"):
+        for batch in pq.ParquetFile(src).iter_batches(batch_size=CHUNK_SIZE):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(src, chunksize=CHUNK_SIZE)
+
+
+def _sidecar_path(name):
+    return os.path.join(CACHE_DIR, f"{name}.json")
+
+
+def _file_hash(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def _read_sidecar(name):
+    try:
+        with open(_sidecar_path(name), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_sidecar(name, info):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = f"{_sidecar_path(name)}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding='utf-8') as f:
+        json.dump(info, f)
+    os.replace(tmp, _sidecar_path(name))
+
+
+def _convert(src, dst):
+    # chunk 단위로 읽어 Parquet 으로 기록 → 변환 중 메모리 사용량은 chunk 크기로 제한된다
+    # 여러 세션 · 프로세스가 동시에 변환해도 서로의 임시 파일을 덮어쓰지 않도록 임시 파일 이름은 호출마다 다르게
+    tmp = f"{dst}.{uuid.uuid4().hex}.tmp"
+    writer = None
+    try:
+        for chunk in _read_source_chunks(src):
+            dtypes = {c: t for c, t in DTYPES.items() if c in chunk}
+            chunk = chunk.astype(dtypes)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(tmp, table.schema)
+            writer.write_table(table.cast(writer.schema))
+        if writer is not None:
+            writer.close()
+            writer = None
+        os.replace(tmp, dst)
+    finally:
+        if writer is not None:
+            writer.close()
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+def _source_fingerprint(name):
+    # 크기/수정 시각이 같으면 기존 해시를 그대로 쓰고, 다르면 내용 해시를 다시 계산한다
+    src = source_path(name)
+    st = os.stat(src)
+    info = _read_sidecar(name)
+    if info and info['size'] == st.st_size and info['mtime_ns'] == st.st_mtime_ns:
+        return info['sha256']
+
+    digest = _file_hash(src)
+    parquet = os.path.join(CACHE_DIR, f"{name}-{digest[:16]}.parquet")
+    if not os.path.exists(parquet):
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        _convert(src, parquet)
+        if info and info.get('parquet') != parquet and os.path.exists(info.get('parquet', '')):
+            try:
+                os.remove(info['parquet'])
+            except FileNotFoundError:
+                pass  # 동시에 변환한 다른 세션이 먼저 지웠다
+    _write_sidecar(name, {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'sha256': digest, 'parquet': parquet})
+    return digest
+
+
+def _segment_dir(name):
+    return os.path.join(SEGMENTS_DIR, name)
+
+
+def segments(name):
+    # 추가된 segment 목록 (추가 순서) — [{'file', 'sha256', 'rows'}, ...]
+    try:
+        with open(os.path.join(_segment_dir(name), "manifest.json"), encoding='utf-8') as f:
+            return json.load(f)['segments']
+    except (OSError, ValueError, KeyError):
+        return []
+
+
+def _chain(parent, segment_sha):
+    return hashlib.sha256(f"{parent}:{segment_sha}".encode()).hexdigest()
+
+
+def _lineage(source, segs):
+    chain = [source]
+    for seg in segs:
+        chain.append(_chain(chain[-1], seg['sha256']))
+    return chain
+
+
+def lineage(name):
+    # [원본 fingerprint, segment 1 까지의 fingerprint, ...] — 마지막 값이 현재 fingerprint
+    return _lineage(_source_fingerprint(name), segments(name))
+
+
+def fingerprint(name):
+    return lineage(name)[-1]
+
+
+def data_version():
+    return hashlib.sha256("".join(fingerprint(n) for n in SOURCES).encode()).hexdigest()[:16]
+
+
+def parquet_path(name):
+    # 원본에서 변환된 Parquet (추가된 segment 는 포함하지 않음 → parquet_paths)
+    _source_fingerprint(name)
+    return _read_sidecar(name)['parquet']
+
+
+def parquet_paths(name):
+    return [parquet_path(name)] + [os.path.join(_segment_dir(name), seg['file']) for seg in segments(name)]
+
+
+def read_tables(paths):
+    categorical = [c for c in CATEGORICAL if c in pq.read_schema(paths[0]).names]
+    tables = [pq.read_table(path, memory_map=True, read_dictionary=categorical) for path in paths]
+    df = pa.concat_tables(tables).unify_dictionaries().to_pandas()
+    for col in categorical:
+        # 사전(dictionary) 순서는 등장 순서이므로 범주를 정렬해 둔다
+        df[col] = df[col].cat.reorder_categories(sorted(df[col].cat.categories))
+    return df
+
+
+def load_table(name):
+    return read_tables(parquet_paths(name))
+
+
+def load_version(name):
+    # (fingerprint, 그 버전의 테이블): 같은 segment 목록으로 fingerprint 와 읽을 파일을 함께 정한다
+    # → 읽는 사이에 segment 가 추가(ingest.py)되어도 fingerprint 와 행이 어긋나지 않는다
+    source = _source_fingerprint(name)
+    base = _read_sidecar(name)['parquet']
+    segs = segments(name)
+    paths = [base] + [os.path.join(_segment_dir(name), seg['file']) for seg in segs]
+    return _lineage(source, segs)[-1], read_tables(paths)
+
+
+def load_table_at(name, fingerprint):
+    # lineage 중 fingerprint 버전의 테이블 (원본 + 그 버전까지 추가된 segment) → lineage 에 없는 버전이면 None
+    source = _source_fingerprint(name)
+    base = _read_sidecar(name)['parquet']
+    segs = segments(name)
+    chain = _lineage(source, segs)
+    if fingerprint not in chain:
+        return None
+    added = segs[:chain.index(fingerprint)]
+    return read_tables([base] + [os.path.join(_segment_dir(name), seg['file']) for seg in added])
+
+
+def iter_table(name, columns=None, batch_size=CHUNK_SIZE):
+    # 전체를 메모리에 올리지 않고 Parquet 을 batch 단위 DataFrame 으로 읽는다 (원본 → segment 순)
+    for path in parquet_paths(name):
+        for batch in pq.ParquetFile(path, memory_map=True).iter_batches(batch_size=batch_size, columns=columns):
+            yield batch.to_pandas()
+
+
+def appended_since(name, since, until=None):
+    # fingerprint since 버전 이후 until(기본: 현재) 버전까지 추가된 행 → index 가 전체 테이블 기준 행 위치인 DataFrame
+    # since 가 until 의 이전 버전이 아니면 (원본 파일이 바뀌는 등) None → 호출하는 쪽에서 전체를 다시 계산
+    chain = lineage(name)
+    until = until or chain[-1]
+    if since not in chain or until not in chain or chain.index(since) > chain.index(until):
+        return None
+    first, last = chain.index(since), chain.index(until)
+    added = segments(name)[first:last]
+    start = pq.read_metadata(parquet_path(name)).num_rows + sum(seg['rows'] for seg in segments(name)[:first])
+    if added:
+        df = read_tables([os.path.join(_segment_dir(name), seg['file']) for seg in added])
+    else:
+        df = pq.read_schema(parquet_path(name)).empty_table().to_pandas()
+    df.index = pd.RangeIndex(start, start + len(df))
+    return df
+
+
+def append_segment(name, src):
+    # 새 batch(CSV 또는 Parquet)를 원본과 같은 스키마로 변환해 segment 로 덧붙인다 → segment 정보
+    # 같은 내용의 batch 가 이미 들어와 있으면 다시 추가하지 않고 None 을 돌려준다
+    # (여러 프로세스가 동시에 추가할 수 있으므로 호출하는 쪽에서 잠금을 잡는다: ingest.py)
+    schema = pq.read_schema(parquet_path(name))
+    directory = _segment_dir(name)
+    os.makedirs(directory, exist_ok=True)
+    digest = _file_hash(src)
+    current = segments(name)
+    if any(seg['sha256'] == digest for seg in current):
+        return None
+
+    tmp = os.path.join(directory, f".{digest[:16]}.parquet.tmp")
+    rows = 0
+    with pq.ParquetWriter(tmp, schema) as writer:
+        for chunk in _read_source_chunks(src):
+            missing = [c for c in schema.names if c not in chunk]
+            if missing:
+                raise ValueError(f"{src}: 컬럼이 없습니다: {', '.join(missing)}")
+            chunk = chunk[schema.names].astype({c: t for c, t in DTYPES.items() if c in chunk})
+            writer.write_table(pa.Table.from_pandas(chunk, preserve_index=False).cast(schema))
+            rows += len(chunk)
+    segment = {'file': f"seg-{len(current) + 1:05d}-{digest[:16]}.parquet", 'sha256': digest, 'rows': rows}
+    os.replace(tmp, os.path.join(directory, segment['file']))
+
+    manifest = os.path.join(directory, "manifest.json")
+    with open(manifest + ".tmp", "w", encoding='utf-8') as f:
+        json.dump({'segments': current + [segment]}, f, indent=2)
+    os.replace(manifest + ".tmp", manifest)
+    return segment
@@ -0,0 +1,91 @@
+# downloads.py
+# 데이터 다운로드 페이지에서 쓰는 파일 내용을 데이터 버전 당 한 번만 만든다.
+# - CSV      : 원본 파일 바이트를 그대로 사용 (DataFrame → 문자열 재직렬화 없음)
+# - CSV(gzip): 위 바이트를 gzip 으로 압축
+# - Parquet  : data_store 가 만들어 둔 Parquet 파일을 그대로 사용
+# 필터링된 부분 집합은 chunk 단위로 CSV 로 바꿔 이어 붙여 큰 중간 문자열을 한 번에 만들지 않는다.
+# 행이 추가(ingest.py)되면 이전 파일 내용 뒤에 추가된 행만 이어 붙인다 (gzip 은 멤버를 하나 더 붙임).
+
+import gzip
+import io
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+import data_store
+
+BOM = b'\xef\xbb\xbf'
+EXPORT_CHUNK_ROWS = 100_000
+
+FORMATS = {
+    'csv': {'label': 'CSV', 'suffix': '.csv', 'mime': 'text/csv'},
+    'csv.gz': {'label': 'CSV (gzip)', 'suffix': '.csv.gz', 'mime': 'application/gzip'},
+    'parquet': {'label': 'Parquet', 'suffix': '.parquet', 'mime': 'application/octet-stream'},
+}
+
+
+def _read(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _rows_csv(df):
+    return df.to_csv(index=False, header=False).encode('utf-8') if len(df) else b''
+
+
+def _with_rows_parquet(payload, rows):
+    # 기존 Parquet 의 row group 뒤에 추가된 행을 같은 스키마로 기록한 새 파일
+    previous = pq.ParquetFile(io.BytesIO(payload))
+    buf = io.BytesIO()
+    with pq.ParquetWriter(buf, previous.schema_arrow) as writer:
+        for i in range(previous.num_row_groups):
+            writer.write_table(previous.read_row_group(i))
+        if len(rows):
+            writer.write_table(pa.Table.from_pandas(rows, preserve_index=False).cast(previous.schema_arrow))
+    return buf.getvalue()
+
+
+def extend_payload(payload, fmt, rows):
+    # build_payload 결과 뒤에 추가된 행만 덧붙인다 (처음부터 다시 만든 결과와 같은 내용)
+    if fmt == 'parquet':
+        return _with_rows_parquet(payload, rows)
+    if fmt == 'csv.gz':
+        return payload + gzip.compress(_rows_csv(rows), compresslevel=6, mtime=0) if len(rows) else payload
+    return payload + _rows_csv(rows)
+
+
+def build_payload(name, fmt):
+    chain = data_store.lineage(name)
+    if fmt == 'parquet':
+        payload = _read(data_store.parquet_path(name))
+    else:
+        src = data_store.source_path(name)
+        if src.endswith(".csv"):
+            raw = _read(src)
+        else:
+            raw = data_store.read_tables([data_store.parquet_path(name)]).to_csv(index=False).encode('utf-8')
+        # 엑셀에서 한글이 깨지지 않도록 utf-8-sig(BOM) 유지, 추가 행을 이어 붙일 수 있도록 줄바꿈으로 끝낸다
+        if not raw.startswith(BOM):
+            raw = BOM + raw
+        if not raw.endswith(b"\n"):
+            raw += b"\n"
+        payload = gzip.compress(raw, compresslevel=6, mtime=0) if fmt == 'csv.gz' else raw
+    # segment 마다 이어 붙인다 → 실행 중에 segment 가 하나씩 추가되며 갱신된 결과와 바이트 단위로 같다
+    for since, until in zip(chain, chain[1:]):
+        payload = extend_payload(payload, fmt, data_store.appended_since(name, since, until))
+    return payload
+
+
+def file_name(name, fmt):
+    return data_store.SOURCES[name].rsplit('.', 1)[0] + FORMATS[fmt]['suffix']
+
+
+def export_subset_csv(engine, result, columns=None, chunk_rows=EXPORT_CHUNK_ROWS):
+    # 검색 결과를 chunk 단위로 꺼내 CSV 바이트로 이어 쓴다 (전체 결과를 담은 DataFrame · 문자열을 한 번에 만들지 않음)
+    # 임시 파일을 남기지 않도록 바이트로 돌려준다 (download_button 도 내용 전체를 메모리로 읽는다)
+    out = io.BytesIO()
+    out.write(BOM)
+    for start in range(0, max(result.count, 1), chunk_rows):
+        chunk = engine.fetch(result, start, start + chunk_rows, columns)
+        out.write(chunk.to_csv(index=False, header=(start == 0)).encode('utf-8'))
+    return out.getvalue()
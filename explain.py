@@ -0,0 +1,171 @@
+# explain.py
+# 등록된 생존 예측 모델의 설명: 순열 중요도(permutation importance)와 부분 의존도(partial dependence)
+# - 피처마다 독립적으로 계산되므로 피처 단위로 프로세스 풀에 나눠 병렬 계산한다 (코어가 하나면 같은 프로세스에서 순서대로)
+# - 대용량 데이터는 고정 seed 로 뽑은 표본(SAMPLE_ROWS 행)으로 계산한다
+# - 결과는 (모델 키, 학습 데이터 fingerprint, 계산 설정)별 JSON 으로 모델 디렉터리에 저장 → 프로세스 · 재시작 후에도 재사용
+# - 예측은 compact 엔진(forest_export)으로 하고, 반복 · 격자 전체를 한 행렬로 쌓아 한 번에 예측한다
+#
+# 사용 예)
+#   python explain.py                      # 최신 모델 설명을 계산(또는 캐시에서 읽어) 출력
+#   python explain.py --sample-rows 20000 --workers 4
+
+import argparse
+import functools
+import hashlib
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+import data_store
+import model_registry
+from features import SEX_CODES
+from model_registry import TARGET, prepare_features
+
+SAMPLE_ROWS = 5_000
+N_REPEATS = 5
+GRID_POINTS = 20
+SEED = 42
+
+
+@functools.lru_cache(maxsize=4)
+def _load_model(key):
+    # 작업 프로세스마다 모델을 한 번만 읽는다
+    return model_registry.load_model(key)
+
+
+def _grid(values, grid_points):
+    # 값 종류가 적으면 모든 값, 많으면 5~95 백분위 구간을 등간격으로 (sklearn partial_dependence 와 같은 격자)
+    unique = np.unique(values)
+    if len(unique) <= grid_points:
+        return unique
+    low, high = np.percentile(values, [5, 95])
+    return np.linspace(low, high, grid_points)
+
+
+def _explain_feature(key, j, X, y, baseline, n_repeats, grid_points, seed):
+    # 피처 j 하나의 순열 중요도(정확도 감소) + 부분 의존도 (작업 프로세스에서 실행)
+    model = _load_model(key)
+    n, n_features = X.shape
+    rng = np.random.default_rng([seed, j])
+
+    permuted = np.repeat(X[None], n_repeats, axis=0)
+    for r in range(n_repeats):
+        permuted[r, :, j] = rng.permutation(X[:, j])
+    scores = (model.predict(permuted.reshape(-1, n_features)).reshape(n_repeats, n) == y).mean(axis=1)
+    drops = baseline - scores
+
+    grid = _grid(X[:, j], grid_points)
+    fixed = np.repeat(X[None], len(grid), axis=0)
+    fixed[:, :, j] = grid[:, None]
+    average = model.predict_proba(fixed.reshape(-1, n_features))[:, 1].reshape(len(grid), n).mean(axis=1)
+    return {
+        "importance_mean": float(drops.mean()),
+        "importance_std": float(drops.std()),
+        "grid": grid.tolist(),
+        "average": average.tolist(),
+    }
+
+
+def sample(df, sample_rows=SAMPLE_ROWS, seed=SEED):
+    # 표본 행 위치 (원래 순서 유지). 행 수가 sample_rows 이하이면 전체
+    if len(df) <= sample_rows:
+        return df
+    positions = np.sort(np.random.default_rng(seed).choice(len(df), size=sample_rows, replace=False))
+    return df.take(positions)
+
+
+def compute(key, features, df, sample_rows=SAMPLE_ROWS, n_repeats=N_REPEATS, grid_points=GRID_POINTS, seed=SEED,
+            max_workers=None):
+    start = time.perf_counter()
+    rows = sample(df, sample_rows, seed)
+    X = prepare_features(rows, features)
+    y = rows[TARGET].to_numpy()
+    baseline = float((_load_model(key).predict(X) == y).mean())
+
+    args = [(key, j, X, y, baseline, n_repeats, grid_points, seed) for j in range(len(features))]
+    workers = min(len(features), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        results = [_explain_feature(*a) for a in args]
+    else:
+        # Streamlit 서버의 스레드 상태를 복제하지 않도록 fork 대신 spawn
+        with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            results = list(pool.map(_explain_feature, *zip(*args)))
+
+    return {
+        "key": key,
+        "baseline_accuracy": baseline,
+        "n_rows": int(len(df)),
+        "sample_rows": int(len(rows)),
+        "n_repeats": n_repeats,
+        "workers": workers,
+        "elapsed_s": time.perf_counter() - start,
+        "computed_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "features": {name: result for name, result in zip(features, results)},
+    }
+
+
+def _explanation_path(key, data_fingerprint, settings):
+    spec = json.dumps({"data": data_fingerprint, **settings}, sort_keys=True)
+    return os.path.join(model_registry.REGISTRY_DIR, key, f"explain-{hashlib.sha256(spec.encode('utf-8')).hexdigest()[:16]}.json")
+
+
+def _read(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_or_compute(key, features, df, data_fingerprint, sample_rows=SAMPLE_ROWS, n_repeats=N_REPEATS,
+                    grid_points=GRID_POINTS, seed=SEED, max_workers=None):
+    # 저장된 설명이 있으면 읽고, 없으면 모델 키별 파일 잠금 안에서 한 번만 계산해 저장한다
+    settings = {"features": list(features), "sample_rows": sample_rows, "n_repeats": n_repeats,
+                "grid_points": grid_points, "seed": seed}
+    path = _explanation_path(key, data_fingerprint, settings)
+    result = _read(path)
+    if result is not None:
+        return result
+    with model_registry.file_lock(f"explain-{key}"):
+        result = _read(path)
+        if result is None:
+            result = compute(key, features, df, sample_rows, n_repeats, grid_points, seed, max_workers)
+            model_registry._write_json(path, result)
+    return result
+
+
+def grid_labels(feature, grid):
+    # 부분 의존도 x 축 라벨 (성별은 코드 대신 이름)
+    if feature == 'Sex':
+        names = {code: name for name, code in SEX_CODES.items()}
+        return [names.get(int(v), str(v)) for v in grid]
+    return grid
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="최신 생존 예측 모델의 순열 중요도 / 부분 의존도")
+    parser.add_argument("--sample-rows", type=int, default=SAMPLE_ROWS)
+    parser.add_argument("--repeats", type=int, default=N_REPEATS)
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 코어 수)")
+    args = parser.parse_args(argv)
+
+    meta = model_registry.latest_meta()
+    if meta is None:
+        raise SystemExit("등록된 모델이 없습니다. 먼저 python train_model.py 로 학습하세요.")
+    from features import build_features
+    result = load_or_compute(meta["key"], meta["features"], build_features(data_store.load_table('train')),
+                             data_store.fingerprint('train'), sample_rows=args.sample_rows, n_repeats=args.repeats,
+                             max_workers=args.workers)
+    print(f"모델 {result['key']} · 표본 {result['sample_rows']:,}/{result['n_rows']:,}행 · 기준 정확도 "
+          f"{result['baseline_accuracy']:.4f} · {result['elapsed_s']:.2f}s ({result['workers']} 프로세스, {result['computed_at']})")
+    ranked = sorted(result["features"].items(), key=lambda item: item[1]["importance_mean"], reverse=True)
+    for name, info in ranked:
+        print(f"  {name:<14} 정확도 감소 {info['importance_mean']:+.4f} ± {info['importance_std']:.4f}")
+
+
+if __name__ == "__main__":
+    main()
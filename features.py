@@ -0,0 +1,70 @@
+# features.py
+# 모든 페이지가 함께 쓰는 파생 컬럼 정의 (선언적 · 벡터화)
+# 데이터셋 버전 당 한 번만 계산(utils._build_train_features)되어 집계 큐브 · 검색 인덱스 · 모델 설명이 함께 쓴다.
+
+import pandas as pd
+
+OTHER = '기타'
+SEX_CODES = {'male': 1, 'female': 0}
+
+# 탑승자 분석: 20세 단위 나이대
+AGE_BINS = [0, 20, 40, 60, 80, float('inf')]
+AGE_LABELS = ['0-19세', '20-39세', '40-59세', '60-79세', '80세 이상']
+
+# 탑승자 검색: 10세 단위 나이대
+AGE10_BINS = [float('-inf'), 10, 20, 30, 40, 50, 60, 70, 80, float('inf')]
+AGE10_LABELS = ['0-9세', '10-19세', '20-29세', '30-39세', '40-49세', '50-59세', '60-69세', '70-79세', '80세 이상']
+
+# 요금대
+FARE_BINS = [0, 10, 30, 100, 250, float('inf')]
+FARE_LABELS = ['0-10', '10-30', '30-100', '100-250', '250+']
+
+
+def _bucket(values, bins, labels, fill=None):
+    groups = pd.cut(values, bins=bins, labels=labels, right=False)
+    if fill is not None:
+        groups = groups.cat.add_categories(fill).fillna(fill)
+    return groups
+
+
+def sex_code(sex):
+    # 모델 입력용 성별 인코딩 (male=1, female=0, 그 외 NaN)
+    return sex.map(SEX_CODES).astype('float64')
+
+
+def _sex_cat(df):
+    sex = pd.Series(pd.Categorical(df['Sex'], categories=['female', 'male']), index=df.index)
+    return sex.cat.add_categories(OTHER).fillna(OTHER)
+
+
+# 파생 컬럼 이름 → 원본 프레임을 받아 컬럼을 돌려주는 함수
+DERIVED_COLUMNS = {
+    'Sex_Cat': _sex_cat,
+    'SexCode': lambda df: sex_code(df['Sex']),
+    'AgeGroup': lambda df: _bucket(df['Age'], AGE_BINS, AGE_LABELS, fill=OTHER),
+    'AgeGroup10': lambda df: _bucket(df['Age'], AGE10_BINS, AGE10_LABELS, fill=OTHER),
+    'FareGroup': lambda df: _bucket(df['Fare'], FARE_BINS, FARE_LABELS),
+}
+
+
+# 모델 입력용 파생 피처 (train_model.py --engineered)
+# 단일 탑승자 예측 폼에서도 계산할 수 있도록 SibSp / Parch / Fare 만 사용하며, Series 와 스칼라 모두에 동작한다
+ENGINEERED_FEATURES = {
+    'FamilySize': lambda d: d['SibSp'] + d['Parch'] + 1,
+    'IsAlone': lambda d: (d['SibSp'] + d['Parch'] == 0) * 1.0,
+    'FarePerPerson': lambda d: d['Fare'] / (d['SibSp'] + d['Parch'] + 1),
+}
+
+
+def build_features(df):
+    # 원본 컬럼 + 파생 컬럼으로 구성된 새 프레임을 만든다 (원본 프레임은 수정하지 않음)
+    derived = pd.DataFrame({name: fn(df) for name, fn in DERIVED_COLUMNS.items()}, index=df.index)
+    return pd.concat([df, derived], axis=1)
+
+
+def extend_features(previous, df):
+    # previous: df 앞부분 행에 대한 build_features 결과 → 뒤에 추가된 행의 파생 컬럼만 계산해 이어 붙인다
+    added = df.iloc[len(previous):]
+    derived = pd.DataFrame({name: fn(added) for name, fn in DERIVED_COLUMNS.items()}, index=added.index)
+    derived = pd.concat([previous[list(DERIVED_COLUMNS)], derived])
+    return pd.concat([df, derived], axis=1)
@@ -0,0 +1,251 @@
+# forest_export.py
+# 학습된 RandomForestClassifier 를 연속된 NumPy 배열(feature, threshold, children, value)로 펼쳐 저장하고
+# 모든 트리를 한 번에 순회하는 벡터화 추론 엔진(CompactForest)으로 예측한다.
+# - 저장 형식은 .npz 하나 (pickle 역직렬화 없이 배열만 읽는다)
+# - sklearn 과 예측 결과가 같은지 확인하는 parity 검사와 로드 시간 / 메모리 / 처리량 비교를 제공한다.
+#
+# 사용 예)
+#   python forest_export.py                       # model/survival_model.pkl → model/survival_model.npz
+#   python forest_export.py --bench --rows 100000 # 내보낸 뒤 sklearn 과 성능 비교
+
+import argparse
+import json
+import os
+import time
+
+import numpy as np
+
+DEFAULT_SOURCE = os.path.join("model", "survival_model.pkl")
+BATCH_ROWS = 4_096  # 트리 수 × 행 수 크기의 작업 배열이 CPU 캐시에 머물도록 작게 나눈다
+
+
+def _threshold_float32(threshold):
+    # sklearn 트리는 float32 로 바꾼 입력을 float64 임계값과 비교한다.
+    # float32 x 에 대해 x <= t 는 x <= (t 이하의 가장 큰 float32) 와 같으므로 임계값을 내림해 float32 로 저장한다
+    t32 = threshold.astype(np.float32)
+    over = t32.astype(np.float64) > threshold
+    t32[over] = np.nextafter(t32[over], np.float32(-np.inf))
+    return t32
+
+
+def flatten(model):
+    # 트리별 노드 배열을 하나로 이어 붙이고 자식 인덱스를 전체 배열 기준 위치로 바꾼다
+    trees = [est.tree_ for est in model.estimators_]
+    sizes = np.array([t.node_count for t in trees])
+    offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]])
+
+    feature, threshold, children, value = [], [], [], []
+    for tree, offset in zip(trees, offsets):
+        is_leaf = tree.children_left == -1
+        feature.append(np.where(is_leaf, 0, tree.feature))
+        threshold.append(tree.threshold)
+        # children[i] = (오른쪽, 왼쪽): 비교 결과(왼쪽이면 1)를 그대로 열 인덱스로 쓴다
+        # 리프는 자기 자신을 가리키게 해 순회 루프에서 분기 없이 제자리에 머물도록 한다
+        nodes = np.arange(tree.node_count) + offset
+        children.append(np.stack([np.where(is_leaf, nodes, tree.children_right + offset),
+                                  np.where(is_leaf, nodes, tree.children_left + offset)], axis=1))
+        # sklearn 과 같이 노드별 클래스 비율로 정규화 (버전에 따라 개수 또는 비율이 저장됨)
+        counts = tree.value[:, 0, :]
+        total = counts.sum(axis=1, keepdims=True)
+        value.append(counts / np.where(total == 0, 1, total))
+
+    index_dtype = np.int32 if sizes.sum() < 2**31 else np.int64
+    return {
+        'feature': np.concatenate(feature).astype(np.int32),
+        'threshold': _threshold_float32(np.concatenate(threshold)),
+        'children': np.concatenate(children).astype(index_dtype),
+        'value': np.concatenate(value).astype(np.float64),
+        'roots': offsets.astype(index_dtype),
+        'max_depth': np.array(max(est.tree_.max_depth for est in model.estimators_)),
+        'classes': np.asarray(model.classes_),
+        'n_features': np.array(model.n_features_in_),
+    }
+
+
+class CompactForest:
+    # sklearn 의 predict / predict_proba / classes_ 와 같은 모양으로 쓸 수 있는 추론 전용 모델
+    def __init__(self, arrays):
+        self.feature = arrays['feature'].astype(np.intp)
+        self.threshold = arrays['threshold']
+        self.children = arrays['children'].astype(np.intp).ravel()
+        self.value = arrays['value']
+        self.roots = arrays['roots'].astype(np.intp)
+        self.max_depth = int(arrays['max_depth'])
+        self.classes_ = arrays['classes']
+        self.n_features_in_ = int(arrays['n_features'])
+        # 클래스별 리프 확률을 연속 배열로 따로 둬 np.take 한 번으로 모을 수 있게 한다
+        self._class_values = [np.ascontiguousarray(self.value[:, k]) for k in range(self.value.shape[1])]
+
+    @classmethod
+    def from_sklearn(cls, model):
+        return cls(flatten(model))
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def save(self, path):
+        tmp = path + ".tmp.npz"
+        np.savez(tmp, feature=self.feature.astype(np.int32), threshold=self.threshold,
+                 children=self.children.reshape(-1, 2).astype(np.int32 if len(self.feature) < 2**31 else np.int64),
+                 value=self.value, roots=self.roots, max_depth=np.array(self.max_depth),
+                 classes=self.classes_, n_features=np.array(self.n_features_in_))
+        os.replace(tmp, path)
+        return path
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.children, self.value, self.roots))
+
+    def _leaves(self, X):
+        # (트리 × 행) 노드 위치를 1차원으로 펼쳐 깊이 단위로 한 번에 전진시킨다 (모든 gather 는 np.take)
+        n, n_features = X.shape
+        flat_x = X.ravel()
+        nodes = np.repeat(self.roots, n)
+        row_base = np.tile(np.arange(n, dtype=np.intp) * n_features, len(self.roots))
+        for _ in range(self.max_depth):
+            go_left = np.take(flat_x, row_base + np.take(self.feature, nodes)) <= np.take(self.threshold, nodes)
+            nodes = np.take(self.children, 2 * nodes + go_left)
+        return nodes
+
+    def predict_proba(self, X):
+        # sklearn 트리와 같이 입력을 float32 로 맞춰 비교한다 (임계값도 float32 로 내림 저장되어 결과가 같다)
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(f"X has {X.shape[-1]} features, but CompactForest is expecting {self.n_features_in_} features as input.")
+        out = np.empty((len(X), len(self.classes_)))
+        n_trees = len(self.roots)
+        for start in range(0, len(X), BATCH_ROWS):
+            batch = X[start:start + BATCH_ROWS]
+            leaves = self._leaves(batch)
+            for k, values in enumerate(self._class_values):
+                out[start:start + len(batch), k] = np.take(values, leaves).reshape(n_trees, len(batch)).mean(axis=0)
+        return out
+
+    def predict(self, X):
+        return self.classes_.take(np.argmax(self.predict_proba(X), axis=1))
+
+
+def export(model, path):
+    return CompactForest.from_sklearn(model).save(path)
+
+
+def check_parity(model, compact, X, atol=1e-9):
+    # sklearn 과 확률 / 예측 라벨이 일치하는지 확인
+    expected = model.predict_proba(X)
+    actual = compact.predict_proba(X)
+    diff = float(np.max(np.abs(expected - actual))) if len(X) else 0.0
+    labels_match = bool(np.array_equal(model.classes_.take(np.argmax(expected, axis=1)),
+                                       compact.classes_.take(np.argmax(actual, axis=1))))
+    return {"rows": int(len(X)), "max_abs_diff": diff, "labels_match": labels_match, "ok": labels_match and diff <= atol}
+
+
+_COLD_LOAD = """
+import json, os, sys, time
+import psutil
+proc = psutil.Process()
+rss = proc.memory_info().rss
+start = time.perf_counter()
+if sys.argv[1] == 'sklearn':
+    import joblib
+    model = joblib.load(sys.argv[2])
+else:
+    from forest_export import CompactForest
+    model = CompactForest.load(sys.argv[2])
+print(json.dumps({"cold_load_ms": (time.perf_counter() - start) * 1000,
+                  "rss_mb": (proc.memory_info().rss - rss) / 2**20}))
+"""
+
+
+def _measure_load(kind, load, path, repeat=5):
+    # 이미 import 된 상태의 반복 로드 시간 + 새 프로세스에서 import 를 포함한 첫 로드 시간 / RSS 증가량
+    import json
+    import subprocess
+    import sys
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        obj = load(path)
+        timings.append(time.perf_counter() - start)
+    out = subprocess.run([sys.executable, "-c", _COLD_LOAD, kind, path], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.abspath(__file__)))
+    return obj, {"load_ms": float(np.median(timings) * 1000), **json.loads(out.stdout),
+                 "file_mb": os.path.getsize(path) / 2**20}
+
+
+def _measure_predict(model, X, single_repeat=200):
+    start = time.perf_counter()
+    model.predict_proba(X)
+    batch = time.perf_counter() - start
+    row = X[:1]
+    start = time.perf_counter()
+    for _ in range(single_repeat):
+        model.predict_proba(row)
+    single = (time.perf_counter() - start) / single_repeat
+    return {"rows_per_sec": len(X) / batch if batch > 0 else float('inf'), "single_ms": single * 1000}
+
+
+def benchmark(pkl_path, npz_path, X):
+    import joblib
+    model, sk_load = _measure_load('sklearn', joblib.load, pkl_path)
+    compact, fast_load = _measure_load('compact', CompactForest.load, npz_path)
+    return {
+        "sklearn": {**sk_load, **_measure_predict(model, X)},
+        "compact": {**fast_load, **_measure_predict(compact, X)},
+        "parity": check_parity(model, compact, X),
+    }
+
+
+def model_features(model, path):
+    # 모델이 학습한 피처 목록: 레지스트리 모델은 같은 디렉터리의 meta.json, 그 외에는 feature_names_in_ (없으면 기본 5개)
+    from model_registry import FEATURES
+    meta_path = os.path.join(os.path.dirname(path), "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path, encoding='utf-8') as f:
+            features = json.load(f)['features']
+    else:
+        names = getattr(model, 'feature_names_in_', None)
+        features = FEATURES if names is None else list(names)
+    if len(features) != model.n_features_in_:
+        raise ValueError(f"{path}: 피처 {len(features)}개({', '.join(features)})로는 입력 {model.n_features_in_}개인 모델을 벤치마크할 수 없습니다")
+    return features
+
+
+def _sample_matrix(features, rows, seed=0):
+    # 벤치마크 입력: 학습 데이터에서 복원 추출
+    import data_store
+    from model_registry import prepare_features
+    df = data_store.load_table('train')
+    X = prepare_features(df, features)
+    return X[np.random.default_rng(seed).integers(0, len(X), rows)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="RandomForest 모델을 NumPy 배열(.npz)로 내보내기")
+    parser.add_argument("--model", default=DEFAULT_SOURCE)
+    parser.add_argument("-o", "--output", help="기본: 모델 경로의 확장자를 .npz 로 바꾼 경로")
+    parser.add_argument("--bench", action="store_true", help="sklearn 과 로드 시간 / 메모리 / 처리량 비교")
+    parser.add_argument("--rows", type=int, default=100_000, help="벤치마크 입력 행 수")
+    args = parser.parse_args(argv)
+
+    import joblib
+    model = joblib.load(args.model)
+    output = args.output or os.path.splitext(args.model)[0] + ".npz"
+    compact = CompactForest.from_sklearn(model)
+    compact.save(output)
+    print(f"내보내기 완료: {output} (트리 {len(compact.roots)}개, 노드 {len(compact.feature):,}개, {compact.nbytes / 2**20:.2f}MB)")
+
+    if args.bench:
+        X = _sample_matrix(model_features(model, args.model), args.rows)
+        report = benchmark(args.model, output, X)
+        for name in ("sklearn", "compact"):
+            r = report[name]
+            print(f"{name:<8} load {r['load_ms']:7.2f}ms  cold load {r['cold_load_ms']:8.1f}ms  rss +{r['rss_mb']:6.1f}MB  "
+                  f"file {r['file_mb']:5.2f}MB  batch {r['rows_per_sec']:>9,.0f} rows/s  single {r['single_ms']:.3f}ms")
+        p = report['parity']
+        print(f"parity   rows={p['rows']:,} max|Δp|={p['max_abs_diff']:.2e} labels_match={p['labels_match']} → {'OK' if p['ok'] else 'FAIL'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+# ingest.py
+# 새 탑승자 batch(CSV 또는 Parquet)를 데이터 저장소에 덧붙인다 (append-only, 원본 CSV 는 그대로 둔다).
+# - batch 는 원본과 같은 스키마의 Parquet segment 로 data/segments/<테이블>/ 에 추가되고 데이터셋 fingerprint 가 바뀐다
+# - 공유 데이터셋(mmap)은 직전 버전 파일에 추가된 행만 이어 붙여 새 버전으로 게시
+# - 실행 중인 대시보드 / API 는 다음 요청에서 새 버전을 보고 파생 컬럼 · 집계 큐브 · 수치 통계 · 검색 인덱스 · 다운로드 파일을
+#   추가된 행만으로 갱신한다 (utils._build_incremental)
+# - 등록된 모델은 이전 데이터로 학습된 것으로 표시되며, --retrain 으로 바로 재학습할 수 있다
+#
+# 사용 예)
+#   python ingest.py new_passengers.csv
+#   python ingest.py batch-1.parquet batch-2.csv --table train --retrain
+
+import argparse
+
+import data_store
+import model_registry
+import shared_dataset
+
+
+def ingest(path, table='train'):
+    # 같은 테이블에 대한 추가는 프로세스 간 파일 잠금으로 한 번에 하나씩 (segment 번호 · manifest 경합 방지)
+    with model_registry.file_lock(f"ingest-{table}"):
+        before = data_store.fingerprint(table)
+        segment = data_store.append_segment(table, path)
+        after = data_store.fingerprint(table)
+        if segment is not None:
+            shared_dataset.publish(table, after)
+    return {
+        "table": table,
+        "path": path,
+        "segment": segment,
+        "rows": segment['rows'] if segment else 0,
+        "fingerprint_before": before,
+        "fingerprint": after,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="새 탑승자 batch 를 데이터 저장소에 추가")
+    parser.add_argument("paths", nargs="+", help="추가할 CSV / Parquet 파일 (원본과 같은 컬럼)")
+    parser.add_argument("--table", choices=list(data_store.SOURCES), default="train")
+    parser.add_argument("--retrain", action="store_true", help="추가 후 모델이 오래되었으면 바로 재학습")
+    args = parser.parse_args(argv)
+
+    for path in args.paths:
+        result = ingest(path, args.table)
+        if result["segment"] is None:
+            print(f"건너뜀: {path} (같은 내용의 batch 가 이미 추가됨)")
+        else:
+            print(f"추가 완료: {path} → {result['segment']['file']} ({result['rows']:,}행)")
+    print(f"{args.table} 데이터 버전: {data_store.fingerprint(args.table)[:16]} (segment {len(data_store.segments(args.table))}개)")
+
+    meta = model_registry.latest_meta()
+    if args.table != 'train' or meta is None or not model_registry.is_stale(meta, data_store.fingerprint('train')):
+        return
+    if not args.retrain:
+        print("⚠️ 등록된 모델은 이전 데이터로 학습되었습니다. 재학습: python train_model.py (또는 대시보드의 재학습 패널)")
+        return
+    from training_worker import train_once
+    meta = train_once(meta.get("config"), progress=lambda fraction, message: print(f"[{fraction:4.0%}] {message}"))
+    print(f"재학습 완료: {meta['key']} (교차검증 정확도 {meta['accuracy']:.4f})")
+
+
+if __name__ == "__main__":
+    main()
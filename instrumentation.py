@@ -0,0 +1,131 @@
+# instrumentation.py
+# 재실행(rerun) 한 번에서 시간이 어디에 쓰이는지 측정하는 계측 도구
+# - timed("이름") 컨텍스트 매니저 / @instrument("이름") 데코레이터로 구간을 감싼다.
+# - 구간별 호출 수, 누적/최대 시간, 할당 블록 수 변화(sys.getallocatedblocks)를 세션별·프로세스 전체로 모은다.
+# - prometheus_text() 로 Prometheus 텍스트 형식 내보내기를 제공한다.
+
+import contextlib
+import functools
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, float('inf'))
+MAX_SESSIONS = 256
+
+_lock = threading.Lock()
+_global = {}
+_sessions = OrderedDict()
+
+
+class SpanStats:
+    def __init__(self):
+        self.count = 0
+        self.total_s = 0.0
+        self.max_s = 0.0
+        self.alloc_blocks = 0
+        self.buckets = [0] * len(BUCKETS)
+
+    def add(self, seconds, alloc_blocks):
+        self.count += 1
+        self.total_s += seconds
+        self.max_s = max(self.max_s, seconds)
+        self.alloc_blocks += alloc_blocks
+        for i, bound in enumerate(BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+                break
+
+    def as_dict(self, name):
+        return {
+            "span": name,
+            "count": self.count,
+            "total_ms": self.total_s * 1000,
+            "mean_ms": self.total_s * 1000 / self.count if self.count else 0.0,
+            "max_ms": self.max_s * 1000,
+            "alloc_blocks": self.alloc_blocks,
+        }
+
+
+def _session_id():
+    # Streamlit 스크립트 스레드에서 호출되면 세션 id, 그 외(CLI, API 서버)에서는 None
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        ctx = get_script_run_ctx(suppress_warning=True)
+        return ctx.session_id if ctx is not None else None
+    except ImportError:
+        return None
+
+
+def record(name, seconds, alloc_blocks=0, session_id=None):
+    session_id = _session_id() if session_id is None else session_id
+    with _lock:
+        _global.setdefault(name, SpanStats()).add(seconds, alloc_blocks)
+        if session_id is not None:
+            spans = _sessions.setdefault(session_id, {})
+            _sessions.move_to_end(session_id)
+            spans.setdefault(name, SpanStats()).add(seconds, alloc_blocks)
+            while len(_sessions) > MAX_SESSIONS:
+                _sessions.popitem(last=False)
+
+
+@contextlib.contextmanager
+def timed(name):
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(name, time.perf_counter() - start, sys.getallocatedblocks() - blocks)
+
+
+def instrument(name):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with timed(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def session_metrics(session_id=None):
+    session_id = _session_id() if session_id is None else session_id
+    with _lock:
+        spans = dict(_sessions.get(session_id, {}))
+        return [stats.as_dict(name) for name, stats in sorted(spans.items())]
+
+
+def global_metrics():
+    with _lock:
+        return [stats.as_dict(name) for name, stats in sorted(_global.items())]
+
+
+def reset_session(session_id=None):
+    session_id = _session_id() if session_id is None else session_id
+    with _lock:
+        _sessions.pop(session_id, None)
+
+
+def prometheus_text(prefix="titanic"):
+    # 프로세스 전체 누적값을 Prometheus 텍스트 형식(0.0.4)으로 만든다
+    lines = [
+        f"# HELP {prefix}_span_seconds Time spent in instrumented spans.",
+        f"# TYPE {prefix}_span_seconds histogram",
+    ]
+    with _lock:
+        items = sorted(_global.items())
+        for name, stats in items:
+            cumulative = 0
+            for bound, count in zip(BUCKETS, stats.buckets):
+                cumulative += count
+                le = "+Inf" if bound == float('inf') else repr(bound)
+                lines.append(f'{prefix}_span_seconds_bucket{{span="{name}",le="{le}"}} {cumulative}')
+            lines.append(f'{prefix}_span_seconds_sum{{span="{name}"}} {stats.total_s}')
+            lines.append(f'{prefix}_span_seconds_count{{span="{name}"}} {stats.count}')
+        lines.append(f"# HELP {prefix}_span_alloc_blocks Net change in allocated Python memory blocks per span.")
+        lines.append(f"# TYPE {prefix}_span_alloc_blocks gauge")
+        for name, stats in items:
+            lines.append(f'{prefix}_span_alloc_blocks{{span="{name}"}} {stats.alloc_blocks}')
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,267 @@
+# memory_governor.py
+# 프로세스 안 캐시들의 메모리 사용량(바이트)을 한 곳에서 집계하고, 캐시(pool)별 예산 안에서 LRU / TTL 로 비운다.
+# - pool 마다 LRU 캐시 하나를 모든 세션이 공유한다: 데이터 · 파생 컬럼 · 인덱스 · 질의 결과 · 검색 · 차트 · 모델 · 다운로드
+# - 값의 크기는 넣을 때 잰다. nbytes 속성(property)을 직접 정의한 값은 꺼낼 때마다 다시 잰다
+#   (처음 검색할 때 문자열 색인을 만드는 질의 엔진처럼 나중에 커지는 값)
+# - 예산을 넘으면 가장 오래 쓰이지 않은 항목부터 비운다. 마지막으로 쓰인 뒤 TTL 이 지난 항목도 비운다
+#   (방금 넣은 항목 하나는 예산보다 커도 보관 → 매 rerun 마다 다시 만들지 않도록)
+# - 비운 값을 아직 쓰고 있는 세션이 있으면 메모리는 그 세션이 값을 놓을 때 반환된다
+# - 예산 / TTL 은 환경 변수로 조정 → 복제본(replica)을 고정된 컨테이너 메모리 한도 안에서 운영
+#     TITANIC_MEMORY_BUDGETS="queries=128,charts=32"   (MB)
+#     TITANIC_CACHE_TTL="queries=600,searches=600"      (초, 0 이면 TTL 없음)
+
+import functools
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+import pandas as pd
+
+# pool → (기본 예산 MB, 기본 TTL 초)
+POOLS = {
+    "data": (1024, None),       # 원본 테이블 (mmap 공유 → 같은 페이지를 여러 프로세스가 함께 쓴다)
+    "features": (1024, None),   # 파생 컬럼 프레임, 집계 큐브, 요약 통계
+    "index": (512, None),       # 질의 엔진 비트맵 + 문자열 trigram 색인
+    "queries": (256, 1800),     # 필터 조합별 결과 비트맵, 정렬 순서
+    "searches": (64, 1800),     # 검색어별 문자열 검색 비트맵
+    "charts": (64, None),       # 렌더링된 차트 이미지
+    "models": (256, None),      # 예측 모델, 모델 설명
+    "downloads": (256, 3600),   # 다운로드 파일 내용
+}
+_MB = 1024 * 1024
+_MISSING = object()
+
+
+def _parse(spec):
+    # "queries=128,charts=32" → {"queries": 128.0, "charts": 32.0}
+    settings = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, value = item.partition("=")
+        settings[name.strip()] = float(value)
+    return settings
+
+
+_budget_overrides = _parse(os.environ.get("TITANIC_MEMORY_BUDGETS", ""))
+_ttl_overrides = _parse(os.environ.get("TITANIC_CACHE_TTL", ""))
+
+
+def nbytes(value, _seen=None):
+    # 값이 차지하는 대략적인 바이트 수 (numpy / pyarrow / pandas 는 버퍼 크기, 그 외는 컨테이너 · 속성을 따라 내려가며 합산)
+    _seen = set() if _seen is None else _seen
+    if id(value) in _seen:
+        return 0
+    _seen.add(id(value))
+    if isinstance(value, (bytes, bytearray, str)):
+        return sys.getsizeof(value)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (pd.Series, pd.Index)):
+        return int(value.memory_usage(deep=True))
+    if hasattr(value, "nbytes"):
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(nbytes(k, _seen) + nbytes(v, _seen) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return sys.getsizeof(value) + sum(nbytes(v, _seen) for v in value)
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + nbytes(vars(value), _seen)
+    return sys.getsizeof(value)
+
+
+def _grows(value):
+    # 클래스가 nbytes 를 property 로 정의했으면 값이 나중에 커질 수 있다고 보고 꺼낼 때마다 다시 잰다
+    return isinstance(getattr(type(value), "nbytes", None), property)
+
+
+class LRUCache:
+    def __init__(self, name, budget_bytes, ttl_s=None, sizeof=nbytes):
+        self.name = name
+        self.budget_bytes = budget_bytes
+        self.ttl_s = ttl_s
+        self._sizeof = sizeof
+        self._items = OrderedDict()  # key → [값, 바이트, 마지막으로 쓰인 시각]
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._building = {}  # key → 만드는 중인 값의 완료 이벤트 (같은 값을 여러 세션이 동시에 만들지 않도록)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _expire(self, now):
+        # 쓰인 순서대로 놓여 있으므로 앞쪽(오래된 쪽)부터 TTL 이 지난 항목만 비운다
+        if self.ttl_s is None:
+            return
+        while self._items:
+            key, entry = next(iter(self._items.items()))
+            if now - entry[2] <= self.ttl_s:
+                break
+            del self._items[key]
+            self._bytes -= entry[1]
+            self.expirations += 1
+
+    def _evict(self, keep):
+        while self._bytes > self.budget_bytes and len(self._items) > 1:
+            key = next(iter(self._items))
+            if key == keep:
+                break
+            self._bytes -= self._items.pop(key)[1]
+            self.evictions += 1
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            self._expire(now)
+            entry = self._items.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._items.move_to_end(key)
+            entry[2] = now
+            self.hits += 1
+            value = entry[0]
+            if _grows(value):
+                size = self._sizeof(value)
+                self._bytes += size - entry[1]
+                entry[1] = size
+                self._evict(keep=key)
+            return value
+
+    def peek(self, key, default=None):
+        # 캐시된 값을 쓰인 순서 · 적중 통계를 바꾸지 않고 읽는다 (TTL 이 지난 값은 비운다)
+        with self._lock:
+            self._expire(time.monotonic())
+            entry = self._items.get(key)
+            return default if entry is None else entry[0]
+
+    def put(self, key, value):
+        size = self._sizeof(value)
+        with self._lock:
+            self._store(key, value, size)
+
+    def _store(self, key, value, size):
+        # self._lock 안에서 호출
+        now = time.monotonic()
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._items[key] = [value, size, now]
+        self._bytes += size
+        self._expire(now)
+        self._evict(keep=key)
+
+    def get_or_build(self, key, build):
+        # 캐시에 없을 때만 build() 를 호출한다. 같은 key 를 동시에 요청하면 한 세션만 만들고 나머지는 기다렸다가 다시 읽는다
+        # 만드는 도중 pop / clear 로 무효화되면 그 결과는 캐시하지 않고, 다음 요청은 새로 만든다
+        while True:
+            value = self.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+            with self._lock:
+                entry = self._items.get(key)
+                if entry is not None:
+                    return entry[0]
+                building = self._building.get(key)
+                if building is None:
+                    building = self._building[key] = threading.Event()
+                    break
+            building.wait()
+        try:
+            value = build()
+            size = self._sizeof(value)
+            with self._lock:
+                if self._building.get(key) is building:
+                    self._store(key, value, size)
+            return value
+        finally:
+            # 무효화 뒤 다른 세션이 다시 만들기 시작했으면 그 세션의 표시는 그대로 둔다
+            with self._lock:
+                if self._building.get(key) is building:
+                    del self._building[key]
+            building.set()
+
+    def pop(self, key):
+        # 값을 비우고, 만드는 중이면 그 결과도 캐시하지 않는다 (무효화)
+        with self._lock:
+            self._building.pop(key, None)
+            entry = self._items.pop(key, None)
+            if entry is not None:
+                self._bytes -= entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._building.clear()
+            self._items.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            self._expire(time.monotonic())
+            return {"pool": self.name, "entries": len(self._items), "bytes": self._bytes,
+                    "budget_bytes": self.budget_bytes, "ttl_s": self.ttl_s, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions, "expirations": self.expirations}
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def pool(name):
+    # 이름별 공유 캐시 (처음 쓸 때 POOLS 기본값 + 환경 변수 설정으로 만든다)
+    with _pools_lock:
+        cache = _pools.get(name)
+        if cache is None:
+            budget_mb, ttl_s = POOLS[name]
+            budget_mb = _budget_overrides.get(name, budget_mb)
+            ttl_s = _ttl_overrides.get(name, ttl_s) or None
+            cache = _pools[name] = LRUCache(name, int(budget_mb * _MB), ttl_s)
+        return cache
+
+
+def cached(pool_name):
+    # 함수 결과를 인자별로 pool 에 캐시하는 데코레이터 (st.cache_resource 처럼 모든 세션이 같은 값을 공유)
+    # wrapper.peek(*args): 만들지 않고 캐시된 값만 (없으면 None)
+    def decorator(func):
+        prefix = (func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            return pool(pool_name).get_or_build(prefix + args, lambda: func(*args))
+
+        wrapper.peek = lambda *args: pool(pool_name).peek(prefix + args)
+        return wrapper
+    return decorator
+
+
+def _read_int(path):
+    try:
+        with open(path) as f:
+            value = f.read().strip()
+    except OSError:
+        return None
+    return int(value) if value.isdigit() else None
+
+
+def process_memory():
+    # 프로세스 RSS 와 컨테이너(cgroup v2 / v1) 메모리 한도 (알 수 없으면 None)
+    rss = None
+    try:
+        with open("/proc/self/statm") as f:
+            rss = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    limit = _read_int("/sys/fs/cgroup/memory.max") or _read_int("/sys/fs/cgroup/memory/memory.limit_in_bytes")
+    if limit is not None and limit >= 1 << 60:  # v1 의 "무제한" 값
+        limit = None
+    return {"rss_bytes": rss, "limit_bytes": limit}
+
+
+def usage():
+    # pool 별 현재 사용량 (등록 순서가 아닌 POOLS 순서로, 아직 쓰지 않은 pool 은 0)
+    return [pool(name).stats() for name in POOLS]
+
+
+def budget_bytes():
+    return sum(pool(name).budget_bytes for name in POOLS)
@@ -0,0 +1,155 @@
+# model_registry.py
+# 학습 데이터 · 피처 목록 · 하이퍼파라미터 해시로 모델을 구분해 한 번만 학습하고 저장하는 레지스트리
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+
+from features import ENGINEERED_FEATURES, sex_code
+
+REGISTRY_DIR = os.path.join("model", "registry")
+LATEST_PATH = os.path.join(REGISTRY_DIR, "latest.json")
+LOCK_DIR = os.path.join(REGISTRY_DIR, "locks")
+# 레지스트리 이전부터 저장소에 포함된 모델 (읽기 전용: 학습 · promote 는 latest.json 만 바꾸고 이 파일은 쓰지 않는다)
+MODEL_PATH = os.path.join("model", "survival_model.pkl")
+# 추론 엔진: compact(forest_export 의 NumPy 배열 모델) 또는 sklearn(pickle) — 경로별로 빠른 쪽을 쓴다 (forest_export.py --bench)
+# - 단일 탑승자 · API micro-batch: compact (로드가 빠르고 1행 지연시간이 짧다: 0.16ms vs 5.3ms)
+# - 업로드 CSV · /predict 배치 · 모델 설명: sklearn (20만 행 처리량 115,695 vs 54,118 rows/s)
+# TITANIC_MODEL_ENGINE 를 지정하면 모든 경로에서 그 엔진을 쓴다
+SINGLE_ENGINE = os.environ.get("TITANIC_MODEL_ENGINE", "compact")
+BATCH_ENGINE = os.environ.get("TITANIC_MODEL_ENGINE", "sklearn")
+
+FEATURES = ['Sex', 'Pclass', 'SibSp', 'Parch', 'Fare']
+TARGET = 'Survived'
+
+
+def prepare_features(df, features=FEATURES):
+    # 원본 프레임은 건드리지 않고 모델 입력 행렬만 만든다 (결측치는 0으로 대체)
+    X = pd.DataFrame({f: df[f] if f in df else ENGINEERED_FEATURES[f](df) for f in features}, index=df.index)
+    if 'Sex' in X:
+        X['Sex'] = sex_code(X['Sex'])
+    return X.fillna(0).to_numpy(dtype='float64')
+
+
+def model_key(df, features, params, validation):
+    # validation: train_model.py 의 교차검증 · 탐색 설정
+    h = hashlib.sha256()
+    # 모델이 실제로 보는 입력 행렬 + 타깃으로 해시 (파생 피처도 원본 값이 바뀌면 키가 달라진다)
+    h.update(prepare_features(df, features).tobytes())
+    h.update(pd.util.hash_pandas_object(df[TARGET], index=False).values.tobytes())
+    spec = {"model": "RandomForestClassifier", "features": list(features), "params": params, "validation": validation}
+    h.update(json.dumps(spec, sort_keys=True).encode('utf-8'))
+    return h.hexdigest()[:16]
+
+
+def _atomic_write(path, write):
+    # 같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 교체 → 읽는 쪽은 항상 완전한 파일만 본다
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            write(f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def _write_json(path, obj):
+    data = json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    _atomic_write(path, lambda f: f.write(data))
+
+
+def _model_dir(key):
+    return os.path.join(REGISTRY_DIR, key)
+
+
+def get_meta(key):
+    path = os.path.join(_model_dir(key), "meta.json")
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def latest_meta():
+    if not os.path.exists(LATEST_PATH):
+        return None
+    with open(LATEST_PATH, encoding='utf-8') as f:
+        return get_meta(json.load(f)["key"])
+
+
+def is_stale(meta, data_fingerprint):
+    # 모델 학습 이후 학습 데이터가 바뀌었는지 (학습 데이터 fingerprint 가 기록되지 않은 이전 모델은 알 수 없으므로 False)
+    trained_on = meta.get("data_fingerprint")
+    return trained_on is not None and trained_on != data_fingerprint
+
+
+def load_model(key, engine=None):
+    # engine 기본값은 배치 경로의 엔진. compact 배열 파일이 없으면 (이전에 등록된 모델) sklearn pickle 로 읽는다
+    engine = BATCH_ENGINE if engine is None else engine
+    compact_path = os.path.join(_model_dir(key), "forest.npz")
+    if engine == "compact" and os.path.exists(compact_path):
+        from forest_export import CompactForest
+        return CompactForest.load(compact_path)
+    import joblib  # pickle 경로에서만 필요 (compact 엔진은 joblib / sklearn 없이 로드)
+    return joblib.load(os.path.join(_model_dir(key), "model.pkl"))
+
+
+def register(key, model, meta):
+    # 모델 → 메타데이터 순으로 기록 (meta.json 이 있으면 학습이 끝난 것으로 본다)
+    # 다른 프로세스의 등록과 섞이지 않도록 전체 순서를 파일 잠금 안에서 수행
+    import joblib
+    from forest_export import CompactForest
+    with file_lock():
+        _atomic_write(os.path.join(_model_dir(key), "model.pkl"), lambda f: joblib.dump(model, f))
+        CompactForest.from_sklearn(model).save(os.path.join(_model_dir(key), "forest.npz"))
+        _write_json(os.path.join(_model_dir(key), "meta.json"), meta)
+        _write_json(LATEST_PATH, {"key": key})
+    return meta
+
+
+@contextlib.contextmanager
+def file_lock(name="registry"):
+    # 프로세스 간 배타 잠금 (Streamlit 서버 여러 개 · CLI 가 동시에 model/ 을 쓰지 않도록)
+    os.makedirs(LOCK_DIR, exist_ok=True)
+    with open(os.path.join(LOCK_DIR, f"{name}.lock"), "a+b") as f:
+        if os.name == "nt":
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.1)
+            try:
+                yield
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def promote(key):
+    # 이미 등록된 모델을 최신 모델로 지정 (같은 설정의 재학습 요청이 기존 모델을 재사용할 때)
+    with file_lock():
+        meta = get_meta(key)
+        if meta is None:
+            raise FileNotFoundError(f"등록되지 않은 모델입니다: {key}")
+        _write_json(LATEST_PATH, {"key": key})
+    return meta
+
@@ -1,8 +1,9 @@
 # data_page.py
 
 import streamlit as st
-import pandas as pd
-from utils import load_train_data, load_test_data, load_gender_submission_data
+from utils import load_download_payload, load_query_engine
+from downloads import FORMATS, file_name, export_subset_csv
+from features import DERIVED_COLUMNS
 
 def run_data_download():
     st.header("📁 데이터 다운로드")
@@ -12,38 +13,44 @@ def run_data_download():
     데이터를 직접 탐색하거나 외부에서 분석/모델링 테스트에 활용해보세요.
     """)
 
-    # 데이터 로드
-    train = load_train_data()
-    test = load_test_data()
-    gender = load_gender_submission_data()
+    # 파일 형식 선택 (파일 내용은 데이터 버전 · 형식별로 한 번만 만들어 캐시됨)
+    fmt = st.radio(
+        "파일 형식",
+        options=list(FORMATS),
+        format_func=lambda f: FORMATS[f]['label'],
+        horizontal=True
+    )
 
     # 세 컬럼으로 다운로드 버튼 배치
     col1, col2, col3 = st.columns(3)
 
-    with col1:
-        csv_train = train.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(
-            label="📥 train.csv",
-            data=csv_train,
-            file_name="train.csv",
-            mime="text/csv"
-        )
-
-    with col2:
-        csv_test = test.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(
-            label="📥 test.csv",
-            data=csv_test,
-            file_name="test.csv",
-            mime="text/csv"
-        )
-
-    with col3:
-        csv_gender = gender.to_csv(index=False).encode('utf-8-sig')
-        st.download_button(
-            label="📥 gender_submission.csv",
-            data=csv_gender,
-            file_name="gender_submission.csv",
-            mime="text/csv"
-        )
+    for col, name in zip((col1, col2, col3), ('train', 'test', 'gender_submission')):
+        with col:
+            st.download_button(
+                label=f"📥 {file_name(name, fmt)}",
+                data=load_download_payload(name, fmt),
+                file_name=file_name(name, fmt),
+                mime=FORMATS[fmt]['mime']
+            )
     st.markdown("📊 각 데이터는 EDA, 예측 모델링, 제출 파일 생성 등에 사용할 수 있습니다.")
+
+    # 🔎 조건에 맞는 학습 데이터만 내려받기
+    with st.expander("🔎 조건별 학습 데이터 내보내기"):
+        engine = load_query_engine()
+        c1, c2, c3 = st.columns(3)
+        sex_filter = c1.multiselect("성별", options=engine.values('Sex'), default=engine.values('Sex'))
+        pclass_filter = c2.multiselect("객실 등급", options=engine.values('Pclass'), default=engine.values('Pclass'))
+        survived_filter = c3.multiselect("생존 여부", options=engine.values('Survived'), format_func=lambda x: {0: "사망", 1: "생존"}.get(x, x),
+                                         default=engine.values('Survived'))
+
+        result = engine.query({'Sex': sex_filter, 'Pclass': pclass_filter, 'Survived': survived_filter})
+        st.caption(f"선택된 탑승자: {result.count:,}명")
+
+        if st.button("📦 CSV 파일 만들기"):
+            columns = [c for c in engine.df.columns if c not in DERIVED_COLUMNS]
+            st.download_button(
+                label="📥 train_filtered.csv",
+                data=export_subset_csv(engine, result, columns),
+                file_name="train_filtered.csv",
+                mime="text/csv"
+            )
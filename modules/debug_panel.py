@@ -0,0 +1,60 @@
+# modules/debug_panel.py
+
+import streamlit as st
+import pandas as pd
+from instrumentation import session_metrics, global_metrics, reset_session, prometheus_text
+import memory_governor
+
+MB = 1024 * 1024
+
+def run_debug_panel():
+    st.markdown("#### 🛠️ 성능 디버그")
+
+    scope = st.radio("범위", options=["현재 세션", "전체 프로세스"], horizontal=True, key="debug_scope")
+    rows = session_metrics() if scope == "현재 세션" else global_metrics()
+
+    if rows:
+        table = pd.DataFrame(rows).sort_values("total_ms", ascending=False)
+        st.dataframe(
+            table.style.format({"total_ms": "{:.1f}", "mean_ms": "{:.2f}", "max_ms": "{:.1f}", "alloc_blocks": "{:,}"}),
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.caption("아직 측정된 구간이 없습니다.")
+
+    col1, col2 = st.columns(2)
+    if col1.button("초기화", key="debug_reset"):
+        reset_session()
+        st.rerun()
+    col2.download_button(
+        label="📈 Prometheus",
+        data=prometheus_text(),
+        file_name="metrics.prom",
+        mime="text/plain",
+        key="debug_prometheus"
+    )
+
+    show_memory_usage()
+
+def show_memory_usage():
+    # 캐시(pool)별 사용량 / 예산 (memory_governor) + 프로세스 RSS 와 컨테이너 메모리 한도
+    st.markdown("#### 🧠 메모리")
+    memory = memory_governor.process_memory()
+    rows = memory_governor.usage()
+    col1, col2, col3 = st.columns(3)
+    col1.metric("프로세스 RSS", f"{memory['rss_bytes'] / MB:,.0f} MB" if memory['rss_bytes'] else "-")
+    col2.metric("캐시 사용량", f"{sum(row['bytes'] for row in rows) / MB:,.1f} MB",
+                help=f"예산 합계 {memory_governor.budget_bytes() / MB:,.0f} MB")
+    col3.metric("컨테이너 한도", f"{memory['limit_bytes'] / MB:,.0f} MB" if memory['limit_bytes'] else "없음")
+
+    table = pd.DataFrame(rows)
+    table["used_mb"] = table.pop("bytes") / MB
+    table["budget_mb"] = table.pop("budget_bytes") / MB
+    table = table[["pool", "entries", "used_mb", "budget_mb", "ttl_s", "hits", "misses", "evictions", "expirations"]]
+    st.dataframe(
+        table.style.format({"used_mb": "{:,.1f}", "budget_mb": "{:,.0f}", "ttl_s": "{:,.0f}"}, na_rep="-"),
+        hide_index=True,
+        use_container_width=True
+    )
+    st.caption("예산 / TTL 은 TITANIC_MEMORY_BUDGETS (MB), TITANIC_CACHE_TTL (초) 환경 변수로 조정합니다.")
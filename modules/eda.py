@@ -1,17 +1,55 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
-from utils import load_train_data
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-import plotly.graph_objects as go
-import joblib, os
+from utils import load_aggregates, load_survival_model_meta, load_survival_model, show_plotly, get_training_service, is_survival_model_stale, load_model_explanation
+from predict import predict_passenger, predict_frame
+from model_registry import BATCH_ENGINE, SINGLE_ENGINE
+import chart_data
+import plotly_charts
+import pandas as pd
 from streamlit_option_menu import option_menu
 
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+STATE_LABELS = {"queued": "⏳ 대기 중", "running": "🏃 학습 중", "done": "✅ 완료", "failed": "❌ 실패"}
+FEATURE_LABELS = {
+    'Sex': "성별(Sex)", 'Pclass': "객실 등급(Pclass)", 'SibSp': "형제/배우자 수(SibSp)", 'Parch': "부모/자녀 수(Parch)",
+    'Fare': "탑승 요금(Fare)", 'FamilySize': "가족 수(FamilySize)", 'IsAlone': "혼자 탑승(IsAlone)",
+    'FarePerPerson': "1인당 요금(FarePerPerson)",
+}
+
+def show_training_panel(expanded=False):
+    # 재학습 요청은 백그라운드 작업 큐에 넣고 바로 돌아온다 (같은 설정은 하나의 작업으로 합쳐짐)
+    service = get_training_service()
+    with st.expander("🔄 모델 재학습 (백그라운드)", expanded=expanded):
+        with st.form("retrain_model"):
+            c1, c2, c3 = st.columns(3)
+            search = c1.selectbox("탐색 방식", options=["halving", "grid"],
+                                  format_func=lambda x: "Successive Halving" if x == "halving" else "전체 격자")
+            cv = c2.slider("교차검증 fold 수", min_value=3, max_value=10, value=5)
+            engineered = c3.checkbox("파생 피처 포함", value=False)
+            if st.form_submit_button("재학습 요청"):
+                job = service.submit({"search": search, "cv": cv, "engineered": engineered})
+                st.session_state["training_job"] = job.config_hash
+        # 진행 중인 작업이 있을 때만 2초마다 상태 영역만 다시 그린다
+        st.fragment(run_every=2 if service.active() else None)(show_training_status)()
+
+def show_training_status():
+    service = get_training_service()
+    jobs = service.jobs()
+    watched = st.session_state.get("training_job")
+    for job in jobs[:3]:
+        config = job["config"]
+        st.markdown(f"**{STATE_LABELS[job['state']]}** · {config['search']} · {config['cv']}-fold"
+                    f"{' · 파생 피처' if config['engineered'] else ''} · {job['elapsed_s']:.0f}초")
+        if job["state"] == "failed":
+            st.error(job["error"])
+        elif job["state"] == "done":
+            st.caption(f"모델 {job['model_key']} · 교차검증 정확도 {job['accuracy']:.2%}")
+        else:
+            st.progress(job["progress"], text=job["message"])
+    # 내가 요청한 작업이 끝나면 페이지 전체를 다시 그려 새 모델 지표를 보여준다
+    if watched is not None:
+        job = service.get(watched)
+        if job is not None and not job.active:
+            del st.session_state["training_job"]
+            st.rerun()
 
 def run_survival_data():
     st.header("📊 생존 여부 시각화 예측 모델링")
@@ -23,13 +61,13 @@ def run_survival_data():
 각 시각화 아래에는 관련 요약 해설과 시사점이 함께 제공되어 탑승자 특성과 생존 여부 간의 관계를 더욱 직관적으로 이해할 수 있습니다.
 """)
 
-    df = load_train_data()
+    cube = load_aggregates()  # 생존/분포 집계는 데이터셋 버전 당 한 번 계산된 큐브에서 읽는다 (차트는 집계 값만 브라우저로)
 
     # 카드형 수평 메뉴
     selected = option_menu(
         menu_title=None,
-        options=["전체 생존/사망 비율", "성별/객실 생존 분석", "예측 모델 정확도"],
-        icons=["heart-pulse", "bar-chart", "cpu"],
+        options=["전체 생존/사망 비율", "성별/객실 생존 분석", "예측 모델 정확도", "모델 설명"],
+        icons=["heart-pulse", "bar-chart", "cpu", "lightbulb"],
         menu_icon="cast",
         default_index=0,
         orientation="horizontal",
@@ -54,20 +92,10 @@ def run_survival_data():
 
     if selected == "전체 생존/사망 비율":
         st.markdown("<p style='font-size:20px; font-weight:bold; color:#373737'>✅ 생존자 / 사망자 수</p>", unsafe_allow_html=True)
-        count_data = df['Survived'].value_counts().sort_index()
-        labels = ['사망', '생존']
-        colors = ["#f86f8f", "#82f99e"]
-        total = count_data.sum()
-
-        def format_autopct(pct):
-            count = int(round(pct * total / 100.0))
-            return f"{pct:.1f}%\n({count}명)"
-
-        fig1, ax1 = plt.subplots()
-        ax1.pie(count_data, labels=labels, autopct=format_autopct, startangle=90, colors=colors)
-        ax1.set_title("전체 생존 비율")
-        ax1.axis('equal')
-        st.pyplot(fig1)
+        def build_pie():
+            count_data = chart_data.survival_counts(cube)
+            return plotly_charts.pie(count_data, labels=['사망', '생존'], colors=["#f86f8f", "#82f99e"], title="전체 생존 비율")
+        show_plotly("eda_survival_pie", build_pie)
 
         st.info("""
         - 전체적으로 사망자가 생존자보다 많습니다.
@@ -82,16 +110,11 @@ def run_survival_data():
 
         with col1:
             st.markdown("<p style='font-size:20px; font-weight:bold; color:#373737'>👥 성별 생존/사망 인원 수</p>", unsafe_allow_html=True)
-            sex_survival = df.groupby(['Sex', 'Survived']).size().unstack().fillna(0)
-            sex_survival.columns = ['사망자', '생존자']
-            plot_df_sex = sex_survival.reset_index().melt(id_vars='Sex', var_name='생존여부', value_name='명수')
-
-            fig_sex, ax_sex = plt.subplots()
-            sns.barplot(data=plot_df_sex, x='Sex', y='명수', hue='생존여부', hue_order=hue_order, palette=palette, ax=ax_sex)
-            for container in ax_sex.containers:
-                ax_sex.bar_label(container, fmt='%d명', label_type='edge', fontsize=9)
-            ax_sex.set_title("성별에 따른 생존/사망 인원 수")
-            st.pyplot(fig_sex)
+            def build_sex_survival():
+                sex_survival = chart_data.sex_survival(cube)
+                sex_survival.columns = ['사망자', '생존자']
+                return plotly_charts.grouped_bar(sex_survival[hue_order], "성별에 따른 생존/사망 인원 수", palette, x_title="Sex")
+            show_plotly("eda_sex_survival", build_sex_survival)
 
             st.info("""
             - 여성 생존률이 남성보다 압도적으로 높습니다.
@@ -100,16 +123,12 @@ def run_survival_data():
 
         with col2:
             st.markdown("<p style='font-size:20px; font-weight:bold; color:#373737'>🎟️ 객실 등급별 생존/사망 인원 수</p>", unsafe_allow_html=True)
-            pclass_survival = df.groupby(['Pclass', 'Survived']).size().unstack().fillna(0)
-            pclass_survival.columns = ['사망자', '생존자']
-            plot_df_pclass = pclass_survival.reset_index().melt(id_vars='Pclass', var_name='생존여부', value_name='명수')
-
-            fig_pclass, ax_pclass = plt.subplots()
-            sns.barplot(data=plot_df_pclass, x='Pclass', y='명수', hue='생존여부', hue_order=hue_order, palette=palette, ax=ax_pclass)
-            for container in ax_pclass.containers:
-                ax_pclass.bar_label(container, fmt='%d명', label_type='edge', fontsize=9)
-            ax_pclass.set_title("객실 등급(Pclass)에 따른 생존/사망 인원 수")
-            st.pyplot(fig_pclass)
+            def build_pclass_survival():
+                pclass_survival = chart_data.pclass_survival(cube)
+                pclass_survival.columns = ['사망자', '생존자']
+                return plotly_charts.grouped_bar(pclass_survival[hue_order], "객실 등급(Pclass)에 따른 생존/사망 인원 수", palette,
+                                                 x_title="Pclass")
+            show_plotly("eda_pclass_survival", build_pclass_survival)
 
             st.info("""
             - 1등석 탑승자는 높은 생존률을 보였으며, 3등석은 생존률이 매우 낮았습니다.
@@ -119,25 +138,23 @@ def run_survival_data():
     elif selected == "예측 모델 정확도":
         st.markdown("<p style='font-size:20px; font-weight:bold; color:#373737'>🧠 생존 예측 모델 정확도</p>", unsafe_allow_html=True)
 
-        # 인코딩 및 피처 정의
-        df['Sex'] = df['Sex'].map({'male': 1, 'female': 0})
-        features = ['Sex', 'Pclass', 'SibSp', 'Parch', 'Fare']
-        X = df[features]
-        y = df['Survived']
-
-        # 학습 및 검증
-        X_train, X_val, y_train, y_val = train_test_split(X, y, test_size=0.2, random_state=42)
-        model = RandomForestClassifier()
-        model.fit(X_train, y_train)
-        y_pred = model.predict(X_val)
-        accuracy = accuracy_score(y_val, y_pred)
-
-        # 모델 저장
-        os.makedirs("model", exist_ok=True)
-        joblib.dump(model, "model/survival_model.pkl")
-        # st.info("✅ 모델이 `model/survival_model.pkl` 로 저장되어 있습니다.")
+        # 레지스트리에 등록된 모델의 정확도만 읽는다 (학습은 train_model.py 에서 오프라인으로 수행)
+        meta = load_survival_model_meta()
+        if meta is None:
+            st.warning("아직 등록된 예측 모델이 없습니다. 아래에서 백그라운드 학습을 요청하거나 터미널에서 다음 명령으로 학습하세요.")
+            st.code("python train_model.py", language="bash")
+            show_training_panel(expanded=True)
+            return
+        accuracy = meta['accuracy']
+        if 'cv_folds' in meta:
+            st.caption(f"{meta['cv_folds']}-fold 교차검증 평균 정확도 {accuracy:.2%} ± {meta['cv_accuracy_std']:.2%} · "
+                       f"ROC AUC {meta['cv_roc_auc_mean']:.3f} · 학습 {meta['n_rows']:,}행 · {meta['trained_at']}")
+        stale = is_survival_model_stale(meta)
+        if stale:
+            st.warning("⚠️ 모델을 학습한 뒤 새 탑승자 데이터가 추가되었습니다. 아래 패널에서 재학습을 요청하세요.")
 
         # 정확도 gauge
+        import plotly.graph_objects as go
         fig_gauge = go.Figure(go.Indicator(
             mode="gauge+number",
             value=accuracy * 100,
@@ -146,6 +163,7 @@ def run_survival_data():
             gauge={'axis': {'range': [0, 100]}, 'bar': {'color': "green"}}
         ))
         st.plotly_chart(fig_gauge)
+        show_training_panel(expanded=stale)
 
         # 해석
         st.markdown("### 🔍 예측 결과 해석")
@@ -158,6 +176,8 @@ def run_survival_data():
         - **부모/자녀 수(Parch)**  
         - **탑승 요금(Fare)**
 
+        {"추가 파생 변수: " + ", ".join(f"**{f}**" for f in meta['features'][5:]) if len(meta['features']) > 5 else ""}
+
         이 변수들을 기반으로 **약 {accuracy:.2%}의 정확도**로 생존 여부를 예측했습니다.
 
         📌 **시사점**  
@@ -167,4 +187,79 @@ def run_survival_data():
         가족과 함께한 승객은 구조 시 보호를 받았거나, 반대로 구조가 더 어려웠을 가능성도 고려됩니다.
 
         이 결과는 **사회적 지위, 가족 구조, 요금 수준 등 여러 요인이 생존에 영향을 미쳤다**는 것을 보여줍니다.
-        """)
\ No newline at end of file
+        """)
+        st.caption("💡 변수별 실제 기여도(순열 중요도 · 부분 의존도)는 **모델 설명** 탭에서 확인할 수 있습니다.")
+
+        # 🧍 단일 탑승자 / 업로드 CSV 예측
+        st.markdown("### 🧍 탑승자 생존 예측해보기")
+        with st.form("single_prediction"):
+            c1, c2, c3 = st.columns(3)
+            sex = c1.selectbox("성별", options=["male", "female"], format_func=lambda x: "남성" if x == "male" else "여성")
+            pclass = c2.selectbox("객실 등급", options=[1, 2, 3], index=2)
+            fare = c3.number_input("탑승 요금", min_value=0.0, value=15.0, step=1.0)
+            c4, c5 = st.columns(2)
+            sibsp = c4.number_input("형제/배우자 수", min_value=0, max_value=10, value=0)
+            parch = c5.number_input("부모/자녀 수", min_value=0, max_value=10, value=0)
+            submitted = st.form_submit_button("예측하기")
+        if submitted:
+            model = load_survival_model(meta['key'], SINGLE_ENGINE)
+            survived, proba = predict_passenger(sex, pclass, sibsp, parch, fare, model=model, features=meta['features'])
+            if survived:
+                st.success(f"🟢 생존 예상 (생존 확률 {proba:.1%})")
+            else:
+                st.error(f"🔴 사망 예상 (생존 확률 {proba:.1%})")
+
+        uploaded = st.file_uploader("📤 예측할 CSV 업로드 (test.csv 형식)", type="csv")
+        if uploaded is not None:
+            model = load_survival_model(meta['key'], BATCH_ENGINE)
+            result = predict_frame(pd.read_csv(uploaded), model=model, features=meta['features'])
+            st.info(f"총 {len(result):,}명 중 {int(result['Survived'].sum()):,}명이 생존할 것으로 예측되었습니다.")
+            st.download_button(
+                label="📥 예측 결과 다운로드",
+                data=result[['PassengerId', 'Survived']].to_csv(index=False).encode('utf-8-sig'),
+                file_name="predictions.csv",
+                mime="text/csv"
+            )
+
+    elif selected == "모델 설명":
+        st.markdown("<p style='font-size:20px; font-weight:bold; color:#373737'>💡 모델 설명 (변수 중요도 · 부분 의존도)</p>", unsafe_allow_html=True)
+        meta = load_survival_model_meta()
+        if meta is None:
+            st.warning("아직 등록된 예측 모델이 없습니다. **예측 모델 정확도** 탭에서 학습을 요청하세요.")
+            return
+        show_model_explanation(meta)
+
+def show_model_explanation(meta):
+    from explain import grid_labels
+
+    # 모델 키 · 데이터 버전 당 한 번 계산(피처별 병렬, 대용량은 표본)해 저장된 결과를 읽는다
+    with st.spinner("모델 설명을 계산하는 중입니다 (모델 · 데이터 버전 당 한 번만 계산)..."):
+        result = load_model_explanation(meta)
+    st.caption(f"모델 {result['key']} · 표본 {result['sample_rows']:,}/{result['n_rows']:,}행 · 기준 정확도 "
+               f"{result['baseline_accuracy']:.2%} · 반복 {result['n_repeats']}회 · "
+               f"{result['workers']}개 프로세스에서 {result['elapsed_s']:.1f}초 ({result['computed_at']})")
+
+    ranked = sorted(result['features'].items(), key=lambda item: item[1]['importance_mean'], reverse=True)
+    label = lambda name: FEATURE_LABELS.get(name, name)
+
+    st.markdown("#### 📉 순열 중요도")
+    show_plotly("explain_importance", lambda: plotly_charts.importance_bar(
+        [label(name) for name, _ in ranked], [info['importance_mean'] for _, info in ranked],
+        [info['importance_std'] for _, info in ranked], "변수를 섞었을 때 정확도 감소"))
+    top = [f"**{label(name)}** ({info['importance_mean']:+.1%})" for name, info in ranked[:3]]
+    st.info(f"""
+    - 변수 값을 무작위로 섞었을 때 정확도가 많이 떨어질수록 모델이 그 변수에 의존합니다.
+    - 이 모델에서 영향이 큰 변수: {", ".join(top)}
+    - 0 에 가깝거나 음수인 변수는 다른 변수로 대체되거나 예측에 거의 쓰이지 않습니다.
+    """)
+
+    st.markdown("#### 📈 부분 의존도")
+    st.caption("다른 변수는 그대로 두고 한 변수만 바꿨을 때의 평균 생존 확률")
+    averages = [v for _, info in ranked for v in info['average']]
+    y_range = [max(0.0, min(averages) - 0.05), min(1.0, max(averages) + 0.05)]
+    columns = st.columns(2)
+    for i, (name, info) in enumerate(ranked):
+        with columns[i % 2]:
+            show_plotly(f"explain_pd_{name}", lambda: plotly_charts.line(
+                grid_labels(name, info['grid']), info['average'], label(name), x_title=name, y_title="평균 생존 확률",
+                y_range=y_range, categorical=name == 'Sex'))
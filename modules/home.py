@@ -1,10 +1,10 @@
+import numpy as np
 import streamlit as st
-import matplotlib.pyplot as plt
-import seaborn as sns
-from utils import load_train_data, load_test_data, load_gender_submission_data
-# 한글 폰트 설정
-plt.rcParams['font.family'] = 'Malgun Gothic'
-plt.rcParams['axes.unicode_minus'] = False
+from utils import load_train_data, load_test_data, load_gender_submission_data, load_numeric_stats, load_query_engine, show_chart
+import chart_data
+from chart_cache import get_pyplot
+from features import DERIVED_COLUMNS
+from table_view import show_table
 
 def run_home():
     st.header("🚢 타이타닉 생존자 대시보드")
@@ -18,7 +18,6 @@ def run_home():
     train = load_train_data()
     test = load_test_data()
     gender_submission = load_gender_submission_data()
-    df = train.copy()
 
     # 📁 데이터셋 요약
     with st.expander("📁 데이터셋 개요 보기", expanded=False):
@@ -27,9 +26,10 @@ def run_home():
         col2.metric("테스트 데이터", f"{test.shape[0]}행", f"{test.shape[1]}열")
         col3.metric("제출 예시", f"{gender_submission.shape[0]}행", f"{gender_submission.shape[1]}열")
 
-    # 📊 주요 생존 통계 계산
-    total = len(train)
-    survived = train['Survived'].sum()
+    # 📊 주요 생존 통계 계산 (데이터셋 버전 당 한 번 누적 계산된 통계에서 읽음)
+    stats = load_numeric_stats()
+    total = stats.rows
+    survived = int(round(stats.sum()['Survived']))
     dead = total - survived
     survival_rate = survived / total * 100
     death_rate = dead / total * 100
@@ -96,13 +96,25 @@ def run_home():
 
     # (선택) 📈 상관관계 히트맵
     with st.expander("📈 수치형 변수 간 상관관계 보기"):
-        numeric_cols = ['Survived', 'Pclass', 'Age', 'SibSp', 'Parch', 'Fare']
-        corr_matrix = df[numeric_cols].corr()
+        def build_heatmap():
+            corr_matrix = chart_data.correlation(stats)
 
-        fig, ax = plt.subplots(figsize=(5, 4))
-        sns.heatmap(corr_matrix, annot=True, cmap='coolwarm', fmt=".2f", linewidths=0.5, ax=ax)
-        ax.set_title("상관관계 히트맵")
-        st.pyplot(fig)
+            # 홈 화면은 matplotlib 만으로 그린다 (seaborn → scipy import 를 피해 첫 화면 로딩을 가볍게)
+            plt = get_pyplot()
+            fig, ax = plt.subplots(figsize=(5, 4))
+            image = ax.imshow(corr_matrix.to_numpy(), cmap='coolwarm', vmin=-1, vmax=1)
+            fig.colorbar(image, ax=ax)
+            ax.set_xticks(range(len(corr_matrix.columns)), corr_matrix.columns, rotation=90)
+            ax.set_yticks(range(len(corr_matrix.index)), corr_matrix.index)
+            for (i, j), value in np.ndenumerate(corr_matrix.to_numpy()):
+                ax.text(j, i, f"{value:.2f}", ha='center', va='center', fontsize=8)
+            ax.set_xticks(np.arange(len(corr_matrix.columns) + 1) - 0.5, minor=True)
+            ax.set_yticks(np.arange(len(corr_matrix.index) + 1) - 0.5, minor=True)
+            ax.grid(which='minor', color='white', linewidth=0.5)
+            ax.tick_params(which='minor', length=0)
+            ax.set_title("상관관계 히트맵")
+            return fig
+        show_chart("home_corr_heatmap", build_heatmap)
 
         st.info("""
         - `Fare`와 `Pclass`: 강한 음의 상관관계 (요금 ↑ ↔ 등급 낮음)
@@ -110,6 +122,8 @@ def run_home():
         - `Survived`와 관련성 있는 변수: `Fare`, `Pclass`, `Parch`
         """)
 
-    # 🔍 샘플 데이터
-    with st.expander("🔍 샘플 데이터 미리보기"):
-        st.dataframe(df.sample(20, random_state=42), use_container_width=True)
+    # 🔍 데이터 미리보기 (서버에서 정렬 · 페이지 단위로 잘라 현재 페이지만 전송)
+    with st.expander("🔍 데이터 미리보기"):
+        engine = load_query_engine()
+        columns = [c for c in engine.df.columns if c not in DERIVED_COLUMNS]
+        show_table(engine, engine.query({}), "home", columns, page_size=20)
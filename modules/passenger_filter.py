@@ -1,60 +1,53 @@
 # modules/passenger_filter.py
 
 import streamlit as st
-from utils import load_train_data
+from utils import load_query_engine
+from features import DERIVED_COLUMNS
+from instrumentation import timed
+from table_view import show_table
 
 def run_passenger_filter():
     st.header("🔎 탑승자 데이터 검색")
     st.markdown("""
 선택한 조건(성별, 객실 등급, 나이대, 생존 여부)에 따라 탑승자 데이터를 실시간으로 필터링하여 조회할 수 있습니다.
 
-- **성별**: 남성 / 여성  
+- **성별**: 남성 / 여성 (성별이 기록되지 않은 탑승자는 기타)  
 - **객실 등급**: 1, 2, 3등석  
 - **생존 여부**: 생존 / 사망  
 - **나이대**: 0~9세부터 80세 이상, 기타까지 구간별 선택 가능
+- **이름 / 티켓 번호 / 객실**: 입력한 글자를 포함하는 탑승자 (대소문자 구분 없음)
 
 검색 결과는 아래 표에 자동으로 반영되며, 총 인원 수도 함께 표시됩니다.
 """)
 
 
-    # 📦 데이터 불러오기 (맨 위에서 수행)
-    df = load_train_data()
-
-    # 📊 나이 그룹화 함수
-    def get_age_group(age):
-        try:
-            age = float(age)
-            if age < 10: return "0-9세"
-            elif age < 20: return "10-19세"
-            elif age < 30: return "20-29세"
-            elif age < 40: return "30-39세"
-            elif age < 50: return "40-49세"
-            elif age < 60: return "50-59세"
-            elif age < 70: return "60-69세"
-            elif age < 80: return "70-79세"
-            elif age >= 80: return "80세 이상"
-            else: return "기타"
-        except:
-            return "기타"
-
-    # 연령대 컬럼 생성
-    df['AgeGroup'] = df['Age'].apply(get_age_group)
+    # 📦 비트맵 인덱스 질의 엔진 불러오기 (연령대 AgeGroup10 은 공통 파생 컬럼 파이프라인에서 미리 계산됨)
+    engine = load_query_engine()
 
     # 🔎 필터 UI
-    sex_filter = st.multiselect("성별 선택", options=df['Sex'].unique(), default=df['Sex'].unique())
-    pclass_filter = st.multiselect("객실 등급 선택", options=sorted(df['Pclass'].unique()), default=sorted(df['Pclass'].unique()))
-    survived_filter = st.multiselect("생존 여부 선택", options=[0, 1], format_func=lambda x: "사망" if x == 0 else "생존", default=[0, 1])
-    age_group_options = sorted(df['AgeGroup'].unique().tolist())
+    sex_options = engine.values('Sex')
+    sex_filter = st.multiselect("성별 선택", options=sex_options, default=sex_options)
+    pclass_options = engine.values('Pclass')
+    pclass_filter = st.multiselect("객실 등급 선택", options=pclass_options, default=pclass_options)
+    survived_options = engine.values('Survived')
+    survived_filter = st.multiselect("생존 여부 선택", options=survived_options, format_func=lambda x: {0: "사망", 1: "생존"}.get(x, x), default=survived_options)
+    age_group_options = engine.values('AgeGroup10')
     selected_groups = st.multiselect("나이대 선택", options=age_group_options, default=age_group_options)
-
-    # ✅ 필터 적용
-    filtered_df = df[
-        (df['Sex'].isin(sex_filter)) &
-        (df['Pclass'].isin(pclass_filter)) &
-        (df['AgeGroup'].isin(selected_groups)) &
-        (df['Survived'].isin(survived_filter))
-    ]
-
-    # 결과 출력
-    st.dataframe(filtered_df.reset_index(drop=True), use_container_width=True)
-    st.success(f"🔍 검색 결과: 총 {len(filtered_df)}명")
+    col1, col2, col3 = st.columns(3)
+    name_query = col1.text_input("이름 검색", placeholder="예: Allen")
+    ticket_query = col2.text_input("티켓 번호 검색", placeholder="예: PC 17")
+    cabin_query = col3.text_input("객실 검색", placeholder="예: C8")
+
+    # ✅ 필터 적용 (비트맵 AND, 문자열 검색은 trigram 색인 비트맵과 AND, 필터 조합별 결과 캐시)
+    with timed("query.filter"):
+        result = engine.query({
+            'Sex': sex_filter,
+            'Pclass': pclass_filter,
+            'Survived': survived_filter,
+            'AgeGroup10': selected_groups,
+        }, text={'Name': name_query, 'Ticket': ticket_query, 'Cabin': cabin_query})
+
+    # 📄 서버에서 정렬 · 페이지 단위로 잘라 현재 페이지의 선택한 컬럼만 출력
+    columns = [c for c in engine.df.columns if c not in DERIVED_COLUMNS] + ['AgeGroup10']
+    show_table(engine, result, "filter", columns, labels={'AgeGroup10': 'AgeGroup'})
+    st.success(f"🔍 검색 결과: 총 {result.count}명")
@@ -0,0 +1,134 @@
+# plotly_charts.py
+# 집계된 값(범주별 명수)만 담은 Plotly 차트 spec(dict)을 만든다.
+# - 브라우저(plotly.js)가 그리므로 서버에서 이미지를 렌더링하지 않고, 전송량은 범주 수에만 비례한다 (행 수와 무관)
+# - plotly 를 import 하지 않는 순수 dict 라 만드는 비용이 거의 없다 (figure 변환은 st.plotly_chart 가 한다)
+# - 막대 위 "N명" 라벨, 강조 색 등은 기존 seaborn 차트와 같게 맞춘다
+
+PASTEL = ['#a1c9f4', '#ffb482', '#8de5a1', '#ff9f9b', '#d0bbff', '#debb9b']
+_BLUES_LIGHT = (0xdb, 0xe9, 0xf6)
+_BLUES_DARK = (0x21, 0x71, 0xb5)
+
+
+def blues(n):
+    # seaborn 'Blues' 팔레트처럼 옅은 파랑 → 진한 파랑 n 단계
+    colors = []
+    for i in range(n):
+        t = i / (n - 1) if n > 1 else 1.0
+        rgb = (round(a + (b - a) * t) for a, b in zip(_BLUES_LIGHT, _BLUES_DARK))
+        colors.append('#%02x%02x%02x' % tuple(rgb))
+    return colors
+
+
+def _labels(values):
+    return [f"{int(v):,}명" for v in values]
+
+
+def _layout(title, x_title=None, y_title=None, **extra):
+    layout = {
+        "title": {"text": title, "x": 0.5, "xanchor": "center"},
+        "xaxis": {"title": {"text": x_title}, "type": "category"},
+        "yaxis": {"title": {"text": y_title}},
+        "margin": {"l": 40, "r": 20, "t": 50, "b": 40},
+        "height": 360,
+        "showlegend": False,
+    }
+    layout.update(extra)
+    return layout
+
+
+def bar(counts, title, x_title=None, y_title="탑승자 수", colors=None, text_inside=None, text_colors='black'):
+    # counts: 범주 → 명수 Series. text_inside: 막대별 라벨 위치 (True 면 막대 안쪽 위, False 면 막대 위, None 이면 모두 위)
+    n = len(counts)
+    if text_inside is None:
+        text_inside = [False] * n
+    elif isinstance(text_inside, bool):
+        text_inside = [text_inside] * n
+    if isinstance(text_colors, str):
+        text_colors = [text_colors] * n
+    trace = {
+        "type": "bar",
+        "x": [str(x) for x in counts.index],
+        "y": [int(v) for v in counts.values],
+        "text": _labels(counts.values),
+        "textposition": ['inside' if inside else 'outside' for inside in text_inside],
+        "insidetextanchor": "end",
+        "textfont": {"color": list(text_colors), "size": 12},
+        "marker": {"color": colors or blues(n)},
+        "hovertemplate": "%{x}: %{y:,}명<extra></extra>",
+        "cliponaxis": False,
+    }
+    return {"data": [trace], "layout": _layout(title, x_title, y_title)}
+
+
+def grouped_bar(table, title, colors, x_title=None, y_title="명수"):
+    # table: index(x 축) × 컬럼(계열) 교차표 → 계열별 막대를 나란히, 막대 위에 "N명"
+    traces = [{
+        "type": "bar",
+        "name": str(col),
+        "x": [str(x) for x in table.index],
+        "y": [int(v) for v in table[col].values],
+        "text": _labels(table[col].values),
+        "textposition": "outside",
+        "marker": {"color": colors.get(col)},
+        "hovertemplate": f"%{{x}} · {col}: %{{y:,}}명<extra></extra>",
+        "cliponaxis": False,
+    } for col in table.columns]
+    layout = _layout(title, x_title, y_title, barmode="group", showlegend=True,
+                     legend={"title": {"text": "생존여부"}})
+    return {"data": traces, "layout": layout}
+
+
+def pie(counts, labels, colors, title):
+    # 조각마다 "비율%\n(N명)" 라벨 (matplotlib autopct 와 같은 형식)
+    total = int(counts.sum())
+    text = [f"{v / total:.1%}<br>({int(v):,}명)" if total else "" for v in counts.values]
+    trace = {
+        "type": "pie",
+        "labels": list(labels),
+        "values": [int(v) for v in counts.values],
+        "text": text,
+        "textinfo": "label+text",
+        "marker": {"colors": list(colors)},
+        "sort": False,
+        "direction": "counterclockwise",
+        "rotation": 90,
+        "hovertemplate": "%{label}: %{value:,}명<extra></extra>",
+    }
+    layout = _layout(title)
+    del layout["xaxis"], layout["yaxis"]
+    return {"data": [trace], "layout": layout}
+
+
+def importance_bar(names, means, stds, title):
+    # 가로 막대 + 오차 막대 (값이 큰 항목이 위로)
+    trace = {
+        "type": "bar",
+        "orientation": "h",
+        "y": list(names)[::-1],
+        "x": [float(v) for v in means][::-1],
+        "error_x": {"type": "data", "array": [float(v) for v in stds][::-1], "visible": True},
+        "text": [f"{v:+.3f}" for v in means][::-1],
+        "textposition": "outside",
+        "marker": {"color": blues(len(names))},
+        "hovertemplate": "%{y}: 정확도 %{x:.2%} 감소<extra></extra>",
+        "cliponaxis": False,
+    }
+    layout = _layout(title, "정확도 감소 (섞기 전 - 섞은 후)", None, height=max(260, 45 * len(names)))
+    layout["xaxis"]["type"] = "linear"
+    layout["yaxis"]["type"] = "category"
+    return {"data": [trace], "layout": layout}
+
+
+def line(x, y, title, x_title=None, y_title=None, y_range=None, categorical=False):
+    trace = {
+        "type": "scatter",
+        "mode": "lines+markers",
+        "x": list(x),
+        "y": [float(v) for v in y],
+        "line": {"color": blues(1)[0]},
+        "hovertemplate": "%{x}: %{y:.1%}<extra></extra>",
+    }
+    layout = _layout(title, x_title, y_title, height=300)
+    layout["xaxis"]["type"] = "category" if categorical else "linear"
+    layout["yaxis"].update({"tickformat": ".0%", "range": y_range})
+    return {"data": [trace], "layout": layout}
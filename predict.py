@@ -0,0 +1,158 @@
+# predict.py
+# 레지스트리의 최신 모델(model/registry/latest.json, 없으면 model/survival_model.pkl)로 배치 / 스트리밍 / 단일 탑승자 예측을 수행한다
+#
+# 사용 예)
+#   python predict.py data/test.csv -o predictions.csv --chunksize 100000
+#   python predict.py --sex female --pclass 1 --sibsp 0 --parch 0 --fare 80 --repeat 1000
+#   python predict.py data/test.csv --engine compact        # 배치도 sklearn pickle 대신 compact 엔진 사용
+
+import argparse
+import functools
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from features import ENGINEERED_FEATURES, SEX_CODES
+from instrumentation import instrument
+from model_registry import BATCH_ENGINE, FEATURES, MODEL_PATH, REGISTRY_DIR, SINGLE_ENGINE, latest_meta, prepare_features
+
+
+@functools.lru_cache(maxsize=None)
+def load_model(path=MODEL_PATH):
+    # 프로세스 당 한 번만 역직렬화 (.npz 는 forest_export 의 compact 엔진)
+    if path.endswith(".npz"):
+        from forest_export import CompactForest
+        return CompactForest.load(path)
+    import joblib
+    return joblib.load(path)
+
+
+class PredictionStats:
+    # 호출 단위 지연시간과 처리 행 수를 모아 처리량 / p50 / p99 를 계산한다
+    def __init__(self):
+        self.latencies = []
+        self.rows = 0
+
+    def record(self, seconds, rows):
+        self.latencies.append(seconds)
+        self.rows += rows
+
+    def summary(self):
+        if not self.latencies:
+            return {"calls": 0, "rows": 0, "rows_per_sec": 0.0, "p50_ms": 0.0, "p99_ms": 0.0}
+        lat = np.asarray(self.latencies)
+        total = lat.sum()
+        return {
+            "calls": int(lat.size),
+            "rows": int(self.rows),
+            "rows_per_sec": float(self.rows / total) if total > 0 else float('inf'),
+            "p50_ms": float(np.percentile(lat, 50) * 1000),
+            "p99_ms": float(np.percentile(lat, 99) * 1000),
+        }
+
+
+def _predict_matrix(model, X):
+    proba = model.predict_proba(X)
+    labels = model.classes_.take(np.argmax(proba, axis=1))
+    return labels.astype('int8'), proba[:, 1]
+
+
+@instrument("model.predict_batch")
+def predict_frame(df, model=None, features=FEATURES, stats=None):
+    # 프레임 전체를 한 번에 벡터화하여 예측
+    model = load_model() if model is None else model
+    start = time.perf_counter()
+    labels, proba = _predict_matrix(model, prepare_features(df, features))
+    if stats is not None:
+        stats.record(time.perf_counter() - start, len(df))
+
+    ids = df['PassengerId'].to_numpy() if 'PassengerId' in df else np.arange(len(df))
+    return pd.DataFrame({'PassengerId': ids, 'Survived': labels, 'Probability': proba})
+
+
+def predict_csv_chunks(source, chunksize=100_000, model=None, features=FEATURES, stats=None):
+    # 수백만 행 파일도 chunk 단위로 읽고 예측 결과를 순서대로 내보낸다 (메모리 사용량은 chunk 크기에 비례)
+    model = load_model() if model is None else model
+    for chunk in pd.read_csv(source, chunksize=chunksize):
+        yield predict_frame(chunk, model=model, features=features, stats=stats)
+
+
+@instrument("model.predict_single")
+def predict_passenger(sex, pclass, sibsp, parch, fare, model=None, features=FEATURES, stats=None):
+    # 단일 탑승자 저지연 경로: DataFrame 을 만들지 않고 1행 행렬을 바로 구성
+    # 알 수 없는 성별을 한쪽 값으로 채워 예측하지 않는다 (API 의 단일 예측 검증과 같은 기준)
+    if sex not in SEX_CODES:
+        raise ValueError(f"sex 는 {' 또는 '.join(map(repr, SEX_CODES))} 이어야 합니다: {sex!r}")
+    model = load_model() if model is None else model
+    values = {
+        'Sex': SEX_CODES[sex],
+        'Pclass': pclass,
+        'SibSp': sibsp,
+        'Parch': parch,
+        'Fare': 0 if fare is None else fare,
+    }
+    start = time.perf_counter()
+    X = np.array([[values[f] if f in values else ENGINEERED_FEATURES[f](values) for f in features]], dtype='float64')
+    labels, proba = _predict_matrix(model, X)
+    if stats is not None:
+        stats.record(time.perf_counter() - start, 1)
+    return int(labels[0]), float(proba[0])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 생존 여부 예측")
+    parser.add_argument("source", nargs="?", help="예측할 CSV 파일 경로 (예: data/test.csv)")
+    parser.add_argument("-o", "--output", help="예측 결과를 저장할 CSV 경로")
+    parser.add_argument("--chunksize", type=int, default=100_000)
+    parser.add_argument("--model", default=MODEL_PATH, help=".pkl (sklearn) 또는 .npz (forest_export.py 로 내보낸 compact 모델)")
+    parser.add_argument("--engine", choices=["compact", "sklearn"],
+                        help="레지스트리 모델을 쓸 때의 추론 엔진 (기본: CSV 는 sklearn, 단일 예측은 compact)")
+    parser.add_argument("--sex", choices=sorted(SEX_CODES))
+    parser.add_argument("--pclass", type=int, default=3)
+    parser.add_argument("--sibsp", type=int, default=0)
+    parser.add_argument("--parch", type=int, default=0)
+    parser.add_argument("--fare", type=float, default=0.0)
+    parser.add_argument("--repeat", type=int, default=1, help="단일 예측 반복 횟수 (지연시간 측정용)")
+    args = parser.parse_args(argv)
+
+    if args.source is None and args.sex is None:
+        parser.error("CSV 경로 또는 --sex 를 지정하세요.")
+
+    # 모델 경로를 지정하지 않으면 레지스트리의 최신 모델과 그 피처 목록을 사용 (train_model.py --engineered 등)
+    meta = latest_meta() if args.model == MODEL_PATH else None
+    if meta:
+        compact = os.path.join(REGISTRY_DIR, meta['key'], "forest.npz")
+        engine = args.engine or (BATCH_ENGINE if args.source is not None else SINGLE_ENGINE)
+        use_compact = engine == "compact" and os.path.exists(compact)
+        model = load_model(compact if use_compact else os.path.join(REGISTRY_DIR, meta['key'], "model.pkl"))
+    else:
+        model = load_model(args.model)
+    features = meta['features'] if meta else FEATURES
+    stats = PredictionStats()
+
+    if args.source is not None:
+        header = True
+        out = open(args.output, "w", newline="", encoding="utf-8") if args.output else None
+        try:
+            for result in predict_csv_chunks(args.source, args.chunksize, model=model, features=features, stats=stats):
+                if out is not None:
+                    result[['PassengerId', 'Survived']].to_csv(out, index=False, header=header)
+                    header = False
+        finally:
+            if out is not None:
+                out.close()
+    else:
+        for _ in range(args.repeat):
+            survived, proba = predict_passenger(args.sex, args.pclass, args.sibsp, args.parch, args.fare,
+                                                model=model, features=features, stats=stats)
+        print(f"예측: {'생존' if survived else '사망'} (생존 확률 {proba:.2%})")
+
+    s = stats.summary()
+    print(f"rows={s['rows']:,} calls={s['calls']:,} rows/sec={s['rows_per_sec']:,.0f} "
+          f"p50={s['p50_ms']:.2f}ms p99={s['p99_ms']:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
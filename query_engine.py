@@ -0,0 +1,185 @@
+# query_engine.py
+# 탑승자 검색용 비트맵 인덱스 질의 엔진
+# - 컬럼 값마다 행 존재 여부를 비트맵(np.packbits)으로 미리 만들어 두고
+#   같은 컬럼 안에서는 OR, 컬럼 사이에서는 AND 로 결합한다.
+# - 필터 조합별 결과를 memory_governor 의 "queries" pool(바이트 예산 + LRU / TTL)에 캐시하고,
+#   화면에는 요청한 페이지 구간의 행만 꺼낸다.
+# - 정렬은 컬럼별 정렬 순서(argsort)를 한 번 만들어 두고 결과 비트로 걸러 쓴다 (행을 복사해 정렬하지 않음).
+#   정렬 순서와 결과별로 걸러낸 위치도 같은 pool 에 둔다.
+# - 이름 / 티켓 번호 / 객실 부분 문자열 검색은 trigram 색인(text_index.py)의 비트맵을 같은 방식으로 AND 한다.
+#   색인은 엔진마다 처음 검색할 때 한 번 만든다.
+# - 결측값(NaN) 행은 '기타' 값의 비트맵으로 모은다 → 선택지에 나타나고, 기본값(모두 선택)에서 빠지지 않는다.
+#   컬럼의 값을 모두 선택했으면 그 컬럼은 AND 하지 않는다.
+
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+import memory_governor
+from features import OTHER
+from text_index import TEXT_COLUMNS, TextIndex
+
+INDEX_COLUMNS = ['Sex', 'Pclass', 'Survived', 'AgeGroup10']
+MISSING = OTHER  # 결측값 선택지 (파생 컬럼의 성별 · 나이대 결측과 같은 이름)
+
+# 엔진마다 다른 번호 → 공유 pool 에서 엔진(데이터 버전)별 항목을 구분한다
+_engine_ids = itertools.count()
+
+
+def _value_masks(values):
+    # 값(정렬됨) → 그 값을 가진 행 마스크, 결측 행은 마지막 MISSING 값으로 (factorize 는 NaN 을 -1 로 두고 값 목록에서 뺀다)
+    codes, uniques = pd.factorize(values, sort=True)
+    masks = {value: codes == i for i, value in enumerate(pd.Index(uniques).tolist())}
+    missing = codes == -1
+    if missing.any():
+        masks[MISSING] = missing | masks[MISSING] if MISSING in masks else missing
+    return masks
+
+
+def _extend_bits(bits, n_rows, mask):
+    # n_rows 개 행의 비트맵 뒤에 mask 를 이어 붙인다 (마지막 바이트가 덜 찼으면 그 비트부터 다시 채움)
+    full, rest = divmod(n_rows, 8)
+    head = np.unpackbits(bits[full:full + 1])[:rest].astype(bool) if rest else np.empty(0, dtype=bool)
+    return np.concatenate([bits[:full], np.packbits(np.concatenate([head, mask]))])
+
+
+class QueryResult:
+    def __init__(self, bits, n_rows, key=None):
+        self.bits = bits
+        self.n_rows = n_rows
+        self.key = key  # 엔진 안에서 이 결과를 만든 필터 조합
+        # 바이트 단위 누적 개수 → 임의 페이지의 시작 위치를 이진 탐색으로 찾는다
+        self._cumulative = np.cumsum(np.bitwise_count(bits), dtype=np.int64)
+        self.count = int(self._cumulative[-1]) if len(bits) else 0
+
+    @property
+    def nbytes(self):
+        return self.bits.nbytes + self._cumulative.nbytes
+
+    def positions(self, start=0, stop=None):
+        # 결과 중 [start, stop) 번째 행들의 원본 위치 (해당 구간의 비트만 풀어본다)
+        stop = self.count if stop is None else min(stop, self.count)
+        if start >= stop:
+            return np.empty(0, dtype=np.int64)
+        first = int(np.searchsorted(self._cumulative, start, side='right'))
+        last = int(np.searchsorted(self._cumulative, stop - 1, side='right'))
+        window = np.flatnonzero(np.unpackbits(self.bits[first:last + 1])) + first * 8
+        skipped = int(self._cumulative[first - 1]) if first > 0 else 0
+        return window[start - skipped:stop - skipped]
+
+    def mask(self):
+        return np.unpackbits(self.bits, count=self.n_rows).view(bool)
+
+    def sorted_positions(self, order):
+        # 정렬 순서(전체 행의 argsort) 중 결과에 속한 위치만 남긴다
+        if self.count == self.n_rows:
+            return order
+        return order[self.mask()[order]]
+
+
+class QueryEngine:
+    def __init__(self, df, columns=INDEX_COLUMNS):
+        self.df = df
+        self.n_rows = len(df)
+        self._values = {}
+        self._bitmaps = {}
+        for col in columns:
+            masks = _value_masks(df[col])
+            self._values[col] = list(masks)
+            self._bitmaps[col] = {value: np.packbits(mask) for value, mask in masks.items()}
+        self._all = np.packbits(np.ones(self.n_rows, dtype=bool))
+        self._empty = np.zeros_like(self._all)
+        self._id = next(_engine_ids)
+        self._lock = threading.Lock()
+        self._text = None
+
+    def append(self, df):
+        # df: 기존 행 뒤에 행이 추가된 전체 프레임 → 추가된 행만 인덱싱해 비트맵을 이어 붙인 새 엔진
+        # (기존 엔진은 여러 세션이 공유하므로 수정하지 않는다)
+        engine = QueryEngine(df, columns=[])
+        added = df.iloc[self.n_rows:]
+        for col, bitmaps in self._bitmaps.items():
+            masks = _value_masks(added[col])
+            # 전체를 다시 factorize 했을 때와 같은 순서가 되도록 원래 dtype(범주 순서 포함)으로 정렬 (결측은 항상 마지막)
+            present = [v for v in self._values[col] if v != MISSING]
+            union = pd.Series(present + [v for v in masks if v != MISSING and v not in bitmaps], dtype=df[col].dtype)
+            engine._values[col] = pd.Index(pd.factorize(union, sort=True)[1]).tolist()
+            if MISSING in bitmaps or MISSING in masks:
+                engine._values[col].append(MISSING)
+            engine._bitmaps[col] = {}
+            for value in engine._values[col]:
+                old = bitmaps.get(value)
+                if old is None:
+                    old = np.zeros_like(self._empty)
+                mask = masks[value] if value in masks else np.zeros(len(added), dtype=bool)
+                engine._bitmaps[col][value] = _extend_bits(old, self.n_rows, mask)
+        # 문자열 색인을 이미 만들었으면 추가된 행만 색인해 넘기고, 아니면 새 엔진에서 처음 검색할 때 만든다
+        if self._text is not None:
+            engine._text = self._text.append(df)
+        return engine
+
+    @property
+    def nbytes(self):
+        # 비트맵 + 문자열 색인 (프레임은 파생 컬럼 캐시와 공유하므로 제외)
+        bitmaps = sum(bits.nbytes for bitmaps in self._bitmaps.values() for bits in bitmaps.values())
+        return bitmaps + self._all.nbytes + self._empty.nbytes + (self._text.nbytes if self._text is not None else 0)
+
+    def values(self, col):
+        # 컬럼에 실제로 존재하는 값 목록 (정렬됨, 결측 행이 있으면 마지막에 MISSING)
+        return list(self._values[col])
+
+    def _column_bits(self, col, selected):
+        bits = self._empty.copy()
+        bitmaps = self._bitmaps[col]
+        for value in selected:
+            if value in bitmaps:
+                np.bitwise_or(bits, bitmaps[value], out=bits)
+        return bits
+
+    def text_index(self):
+        with self._lock:
+            if self._text is None:
+                self._text = TextIndex(self.df, [col for col in TEXT_COLUMNS if col in self.df])
+            return self._text
+
+    def query(self, filters, text=None):
+        # filters: {컬럼: 선택한 값 목록}, text: {문자열 컬럼: 검색어} (대소문자 무시 부분 일치) → QueryResult
+        text = {col: needle.strip().lower() for col, needle in (text or {}).items() if needle and needle.strip()}
+        key = (tuple(sorted((col, frozenset(values)) for col, values in filters.items())), tuple(sorted(text.items())))
+        return memory_governor.pool("queries").get_or_build((self._id, 'query', key), lambda: self._query(key, filters, text))
+
+    def _query(self, key, filters, text):
+        bits = self._all.copy()
+        for col, selected in filters.items():
+            if set(self._values[col]) <= set(selected):
+                continue  # 모두 선택 → 이 컬럼은 거르지 않는다
+            np.bitwise_and(bits, self._column_bits(col, selected), out=bits)
+        if text:
+            index = self.text_index()
+            for col, needle in text.items():
+                np.bitwise_and(bits, index.search(col, needle), out=bits)
+        return QueryResult(bits, self.n_rows, key)
+
+    def sort_order(self, col, ascending=True):
+        # 전체 행을 col 기준으로 정렬한 위치 배열 (결측값은 항상 마지막, 같은 값은 원래 순서 유지)
+        return memory_governor.pool("queries").get_or_build((self._id, 'order', col, bool(ascending)),
+                                                            lambda: self._sort_order(col, ascending))
+
+    def _sort_order(self, col, ascending):
+        values = self.df[col].reset_index(drop=True)
+        order = values.sort_values(ascending=ascending, kind='stable', na_position='last').index.to_numpy()
+        return order.astype(np.int32 if self.n_rows < 2**31 else np.int64)
+
+    def fetch(self, result, start, stop, columns=None, sort_by=None, ascending=True):
+        # 결과 중 한 페이지 분량의 행만 꺼낸다 (필요한 컬럼만, sort_by 가 있으면 정렬된 순서의 구간)
+        # 행을 먼저 골라낸 뒤 컬럼을 고른다 → 전체 행 크기의 중간 프레임을 만들지 않는다
+        if sort_by is None:
+            positions = result.positions(start, stop)
+        else:
+            order = self.sort_order(sort_by, ascending)
+            positions = memory_governor.pool("queries").get_or_build(
+                (self._id, 'sorted', result.key, sort_by, bool(ascending)), lambda: result.sorted_positions(order))[start:stop]
+        page = self.df.take(positions)
+        return page if columns is None else page[columns]
@@ -0,0 +1,220 @@
+# shared_dataset.py
+# 타입 지정된 탑승자 테이블을 컬럼별 파일로 한 번 게시(publish)하고, 모든 프로세스 · 세션이 mmap 으로 읽기 전용 공유한다.
+# - 수치형 컬럼은 .npy, 범주형은 코드(.npy) + 범주 목록(manifest), 문자열은 Arrow IPC 파일
+#   → 여러 Streamlit 프로세스가 같은 페이지 캐시를 공유하고, 각 프로세스는 파싱 · 복사 없이 붙기만 한다
+# - 버전(데이터 fingerprint)마다 디렉터리를 따로 두고, 임시 디렉터리에 다 쓴 뒤 rename 으로 게시
+# - 최신 버전은 CURRENT 파일이 가리키며 os.replace 로 원자적으로 교체된다 (데이터 갱신 중에도 반쯤 쓴 버전을 읽지 않음)
+#   CURRENT 는 lineage 상 더 새 버전으로만 옮긴다 (이전 버전을 늦게 게시한 프로세스가 CURRENT 를 되돌리지 않음)
+# - 행이 추가(ingest.py)된 버전은 직전 버전의 컬럼 파일에 추가된 행만 이어 붙여 만든다 (Parquet 을 다시 읽지 않음)
+#
+# 사용 예)
+#   python shared_dataset.py          # 모든 테이블을 게시하고 버전 출력 (배포 시 워커 시작 전에 한 번)
+
+import json
+import os
+import shutil
+import uuid
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.ipc as ipc
+
+import data_store
+import model_registry
+
+SHARED_DIR = os.path.join(data_store.CACHE_DIR, "shared")
+KEEP_VERSIONS = 2  # 현재 버전 + 직전 버전 (교체 직후 아직 이전 버전을 읽는 프로세스를 위해)
+
+
+def version_id(fingerprint):
+    return fingerprint[:16]
+
+
+def _table_dir(name):
+    return os.path.join(SHARED_DIR, name)
+
+
+def _version_dir(name, version):
+    return os.path.join(_table_dir(name), version)
+
+
+def _current_path(name):
+    return os.path.join(_table_dir(name), "CURRENT")
+
+
+def current_version(name):
+    try:
+        with open(_current_path(name), encoding='utf-8') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def _set_current(name, version):
+    tmp = f"{_current_path(name)}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, "w", encoding='utf-8') as f:
+        f.write(version)
+    os.replace(tmp, _current_path(name))
+
+
+def _write_column(directory, col, series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        np.save(os.path.join(directory, f"{col}.npy"), np.ascontiguousarray(series.cat.codes.to_numpy()))
+        return {"name": col, "kind": "categorical", "categories": series.cat.categories.tolist()}
+    if pd.api.types.is_numeric_dtype(series.dtype) or pd.api.types.is_bool_dtype(series.dtype):
+        np.save(os.path.join(directory, f"{col}.npy"), np.ascontiguousarray(series.to_numpy()))
+        return {"name": col, "kind": "numeric"}
+    # 문자열: 결측값은 null 로, 한 chunk 로 기록해 읽을 때 복사 없이 pandas 배열로 감싼다
+    table = pa.table({col: pa.array(series, type=pa.large_string(), from_pandas=True)})
+    with ipc.new_file(os.path.join(directory, f"{col}.arrow"), table.schema) as writer:
+        writer.write_table(table)
+    return {"name": col, "kind": "string"}
+
+
+def _write_version(directory, df, fingerprint):
+    os.makedirs(directory)
+    columns = [_write_column(directory, col, df[col]) for col in df.columns]
+    with open(os.path.join(directory, "manifest.json"), "w", encoding='utf-8') as f:
+        json.dump({"fingerprint": fingerprint, "n_rows": int(len(df)), "columns": columns}, f, ensure_ascii=False)
+
+
+def _read_manifest(name, version):
+    try:
+        with open(os.path.join(_version_dir(name, version), "manifest.json"), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _can_extend(manifest, rows):
+    # 컬럼 구성이 같고, 범주형 컬럼에 기존 범주에 없는 값이 없을 때만 이어 붙인다 (새 범주가 생기면 전체를 다시 게시)
+    if [spec["name"] for spec in manifest["columns"]] != list(rows.columns):
+        return False
+    for spec in manifest["columns"]:
+        if spec["kind"] == "categorical":
+            values = rows[spec["name"]].dropna()
+            if not values.isin(spec["categories"]).all():
+                return False
+    return True
+
+
+def _extend_version(directory, previous, manifest, rows, fingerprint):
+    # 직전 버전 파일을 그대로 복사하고 추가된 행만 덧붙인다 (문자열 컬럼은 Arrow record batch 하나를 더 기록)
+    os.makedirs(directory)
+    n_old, n_new = manifest["n_rows"], len(rows)
+    for spec in manifest["columns"]:
+        col = spec["name"]
+        if spec["kind"] == "string":
+            old = ipc.open_file(pa.memory_map(os.path.join(previous, f"{col}.arrow"))).read_all()
+            new = pa.table({col: pa.array(rows[col], type=pa.large_string(), from_pandas=True)})
+            with ipc.new_file(os.path.join(directory, f"{col}.arrow"), old.schema) as writer:
+                writer.write_table(old)
+                writer.write_table(new)
+            continue
+        old = np.load(os.path.join(previous, f"{col}.npy"), mmap_mode='r')
+        if spec["kind"] == "categorical":
+            new = pd.Categorical(rows[col], categories=spec["categories"]).codes
+        else:
+            new = rows[col].to_numpy()
+        out = np.lib.format.open_memmap(os.path.join(directory, f"{col}.npy"), mode='w+', dtype=old.dtype,
+                                        shape=(n_old + n_new,))
+        out[:n_old] = old
+        out[n_old:] = new
+        out.flush()
+        del out
+    with open(os.path.join(directory, "manifest.json"), "w", encoding='utf-8') as f:
+        json.dump({**manifest, "fingerprint": fingerprint, "n_rows": n_old + n_new}, f, ensure_ascii=False)
+
+
+def _collect_garbage(name, keep):
+    # 오래된 버전 삭제 (이미 mmap 한 프로세스는 POSIX 에서 계속 읽을 수 있고, 삭제가 안 되는 OS 에서는 다음 기회에)
+    versions = [d for d in os.listdir(_table_dir(name)) if os.path.isdir(_version_dir(name, d)) and not d.startswith('.')]
+    versions.sort(key=lambda d: os.path.getmtime(_version_dir(name, d)), reverse=True)
+    for version in versions[keep:]:
+        if version != current_version(name):
+            shutil.rmtree(_version_dir(name, version), ignore_errors=True)
+
+
+def _advance_current(name, version, fingerprint):
+    # 게시된 버전보다 lineage 상 새 버전일 때만 CURRENT 를 옮긴다 (원본이 바뀌어 게시된 버전이 lineage 에 없으면 옮긴다)
+    # 확인과 교체 사이에 다른 프로세스가 끼어들지 않도록 테이블별 파일 잠금 안에서
+    with model_registry.file_lock(f"shared-{name}"):
+        current = current_version(name)
+        if current == version:
+            return
+        chain = data_store.lineage(name)
+        if fingerprint not in chain:
+            return
+        manifest = _read_manifest(name, current) if current else None
+        if manifest and manifest["fingerprint"] in chain and chain.index(manifest["fingerprint"]) > chain.index(fingerprint):
+            return
+        _set_current(name, version)
+        _collect_garbage(name, KEEP_VERSIONS)
+
+
+def publish(name, fingerprint=None):
+    # fingerprint 버전(기본: 현재)이 없으면 그 버전의 행으로 만들어 게시하고, 더 새 버전이면 CURRENT 를 옮긴다 → 버전 id
+    # 현재 데이터의 lineage 에 없는 fingerprint (원본 CSV 가 바뀌기 전 버전 등)는 만들 수 없으므로 ValueError
+    fingerprint = fingerprint or data_store.fingerprint(name)
+    version = version_id(fingerprint)
+    final = _version_dir(name, version)
+    if not os.path.exists(os.path.join(final, "manifest.json")):
+        os.makedirs(_table_dir(name), exist_ok=True)
+        tmp = _version_dir(name, f".{version}.{uuid.uuid4().hex}.tmp")
+        previous = current_version(name)
+        manifest = _read_manifest(name, previous) if previous else None
+        rows = data_store.appended_since(name, manifest["fingerprint"], fingerprint) if manifest else None
+        try:
+            if rows is not None and _can_extend(manifest, rows):
+                _extend_version(tmp, _version_dir(name, previous), manifest, rows, fingerprint)
+            else:
+                df = data_store.load_table_at(name, fingerprint)
+                if df is None:
+                    raise ValueError(f"{name}: 현재 데이터에 없는 버전입니다: {version}")
+                _write_version(tmp, df, fingerprint)
+            os.rename(tmp, final)
+        except OSError:
+            # 다른 프로세스가 먼저 같은 버전을 게시했으면 그 결과를 쓴다
+            if not os.path.exists(os.path.join(final, "manifest.json")):
+                raise
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+    if current_version(name) != version:
+        _advance_current(name, version, fingerprint)
+    return version
+
+
+def _read_column(directory, spec):
+    if spec["kind"] == "string":
+        table = ipc.open_file(pa.memory_map(os.path.join(directory, f"{spec['name']}.arrow"))).read_all()
+        return pd.arrays.ArrowStringArray(table.column(0))
+    # np.memmap 하위 클래스가 연산 결과로 퍼지지 않도록 같은 메모리를 보는 일반 ndarray 로 넘긴다
+    values = np.load(os.path.join(directory, f"{spec['name']}.npy"), mmap_mode='r').view(np.ndarray)
+    if spec["kind"] == "categorical":
+        return pd.Categorical.from_codes(values, categories=spec["categories"], validate=False)
+    return values
+
+
+def attach(name, fingerprint=None):
+    # 게시된 버전에 mmap 으로 붙은 읽기 전용 DataFrame (fingerprint 를 생략하면 CURRENT 버전)
+    # 배열은 파일 매핑을 그대로 쓰고, 수정은 Copy-on-Write 로 세션별 사본에만 반영된다
+    if fingerprint is not None:
+        version = publish(name, fingerprint)
+    else:
+        version = current_version(name) or publish(name)
+    directory = _version_dir(name, version)
+    with open(os.path.join(directory, "manifest.json"), encoding='utf-8') as f:
+        manifest = json.load(f)
+    columns = {spec["name"]: _read_column(directory, spec) for spec in manifest["columns"]}
+    return pd.DataFrame(columns, index=pd.RangeIndex(manifest["n_rows"]), copy=False)
+
+
+def main():
+    for name in data_store.SOURCES:
+        version = publish(name)
+        print(f"{name}: {version} → {_version_dir(name, version)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+# summary_stats.py
+# 수치형 컬럼의 요약 통계와 상관계수를 chunk 단위로 누적 계산한다.
+# - 컬럼 쌍 (i, j) 마다 둘 다 결측이 아닌 행만으로 개수 / 평균 / 제곱합 / 교차곱을 유지한다 (pandas corr() 와 같은 pairwise 방식).
+# - 두 결과는 병렬 분산 공식(Chan et al.)으로 합칠 수 있어 chunk · 프로세스 단위로 나눠 계산한 뒤 merge 하면 된다.
+# - 계산이 끝난 뒤 카드 수치와 상관계수 행렬은 행 수와 무관하게 바로 나온다.
+
+import numpy as np
+import pandas as pd
+
+NUMERIC_COLUMNS = ['Survived', 'Pclass', 'Age', 'SibSp', 'Parch', 'Fare']
+
+
+class RunningStats:
+    def __init__(self, columns=NUMERIC_COLUMNS):
+        k = len(columns)
+        self.columns = list(columns)
+        self.rows = 0
+        self.sums = np.zeros(k)           # 컬럼별 결측 제외 합계
+        self.n = np.zeros((k, k))         # n[i, j]: i, j 모두 값이 있는 행 수
+        self.mean = np.zeros((k, k))      # mean[i, j]: 위 행들에서 컬럼 i 의 평균
+        self.m2 = np.zeros((k, k))        # m2[i, j]: 위 행들에서 컬럼 i 의 편차 제곱합
+        self.comoment = np.zeros((k, k))  # comoment[i, j]: 위 행들에서 i, j 편차 곱의 합
+
+    @classmethod
+    def from_frame(cls, df, columns=NUMERIC_COLUMNS):
+        stats = cls(columns)
+        stats.update(df)
+        return stats
+
+    @classmethod
+    def from_chunks(cls, chunks, columns=NUMERIC_COLUMNS):
+        stats = cls(columns)
+        for chunk in chunks:
+            stats.update(chunk)
+        return stats
+
+    def update(self, df):
+        # 한 chunk 의 통계를 계산해 누적값에 합친다
+        X = df[self.columns].to_numpy(dtype='float64', na_value=np.nan)
+        if not len(X):
+            return self
+        valid = ~np.isnan(X)
+        mask = valid.astype('float64')
+        sums = np.where(valid, X, 0.0).sum(axis=0)
+        # chunk 안에서는 컬럼 평균을 빼고 계산해 큰 값에서도 정밀도를 유지한다
+        # (값이 하나도 없는 컬럼은 0 → np.nanmean 처럼 'Mean of empty slice' 경고를 내지 않는다)
+        shift = sums / np.maximum(valid.sum(axis=0), 1)
+        D = np.where(valid, X - shift, 0.0)
+
+        n = mask.T @ mask
+        sx = D.T @ mask
+        with np.errstate(invalid='ignore', divide='ignore'):
+            centered = np.where(n > 0, sx / n, 0.0)
+        chunk = RunningStats(self.columns)
+        chunk.rows = len(X)
+        chunk.sums = sums
+        chunk.n = n
+        chunk.mean = shift[:, None] + centered
+        chunk.m2 = (D * D).T @ mask - centered * sx
+        chunk.comoment = D.T @ D - centered * sx.T
+        self._merge_into(chunk)
+        return self
+
+    def _merge_into(self, other):
+        n = self.n + other.n
+        delta = other.mean - self.mean
+        with np.errstate(invalid='ignore', divide='ignore'):
+            weight = np.where(n > 0, self.n * other.n / n, 0.0)
+            ratio = np.where(n > 0, other.n / n, 0.0)
+        self.comoment = self.comoment + other.comoment + delta * delta.T * weight
+        self.m2 = self.m2 + other.m2 + delta * delta * weight
+        self.mean = self.mean + delta * ratio
+        self.n = n
+        self.sums = self.sums + other.sums
+        self.rows += other.rows
+
+    def merge(self, other):
+        # 두 결과를 합친 새 객체 (캐시에 공유된 객체는 수정하지 않는다)
+        if other.columns != self.columns:
+            raise ValueError("컬럼 구성이 다른 통계는 합칠 수 없습니다.")
+        merged = self.copy()
+        merged._merge_into(other)
+        return merged
+
+    def copy(self):
+        return RunningStats.from_dict(self.to_dict())
+
+    def to_dict(self):
+        # 프로세스 간 전달 / 파일 저장용 (JSON 직렬화 가능)
+        return {
+            'columns': self.columns,
+            'rows': self.rows,
+            'sums': self.sums.tolist(),
+            'n': self.n.tolist(),
+            'mean': self.mean.tolist(),
+            'm2': self.m2.tolist(),
+            'comoment': self.comoment.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, d):
+        stats = cls(d['columns'])
+        stats.rows = d['rows']
+        stats.sums = np.asarray(d['sums'], dtype='float64')
+        for name in ('n', 'mean', 'm2', 'comoment'):
+            setattr(stats, name, np.asarray(d[name], dtype='float64'))
+        return stats
+
+    def count(self):
+        return pd.Series(np.diag(self.n), index=self.columns)
+
+    def sum(self):
+        return pd.Series(self.sums, index=self.columns)
+
+    def means(self):
+        return pd.Series(np.where(np.diag(self.n) > 0, np.diag(self.mean), np.nan), index=self.columns)
+
+    def std(self, ddof=1):
+        n = np.diag(self.n)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            var = np.where(n > ddof, np.diag(self.m2) / (n - ddof), np.nan)
+        return pd.Series(np.sqrt(var), index=self.columns)
+
+    def corr(self, min_periods=1):
+        # pandas DataFrame.corr(method='pearson') 와 같은 pairwise 상관계수
+        with np.errstate(invalid='ignore', divide='ignore'):
+            corr = self.comoment / np.sqrt(self.m2 * self.m2.T)
+        corr = np.where(self.n >= max(min_periods, 2), np.clip(corr, -1.0, 1.0), np.nan)
+        np.fill_diagonal(corr, np.where(np.diag(self.n) >= max(min_periods, 2), 1.0, np.nan))
+        return pd.DataFrame(corr, index=self.columns, columns=self.columns)
@@ -0,0 +1,196 @@
+# synthetic_data.py
+# data/train.csv 의 분포를 학습해 원하는 규모의 합성 탑승자 데이터를 만든다 (부하·확장성 테스트용).
+# - (Pclass, Sex, Embarked, Survived) 결합 분포, 그룹별 (SibSp, Parch) 결합 분포
+# - (Pclass, Sex, Survived) 별 나이 분포(결측률 포함), 객실 등급별 요금 로그정규 분포
+# - 이름 / 티켓 / 객실 번호도 원본의 형식을 따라 생성
+# chunk 단위로 생성·기록하므로 행 수와 관계없이 메모리 사용량이 일정하다.
+#
+# 사용 예)
+#   python synthetic_data.py 1000000 -o /tmp/titanic-1m
+#   python synthetic_data.py 10000000 -o /tmp/titanic-10m --format parquet
+#   TITANIC_DATA_DIR=/tmp/titanic-1m streamlit run app.py
+
+import argparse
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+COLUMNS = ['PassengerId', 'Survived', 'Pclass', 'Name', 'Sex', 'Age', 'SibSp', 'Parch', 'Ticket', 'Fare', 'Cabin', 'Embarked']
+JOINT_COLUMNS = ['Pclass', 'Sex', 'Embarked', 'Survived']
+CHUNK_ROWS = 500_000
+MISSING = '__missing__'
+
+
+class SyntheticTitanic:
+    def __init__(self, train):
+        df = train.copy()
+        df['Embarked'] = df['Embarked'].astype(object).fillna(MISSING)
+
+        # 범주형 결합 분포
+        joint = df.groupby(JOINT_COLUMNS, observed=True).size()
+        self.joint_keys = joint.index.to_frame(index=False)
+        self.joint_probs = (joint / joint.sum()).to_numpy()
+
+        # (Pclass, Sex) 별 가족 수 조합
+        self.family = {key: g[['SibSp', 'Parch']].to_numpy() for key, g in df.groupby(['Pclass', 'Sex'], observed=True)}
+
+        # (Pclass, Sex, Survived) 별 나이: 결측률 + 평균/표준편차
+        self.age = {}
+        for key, g in df.groupby(['Pclass', 'Sex', 'Survived'], observed=True):
+            ages = g['Age'].dropna()
+            self.age[key] = (g['Age'].isna().mean(), ages.mean(), ages.std(ddof=0) or 1.0)
+
+        # 객실 등급별 요금: 0원 비율 + log(요금) 정규분포
+        self.fare = {}
+        for pclass, g in df.groupby('Pclass'):
+            fares = g['Fare'].dropna()
+            positive = np.log(fares[fares > 0])
+            self.fare[pclass] = ((fares == 0).mean(), positive.mean(), positive.std(ddof=0))
+
+        # 객실 번호: 등급별 결측률 + 갑판(첫 글자) 분포
+        self.cabin = {}
+        for pclass, g in df.groupby('Pclass'):
+            decks = g['Cabin'].dropna().str[0].value_counts(normalize=True)
+            self.cabin[pclass] = (g['Cabin'].isna().mean(), decks.index.to_numpy(), decks.to_numpy())
+
+        # 이름 / 티켓 구성 요소
+        names = df['Name'].str.extract(r'^(?P<surname>[^,]+),\s*(?P<title>[^.]+)\.\s*(?P<given>.*)$')
+        self.surnames = names['surname'].dropna().unique()
+        self.given = {sex: names.loc[df['Sex'] == sex, 'given'].dropna().unique() for sex in ('male', 'female')}
+        prefixes = df['Ticket'].str.extract(r'^(.*?)\s*\d+$')[0].fillna('')
+        self.ticket_prefixes = prefixes.to_numpy()
+
+    @classmethod
+    def from_csv(cls, path=os.path.join("data", "train.csv")):
+        return cls(pd.read_csv(path))
+
+    def sample(self, n, rng, start_id=1):
+        keys = self.joint_keys.iloc[rng.choice(len(self.joint_probs), size=n, p=self.joint_probs)].reset_index(drop=True)
+        pclass = keys['Pclass'].to_numpy()
+        sex = keys['Sex'].to_numpy()
+        survived = keys['Survived'].to_numpy()
+
+        sibsp = np.zeros(n, dtype=np.int64)
+        parch = np.zeros(n, dtype=np.int64)
+        for (p, s), pairs in self.family.items():
+            mask = (pclass == p) & (sex == s)
+            picked = pairs[rng.integers(0, len(pairs), mask.sum())]
+            sibsp[mask], parch[mask] = picked[:, 0], picked[:, 1]
+
+        age = np.full(n, np.nan)
+        for (p, s, v), (missing, mean, std) in self.age.items():
+            mask = (pclass == p) & (sex == s) & (survived == v)
+            values = np.clip(rng.normal(mean, std, mask.sum()), 0.42, 80)
+            values = np.where(values >= 1, np.round(values), np.round(values, 2))
+            values[rng.random(mask.sum()) < missing] = np.nan
+            age[mask] = values
+
+        fare = np.zeros(n)
+        cabin = np.full(n, None, dtype=object)
+        for p in self.fare:
+            mask = pclass == p
+            zero, mu, sigma = self.fare[p]
+            values = np.round(np.exp(rng.normal(mu, sigma, mask.sum())), 4)
+            values[rng.random(mask.sum()) < zero] = 0.0
+            fare[mask] = values
+
+            missing, decks, probs = self.cabin[p]
+            count = mask.sum()
+            has_cabin = rng.random(count) >= missing
+            cabins = np.full(count, None, dtype=object)
+            if len(decks) and has_cabin.any():
+                deck = rng.choice(decks, size=has_cabin.sum(), p=probs)
+                number = rng.integers(1, 130, has_cabin.sum()).astype(str)
+                cabins[has_cabin] = np.char.add(deck.astype(str), number)
+            cabin[mask] = cabins
+
+        return pd.DataFrame({
+            'PassengerId': np.arange(start_id, start_id + n),
+            'Survived': survived,
+            'Pclass': pclass,
+            'Name': self._names(sex, age, rng),
+            'Sex': sex,
+            'Age': age,
+            'SibSp': sibsp,
+            'Parch': parch,
+            'Ticket': self._tickets(n, rng),
+            'Fare': fare,
+            'Cabin': cabin,
+            'Embarked': keys['Embarked'].replace(MISSING, np.nan).to_numpy(),
+        }, columns=COLUMNS)
+
+    def _names(self, sex, age, rng):
+        n = len(sex)
+        surname = self.surnames[rng.integers(0, len(self.surnames), n)]
+        given = np.empty(n, dtype=object)
+        title = np.empty(n, dtype=object)
+        male = sex == 'male'
+        given[male] = self.given['male'][rng.integers(0, len(self.given['male']), male.sum())]
+        given[~male] = self.given['female'][rng.integers(0, len(self.given['female']), (~male).sum())]
+        title[male] = np.where(age[male] < 13, 'Master', 'Mr')
+        title[~male] = np.where(rng.random((~male).sum()) < 0.5, 'Mrs', 'Miss')
+        return surname.astype(object) + ', ' + title + '. ' + given
+
+    def _tickets(self, n, rng):
+        prefix = self.ticket_prefixes[rng.integers(0, len(self.ticket_prefixes), n)]
+        number = rng.integers(1000, 3_999_999, n).astype(str)
+        return np.where(prefix == '', number, np.char.add(np.char.add(prefix.astype(str), ' '), number))
+
+    def generate(self, n_rows, chunk_rows=CHUNK_ROWS, seed=0):
+        # chunk 단위로 합성 데이터를 순서대로 내보낸다
+        rng = np.random.default_rng(seed)
+        for start in range(0, n_rows, chunk_rows):
+            yield self.sample(min(chunk_rows, n_rows - start), rng, start_id=start + 1)
+
+
+def write(chunks, path, fmt='csv'):
+    # 생성된 chunk 를 바로 파일에 이어 쓴다 (CSV 또는 Parquet)
+    tmp = path + ".tmp"
+    if fmt == 'parquet':
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        writer = None
+        try:
+            for chunk in chunks:
+                table = pa.Table.from_pandas(chunk, preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table.cast(writer.schema))
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        with open(tmp, "w", newline="", encoding="utf-8") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=(i == 0))
+    os.replace(tmp, path)
+    return path
+
+
+def write_dataset(n_rows, out_dir, fmt='csv', seed=0, source_dir="data", chunk_rows=CHUNK_ROWS):
+    # out_dir 에 합성 train 데이터와 원본 test / gender_submission 을 준비한다 (TITANIC_DATA_DIR 로 지정해 사용)
+    os.makedirs(out_dir, exist_ok=True)
+    model = SyntheticTitanic.from_csv(os.path.join(source_dir, "train.csv"))
+    path = write(model.generate(n_rows, chunk_rows, seed), os.path.join(out_dir, f"train.{fmt}"), fmt)
+    for name in ("test.csv", "gender_submission.csv"):
+        shutil.copy(os.path.join(source_dir, name), os.path.join(out_dir, name))
+    return path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 합성 탑승자 데이터 생성")
+    parser.add_argument("rows", type=int, help="생성할 탑승자 수")
+    parser.add_argument("-o", "--out-dir", required=True)
+    parser.add_argument("--format", choices=["csv", "parquet"], default="csv")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    args = parser.parse_args(argv)
+
+    path = write_dataset(args.rows, args.out_dir, args.format, args.seed, chunk_rows=args.chunk_rows)
+    print(f"{args.rows:,}명 생성 완료: {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+# table_view.py
+# 질의 엔진 결과를 서버에서 정렬 · 페이지 단위로 잘라 보여주는 표 컴포넌트
+# - 브라우저로는 현재 페이지의 선택한 컬럼만 보낸다 (전체 결과를 Arrow 로 직렬화하지 않음)
+# - 총 건수는 결과 비트맵의 개수에서 바로 읽는다 (행을 만들지 않음)
+
+import pandas as pd
+import streamlit as st
+from instrumentation import timed
+
+PAGE_SIZES = [20, 50, 100, 500]
+NO_SORT = "(기본 순서)"
+
+
+def show_table(engine, result, key, columns, default_columns=None, labels=None, page_size=50):
+    # columns: 선택 가능한 컬럼, default_columns: 처음 보여줄 컬럼, labels: {컬럼: 표시 이름}
+    # key: 같은 앱 안에서 표마다 위젯 상태를 구분하는 접두사
+    labels = labels or {}
+
+    def label(col):
+        return labels.get(col, col)
+
+    shown = st.multiselect("표시할 컬럼", options=columns, default=default_columns or columns,
+                           format_func=label, key=f"{key}_columns")
+    col1, col2, col3, col4 = st.columns([2, 1, 1, 2])
+    sort_by = col1.selectbox("정렬 기준", options=[NO_SORT] + list(columns), format_func=label, key=f"{key}_sort")
+    descending = col2.toggle("내림차순", value=False, key=f"{key}_desc", disabled=sort_by == NO_SORT)
+    size = col3.selectbox("페이지 당 행 수", options=PAGE_SIZES, index=PAGE_SIZES.index(page_size), key=f"{key}_size")
+
+    # 필터가 바뀌어 페이지 수가 줄었으면 마지막 페이지로 맞춘다 (위젯 생성 전에만 상태를 바꿀 수 있음)
+    n_pages = max(1, -(-result.count // size))
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = col4.number_input(f"페이지 (총 {n_pages:,}쪽)", min_value=1, max_value=n_pages, step=1, key=page_key)
+    start = (page - 1) * size
+
+    with timed("table.fetch"):
+        page_df = engine.fetch(result, start, start + size, shown or columns,
+                               sort_by=None if sort_by == NO_SORT else sort_by, ascending=not descending)
+    # 행 번호는 결과 전체 기준 (1부터)
+    page_df = page_df.set_axis(pd.RangeIndex(start + 1, start + 1 + len(page_df))).rename(columns=labels)
+    st.dataframe(page_df, use_container_width=True)
+    return page_df
@@ -0,0 +1,7 @@
+# 저장소 루트의 최상위 모듈(api, predict, query_engine …)을 테스트에서 import 할 수 있도록 경로에 추가
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
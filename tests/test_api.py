@@ -0,0 +1,35 @@
+# api.py: 요청 검증 (모델이 없어도 검증은 예측 전에 끝나야 한다)
+
+import pytest
+
+from api import TestClient
+
+ROW = {"Sex": "female", "Pclass": 1, "SibSp": 0, "Parch": 0, "Fare": 80.0}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient() as c:
+        yield c
+
+
+def test_batch_with_incomplete_row_is_rejected(client):
+    incomplete = {k: v for k, v in ROW.items() if k not in ('Sex', 'Pclass')}
+    r = client.post('/predict', {"passengers": [ROW, incomplete, ROW]})
+    assert r.status_code == 400
+    assert 'passengers[1]' in r.json()['error']
+    assert 'Sex' in r.json()['error'] and 'Pclass' in r.json()['error']
+
+
+@pytest.mark.parametrize("field, value", [("Sex", "mail"), ("Sex", None), ("Pclass", None),
+                                          ("Fare", "80"), ("SibSp", float('nan'))])
+def test_batch_with_invalid_value_is_rejected(client, field, value):
+    r = client.post('/predict', {"passengers": [ROW, dict(ROW, **{field: value})]})
+    assert r.status_code == 400
+    assert f'passengers[1].{field}' in r.json()['error']
+
+
+def test_single_requires_pclass_and_fare(client):
+    r = client.post('/predict/single', {"sex": "female", "fare": 80})
+    assert r.status_code == 400
+    assert 'pclass' in r.json()['error']
@@ -0,0 +1,100 @@
+# memory_governor.py: LRU 예산 · 동시 요청 시 한 번만 만들기 · 만드는 도중 무효화
+
+import threading
+import time
+
+from memory_governor import LRUCache
+
+
+def _cache(budget=1_000):
+    return LRUCache("test", budget, sizeof=lambda value: 100)
+
+
+def test_evicts_least_recently_used_over_budget():
+    cache = _cache(budget=250)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.peek("b") is None
+    assert (cache.peek("a"), cache.peek("c")) == (1, 3)
+    assert cache.stats()["bytes"] == 200
+
+
+def test_concurrent_requests_build_once():
+    cache = _cache()
+    calls = []
+    release = threading.Event()
+
+    def build():
+        calls.append(1)
+        release.wait(5)
+        return "value"
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_build("k", build))) for _ in range(8)]
+    for t in threads:
+        t.start()
+    time.sleep(0.05)
+    release.set()
+    for t in threads:
+        t.join(5)
+    assert len(calls) == 1
+    assert results == ["value"] * 8
+
+
+def _build_in_thread(cache, key, value, release, results, started):
+    def build():
+        started.set()
+        release.wait(5)
+        return value
+    thread = threading.Thread(target=lambda: results.append(cache.get_or_build(key, build)))
+    thread.start()
+    assert started.wait(5)
+    return thread
+
+
+def test_invalidate_during_build():
+    cache = _cache()
+    first_release, second_release = threading.Event(), threading.Event()
+    first_results, second_results, waiter_results = [], [], []
+
+    # 첫 번째 빌드 도중 무효화 → 다음 요청은 새로 만든다
+    first = _build_in_thread(cache, "k", "stale", first_release, first_results, threading.Event())
+    cache.pop("k")
+    second = _build_in_thread(cache, "k", "fresh", second_release, second_results, threading.Event())
+
+    # 첫 번째 빌드가 끝나도 두 번째 빌드의 표시를 지우거나 무효화된 값을 캐시하지 않는다
+    first_release.set()
+    first.join(5)
+    assert first_results == ["stale"]
+    assert cache.peek("k") is None
+
+    # 두 번째 빌드가 진행 중이므로 새 요청은 만들지 않고 기다린다
+    extra_builds = []
+    waiter = threading.Thread(target=lambda: waiter_results.append(
+        cache.get_or_build("k", lambda: extra_builds.append(1) or "duplicate")))
+    waiter.start()
+    time.sleep(0.05)
+    assert not extra_builds
+
+    second_release.set()
+    second.join(5)
+    waiter.join(5)
+    assert second_results == ["fresh"] and waiter_results == ["fresh"]
+    assert not extra_builds
+    assert cache.peek("k") == "fresh"
+    assert cache.stats()["entries"] == 1
+
+
+def test_failed_build_lets_the_next_request_retry():
+    cache = _cache()
+
+    def fail():
+        raise RuntimeError("boom")
+
+    try:
+        cache.get_or_build("k", fail)
+    except RuntimeError:
+        pass
+    assert cache.get_or_build("k", lambda: "ok") == "ok"
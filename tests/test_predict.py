@@ -0,0 +1,23 @@
+# predict.py: 단일 탑승자 예측 입력 검증
+
+import numpy as np
+import pytest
+
+from predict import predict_passenger
+
+
+class ConstantModel:
+    classes_ = np.array([0, 1])
+
+    def predict_proba(self, X):
+        return np.tile([0.25, 0.75], (len(X), 1))
+
+
+@pytest.mark.parametrize("sex", ["Female", "f", "", None])
+def test_unknown_sex_raises(sex):
+    with pytest.raises(ValueError):
+        predict_passenger(sex, 1, 0, 0, 80.0, model=ConstantModel())
+
+
+def test_known_sex_predicts():
+    assert predict_passenger("female", 1, 0, 0, None, model=ConstantModel()) == (1, 0.75)
@@ -0,0 +1,44 @@
+# query_engine.py: 결측 범주값 행도 필터 선택지에 나타나고, 기본값(모두 선택)에서 빠지지 않아야 한다
+
+import numpy as np
+import pandas as pd
+
+from query_engine import MISSING, QueryEngine
+
+COLUMNS = ['Sex', 'Embarked', 'Pclass']
+
+
+def _frame(sex, embarked, pclass):
+    return pd.DataFrame({'Sex': sex, 'Embarked': embarked, 'Pclass': pclass})
+
+
+def _all_selected(engine):
+    return {col: engine.values(col) for col in COLUMNS}
+
+
+def test_nan_categoricals_get_a_missing_option():
+    df = _frame(['male', np.nan, 'female', 'male'], ['S', 'C', None, np.nan], [1, 2, 3, 3])
+    engine = QueryEngine(df, columns=COLUMNS)
+    assert engine.values('Sex') == ['female', 'male', MISSING]
+    assert engine.values('Embarked') == ['C', 'S', MISSING]
+    assert engine.values('Pclass') == [1, 2, 3]
+
+    assert engine.query(_all_selected(engine)).count == 4
+    assert list(engine.query({'Sex': [MISSING]}).positions()) == [1]
+    assert list(engine.query({'Embarked': [MISSING]}).positions()) == [2, 3]
+    assert list(engine.query({'Sex': ['male'], 'Embarked': ['S', MISSING]}).positions()) == [0, 3]
+    # 결측을 빼고 고르면 결측 행은 제외
+    assert engine.query({'Sex': ['female', 'male']}).count == 3
+
+
+def test_append_matches_a_full_rebuild():
+    df = _frame(['male', 'female', 'male', np.nan, 'female', None, 'male', 'male', 'female', 'male'],
+                ['S', 'C', 'S', 'Q', np.nan, 'S', 'C', np.nan, 'S', 'Q'], [1, 2, 3, 3, 1, 2, 3, 1, 2, 3])
+    for split in (3, 4, 9):
+        appended = QueryEngine(df.iloc[:split], columns=COLUMNS).append(df)
+        rebuilt = QueryEngine(df, columns=COLUMNS)
+        for col in COLUMNS:
+            assert appended.values(col) == rebuilt.values(col)
+            for value in rebuilt.values(col):
+                assert list(appended.query({col: [value]}).positions()) == list(rebuilt.query({col: [value]}).positions())
+        assert appended.query(_all_selected(appended)).count == len(df)
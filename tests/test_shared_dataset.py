@@ -0,0 +1,61 @@
+# shared_dataset.py: 게시된 컬럼 파일은 레이블(fingerprint) 버전의 행과 같아야 하고, CURRENT 는 이전 버전으로 돌아가지 않는다
+
+import os
+
+import pandas as pd
+import pytest
+
+import data_store
+import shared_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # 작업 디렉터리 기준 data/ 에 train.csv 10행 + 추가 batch 3행
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(data_store, "DATA_DIR", "data")
+    monkeypatch.setattr(data_store, "CACHE_DIR", os.path.join("data", ".cache"))
+    monkeypatch.setattr(data_store, "SEGMENTS_DIR", os.path.join("data", "segments"))
+    monkeypatch.setattr(shared_dataset, "SHARED_DIR", os.path.join("data", ".cache", "shared"))
+    source = pd.read_csv(os.path.join(ROOT, "data", "train.csv"))
+    os.makedirs("data")
+    source.head(10).to_csv(os.path.join("data", "train.csv"), index=False)
+    source.iloc[10:13].to_csv("batch.csv", index=False)
+    return tmp_path
+
+
+def _rows(version):
+    return shared_dataset._read_manifest('train', version)["n_rows"]
+
+
+def test_older_fingerprint_is_built_from_its_own_segments(store):
+    v0 = data_store.fingerprint('train')
+    data_store.append_segment('train', "batch.csv")
+    v1 = data_store.fingerprint('train')
+
+    # 새 버전을 먼저 게시한 뒤, 늦게 끝난 프로세스가 이전 버전을 게시
+    assert shared_dataset.publish('train', v1) == shared_dataset.version_id(v1)
+    old = shared_dataset.publish('train', v0)
+    assert _rows(old) == 10
+    assert shared_dataset._read_manifest('train', old)["fingerprint"] == v0
+    assert shared_dataset.current_version('train') == shared_dataset.version_id(v1)
+    assert len(shared_dataset.attach('train', v0)) == 10
+    assert len(shared_dataset.attach('train')) == 13
+
+
+def test_newer_fingerprint_advances_current(store):
+    v0 = data_store.fingerprint('train')
+    shared_dataset.publish('train', v0)
+    data_store.append_segment('train', "batch.csv")
+    v1 = data_store.fingerprint('train')
+    shared_dataset.publish('train', v1)
+    assert shared_dataset.current_version('train') == shared_dataset.version_id(v1)
+    assert _rows(shared_dataset.version_id(v1)) == 13
+
+
+def test_unknown_fingerprint_is_rejected(store):
+    shared_dataset.publish('train')
+    with pytest.raises(ValueError):
+        shared_dataset.publish('train', "0" * 64)
@@ -0,0 +1,51 @@
+# summary_stats.py: chunk 단위 누적 통계가 전체 프레임에 대한 pandas 결과와 같아야 한다
+
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from summary_stats import NUMERIC_COLUMNS, RunningStats
+
+
+def _frame(n, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({
+        'Survived': rng.integers(0, 2, n), 'Pclass': rng.integers(1, 4, n), 'Age': rng.uniform(0, 80, n),
+        'SibSp': rng.integers(0, 5, n), 'Parch': rng.integers(0, 4, n), 'Fare': rng.exponential(30, n),
+    }).astype('float64')
+    df.loc[rng.random(n) < 0.2, 'Age'] = np.nan
+    return df
+
+
+def _assert_matches(stats, df):
+    pd.testing.assert_series_equal(stats.count(), df.count().astype('float64'))
+    pd.testing.assert_series_equal(stats.means(), df.mean(), rtol=1e-9)
+    pd.testing.assert_series_equal(stats.std(), df.std(), rtol=1e-9)
+    pd.testing.assert_frame_equal(stats.corr(), df.corr(), rtol=1e-9, atol=1e-12)
+
+
+def test_chunks_match_pandas():
+    df = _frame(1_000)
+    _assert_matches(RunningStats.from_chunks([df.iloc[i:i + 137] for i in range(0, len(df), 137)]), df)
+
+
+def test_all_nan_chunk_does_not_warn():
+    df = _frame(300)
+    df.loc[:99, 'Age'] = np.nan  # 첫 chunk 의 Age 는 모두 결측 (희소한 컬럼)
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        stats = RunningStats.from_chunks([df.iloc[:100], df.iloc[100:]])
+        empty = RunningStats.from_frame(df.iloc[:100])
+    _assert_matches(stats, df)
+    assert empty.count()['Age'] == 0
+    assert np.isnan(empty.means()['Age'])
+    assert empty.corr()['Age'].isna().all()
+
+
+@pytest.mark.parametrize("columns", [NUMERIC_COLUMNS, ['Age', 'Fare']])
+def test_merge_matches_single_pass(columns):
+    df = _frame(500, seed=1)[columns]
+    merged = RunningStats.from_frame(df.iloc[:200], columns).merge(RunningStats.from_frame(df.iloc[200:], columns))
+    _assert_matches(merged, df)
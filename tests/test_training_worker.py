@@ -0,0 +1,42 @@
+# training_worker.py: 같은 설정의 재학습 요청은 기존 작업을 재사용하되, 그 모델을 최신 모델로 다시 지정해야 한다
+
+import time
+
+import model_registry
+import training_worker
+
+
+def _fake_train_once(config=None, **_):
+    # 설정마다 다른 키로 모델을 등록한 것처럼 registry 에 기록 (실제 학습 없이)
+    key = "engineered" if config["engineered"] else "basic"
+    meta = {"key": key, "accuracy": 0.8}
+    model_registry._atomic_write(f"{model_registry.REGISTRY_DIR}/{key}/model.pkl", lambda f: f.write(b"model"))
+    model_registry._write_json(f"{model_registry.REGISTRY_DIR}/{key}/meta.json", meta)
+    model_registry._write_json(model_registry.LATEST_PATH, {"key": key})
+    return meta
+
+
+def _wait(job):
+    deadline = time.monotonic() + 10
+    while job.active and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.state == training_worker.DONE, job.error
+
+
+def test_resubmitting_a_finished_config_promotes_its_model(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # registry 경로는 작업 디렉터리 기준
+    monkeypatch.setattr(training_worker.data_store, "fingerprint", lambda name: "data-v1")
+    monkeypatch.setattr(training_worker, "train_once", _fake_train_once)
+    service = training_worker.TrainingService()
+    try:
+        a = service.submit({"engineered": False})
+        _wait(a)
+        b = service.submit({"engineered": True})
+        _wait(b)
+        assert model_registry.latest_meta()["key"] == "engineered"
+
+        again = service.submit({"engineered": False})
+        assert again is a and again.state == training_worker.DONE
+        assert model_registry.latest_meta()["key"] == "basic"
+    finally:
+        service.shutdown()
@@ -0,0 +1,178 @@
+# text_index.py
+# 이름 / 티켓 번호 / 객실 부분 문자열 검색용 trigram 역색인
+# - 컬럼마다 값을 사전(dictionary)으로 인코딩: 행에는 사전 번호(int32)만 두고 서로 다른 문자열은 한 번만 저장
+# - 서로 다른 문자열의 소문자 trigram(연속 3글자) → 사전 번호 목록(postings)을 정렬된 배열(CSR)로 만든다
+# - 검색어의 trigram postings 교집합으로 후보를 좁힌 뒤 실제 포함 여부를 확인하고,
+#   일치한 사전 번호를 행 비트맵(np.packbits)으로 바꿔 질의 엔진의 범주형 필터 결과와 AND 한다
+#   (검색어별 비트맵은 memory_governor 의 "searches" pool 에 캐시)
+# - 3글자 미만 검색어는 (행이 아닌) 사전 전체를 확인한다
+
+import itertools
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+import memory_governor
+
+TEXT_COLUMNS = ['Name', 'Ticket', 'Cabin']
+BUILD_CHUNK = 65_536
+_index_ids = itertools.count()
+_CHAR_MASK = (1 << 21) - 1  # 유니코드 코드 포인트 21비트
+
+
+def _trigrams(strings):
+    # pyarrow 문자열 배열 → (문자열 위치, trigram 코드) 쌍. 코드는 세 글자의 코드 포인트(21비트씩)를 이어 붙인 정수
+    width = max(3, pc.max(pc.utf8_length(strings)).as_py() or 0)
+    chars = strings.to_numpy(zero_copy_only=False).astype(f'<U{width}').view(np.uint32).reshape(len(strings), width)
+    chars = chars.astype(np.int64)
+    grams = (chars[:, :-2] << 42) | (chars[:, 1:-1] << 21) | chars[:, 2:]
+    valid = chars[:, 2:] != 0  # 문자열 끝 뒤의 빈 칸은 제외
+    positions = np.broadcast_to(np.arange(len(strings))[:, None], grams.shape)
+    return positions[valid], grams[valid]
+
+
+def _postings(ids, grams):
+    # (사전 번호, trigram) 쌍 → trigram 별로 정렬된 사전 번호 목록 (CSR: 고유 trigram, 시작 위치, 번호)
+    # 실제로 나온 글자만으로 trigram 을 촘촘한 번호로 바꿔 (trigram, 사전 번호)를 int64 하나로 만든 뒤 한 번만 정렬한다
+    # (글자 종류가 너무 많아 int64 에 담기지 않으면 lexsort)
+    chars = [(grams >> shift) & _CHAR_MASK for shift in (42, 21, 0)]
+    present = np.zeros(_CHAR_MASK + 1, dtype=bool)
+    for c in chars:
+        present[c] = True
+    alphabet = np.flatnonzero(present)
+    base, n_ids = (int(ids.min()), int(ids.max()) - int(ids.min()) + 1) if len(ids) else (0, 1)
+    if len(alphabet) ** 3 * n_ids >= 2**62:
+        order = np.lexsort((ids, grams))
+        ids, grams = ids[order], grams[order]
+        keep = np.ones(len(grams), dtype=bool)
+        keep[1:] = (grams[1:] != grams[:-1]) | (ids[1:] != ids[:-1])
+        ids, grams = ids[keep], grams[keep]
+    else:
+        rank = np.cumsum(present) - 1
+        size = len(alphabet)
+        dense = (rank[chars[0]] * size + rank[chars[1]]) * size + rank[chars[2]]
+        combined = np.sort(dense * n_ids + (ids - base))
+        combined = combined[np.append(True, combined[1:] != combined[:-1])]
+        dense, ids = np.divmod(combined, n_ids)
+        ids += base
+        letters = alphabet[np.stack([dense // (size * size), dense // size % size, dense % size])]
+        grams = (letters[0] << 42) | (letters[1] << 21) | letters[2]
+    starts = np.flatnonzero(np.append(True, grams[1:] != grams[:-1]))
+    return grams[starts], np.append(starts, len(grams)), ids.astype(np.int32)
+
+
+def _merge_postings(a, b):
+    # 두 CSR 을 trigram 기준으로 합친다. b 의 사전 번호는 모두 a 보다 크므로 a 목록 뒤에 b 목록을 두면 정렬이 유지된다
+    keys = np.union1d(a[0], b[0])
+    counts = []
+    for part_keys, offsets, _ in (a, b):
+        count = np.zeros(len(keys), dtype=np.int64)
+        count[np.searchsorted(keys, part_keys)] = np.diff(offsets)
+        counts.append(count)
+    offsets = np.concatenate([[0], np.cumsum(counts[0] + counts[1])])
+    postings = np.empty(offsets[-1], dtype=np.int32)
+    for (part_keys, part_offsets, part_postings), shift in ((a, np.zeros_like(counts[0])), (b, counts[0])):
+        sizes = np.diff(part_offsets)
+        group = np.repeat(np.searchsorted(keys, part_keys), sizes)
+        rank = np.arange(len(part_postings)) - np.repeat(part_offsets[:-1], sizes)
+        postings[offsets[group] + shift[group] + rank] = part_postings
+    return keys, offsets, postings
+
+
+class _ColumnIndex:
+    # 사전은 소문자 문자열 기준 (검색이 대소문자를 구분하지 않으므로 대소문자만 다른 값은 같은 번호)
+    def __init__(self, codes, lower, keys, offsets, postings):
+        self.codes = codes  # 행 → 사전 번호 (결측은 -1)
+        self.lower = lower  # 사전 번호 → 소문자 문자열 (pyarrow)
+        self.keys = keys
+        self.offsets = offsets
+        self.postings = postings
+
+    @classmethod
+    def empty(cls):
+        return cls(np.empty(0, dtype=np.int32), pa.array([], type=pa.large_string()),
+                   np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32))
+
+    def append(self, values):
+        # 추가된 행의 값을 기존 사전 번호로 바꾸고, 처음 보는 문자열만 사전 뒤에 붙여 trigram 을 색인한 새 색인
+        lower = pc.utf8_lower(pa.array(values, type=pa.large_string(), from_pandas=True))
+        encoded = pc.dictionary_encode(lower).combine_chunks() if isinstance(lower, pa.ChunkedArray) else pc.dictionary_encode(lower)
+        existing = pc.index_in(encoded.dictionary, value_set=self.lower)
+        is_new = existing.is_null().to_numpy(zero_copy_only=False)
+        new_strings = encoded.dictionary.filter(pa.array(is_new))
+        mapping = existing.fill_null(-1).to_numpy(zero_copy_only=False).astype(np.int64)
+        mapping[is_new] = len(self.lower) + np.arange(int(is_new.sum()))
+        mapping = np.append(mapping, -1)  # 결측(-1) 행은 그대로 -1
+        codes = mapping[encoded.indices.fill_null(-1).to_numpy(zero_copy_only=False)]
+
+        ids, grams = [], []
+        for start in range(0, len(new_strings), BUILD_CHUNK):
+            positions, chunk_grams = _trigrams(new_strings[start:start + BUILD_CHUNK])
+            ids.append(positions + len(self.lower) + start)
+            grams.append(chunk_grams)
+        added = _postings(np.concatenate(ids), np.concatenate(grams)) if ids else (
+            np.empty(0, dtype=np.int64), np.zeros(1, dtype=np.int64), np.empty(0, dtype=np.int32))
+        return _ColumnIndex(np.concatenate([self.codes, codes]).astype(np.int32),
+                            pa.concat_arrays([self.lower, new_strings]),
+                            *_merge_postings((self.keys, self.offsets, self.postings), added))
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.lower.nbytes + self.keys.nbytes + self.offsets.nbytes + self.postings.nbytes
+
+    def _candidates(self, needle):
+        # 검색어 trigram 들의 postings 교집합 (짧은 목록부터) → 후보 사전 번호
+        _, grams = _trigrams(pa.array([needle], type=pa.large_string()))
+        lists = []
+        for gram in np.unique(grams):
+            i = np.searchsorted(self.keys, gram)
+            if i == len(self.keys) or self.keys[i] != gram:
+                return np.empty(0, dtype=np.int32)
+            lists.append(self.postings[self.offsets[i]:self.offsets[i + 1]])
+        lists.sort(key=len)
+        candidates = lists[0]
+        for postings in lists[1:]:
+            candidates = np.intersect1d(candidates, postings, assume_unique=True)
+        return candidates
+
+    def match(self, needle):
+        # 부분 문자열(대소문자 무시)을 포함하는 행의 bool mask
+        needle = needle.lower()
+        if len(needle) >= 3:
+            candidates = self._candidates(needle)
+            found = pc.match_substring(self.lower.take(pa.array(candidates)), needle).to_numpy(zero_copy_only=False)
+            ids = candidates[found]
+        else:
+            ids = np.flatnonzero(pc.match_substring(self.lower, needle).to_numpy(zero_copy_only=False))
+        # 마지막 칸은 결측(-1) 행용으로 항상 False
+        hit = np.zeros(len(self.lower) + 1, dtype=bool)
+        hit[ids] = True
+        return hit[self.codes]
+
+
+class TextIndex:
+    def __init__(self, df, columns=TEXT_COLUMNS, _columns=None):
+        self.n_rows = len(df)
+        if _columns is None:
+            _columns = {col: _ColumnIndex.empty().append(df[col]) for col in columns if col in df}
+        self._columns = _columns
+        self._id = next(_index_ids)
+
+    def append(self, df):
+        # df: 기존 행 뒤에 행이 추가된 전체 프레임 → 추가된 행만 색인한 새 색인 (기존 색인은 공유 중이므로 그대로 둔다)
+        added = df.iloc[self.n_rows:]
+        return TextIndex(df, _columns={col: index.append(added[col]) for col, index in self._columns.items()})
+
+    @property
+    def columns(self):
+        return list(self._columns)
+
+    @property
+    def nbytes(self):
+        return sum(index.nbytes for index in self._columns.values())
+
+    def search(self, col, needle):
+        # col 에 needle 을 포함하는 행의 비트맵 (질의 엔진과 같은 np.packbits 형식, 검색어별 캐시)
+        return memory_governor.pool("searches").get_or_build((self._id, col, needle.lower()),
+                                                             lambda: np.packbits(self._columns[col].match(needle)))
@@ -0,0 +1,175 @@
+# train_model.py
+# 생존 예측 모델을 오프라인으로 학습해 레지스트리에 등록한다 (페이지 렌더링 중에는 학습하지 않음).
+# - 피처 후보(기본 5개 / 파생 피처 포함)마다 하이퍼파라미터를 k-fold 교차검증으로 탐색
+# - 탐색은 successive halving(HalvingGridSearchCV, 기본) 또는 전체 격자(GridSearchCV)
+# - 후보 학습은 모든 코어의 프로세스 풀에서 병렬 실행 (n_jobs=-1)
+# - 최고 모델을 전체 데이터로 다시 학습해 교차검증 지표 · 학습 시간 프로파일과 함께 등록
+#
+# 사용 예)
+#   python train_model.py
+#   python train_model.py --engineered --cv 10
+#   python train_model.py --search grid --n-jobs 4
+
+import argparse
+import time
+
+import numpy as np
+
+import model_registry
+from features import ENGINEERED_FEATURES
+from instrumentation import timed
+from model_registry import FEATURES, TARGET, prepare_features
+
+PARAM_GRID = {
+    'n_estimators': [100, 200, 400],
+    'max_depth': [None, 4, 6, 8, 12],
+    'min_samples_leaf': [1, 2, 4],
+    'max_features': ['sqrt', None],
+}
+SEARCHES = ('halving', 'grid')
+
+
+def feature_sets(engineered=False):
+    sets = [list(FEATURES)]
+    if engineered:
+        sets.append(list(FEATURES) + list(ENGINEERED_FEATURES))
+    return sets
+
+
+def _make_search(search, cv, n_jobs, seed):
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import GridSearchCV, StratifiedKFold
+
+    # 후보 단위로 프로세스에 나눠 돌리므로 각 forest 는 단일 코어로 학습 (과다 구독 방지)
+    estimator = RandomForestClassifier(random_state=seed, n_jobs=1)
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+    if search == 'grid':
+        return GridSearchCV(estimator, PARAM_GRID, scoring='accuracy', cv=folds, n_jobs=n_jobs, refit=False)
+
+    from sklearn.experimental import enable_halving_search_cv  # noqa: F401
+    from sklearn.model_selection import HalvingGridSearchCV
+    # 적은 표본으로 모든 후보를 평가한 뒤 상위 1/3 만 더 많은 표본으로 다시 평가 (조기 탈락)
+    return HalvingGridSearchCV(estimator, PARAM_GRID, scoring='accuracy', cv=folds, n_jobs=n_jobs,
+                               factor=3, refit=False, random_state=seed)
+
+
+def search_features(X, y, search='halving', cv=5, n_jobs=-1, seed=42):
+    # 한 피처 조합에 대한 하이퍼파라미터 탐색 → (최고 파라미터, 최고 점수, 탐색 요약)
+    searcher = _make_search(search, cv, n_jobs, seed)
+    start = time.perf_counter()
+    with timed("model.search"):
+        searcher.fit(X, y)
+    summary = {
+        "search": search,
+        "n_candidates": int(getattr(searcher, 'n_candidates_', [len(searcher.cv_results_['params'])])[0]),
+        "n_iterations": int(getattr(searcher, 'n_iterations_', 1)),
+        "search_time": time.perf_counter() - start,
+        "best_score": float(searcher.best_score_),
+    }
+    return dict(searcher.best_params_), summary
+
+
+def cross_validate_params(X, y, params, cv=5, n_jobs=-1, seed=42):
+    # 선택된 파라미터로 k-fold 교차검증 지표와 fold 별 학습/예측 시간을 기록
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.model_selection import StratifiedKFold, cross_validate
+
+    folds = StratifiedKFold(n_splits=cv, shuffle=True, random_state=seed)
+    with timed("model.cross_validate"):
+        scores = cross_validate(RandomForestClassifier(**params, n_jobs=1), X, y, cv=folds, n_jobs=n_jobs,
+                                scoring=['accuracy', 'roc_auc'])
+    return {
+        "cv_folds": cv,
+        "cv_accuracy_mean": float(np.mean(scores['test_accuracy'])),
+        "cv_accuracy_std": float(np.std(scores['test_accuracy'])),
+        "cv_roc_auc_mean": float(np.mean(scores['test_roc_auc'])),
+        "cv_fold_accuracy": [float(v) for v in scores['test_accuracy']],
+        "cv_fit_time_mean": float(np.mean(scores['fit_time'])),
+        "cv_score_time_mean": float(np.mean(scores['score_time'])),
+    }
+
+
+def train_best(df, data_fingerprint, search='halving', cv=5, n_jobs=-1, engineered=False, seed=42, log=print, progress=None, extra_meta=None):
+    # data_fingerprint: df 를 읽은 학습 데이터 버전 (모델이 데이터보다 오래되었는지 판단하는 기준)
+    # progress(완료 비율, 메시지): 피처 조합별 탐색 → 교차검증 → 재학습 단계마다 호출 (training_worker 의 진행률 표시용)
+    progress = progress or (lambda fraction, message: None)
+    candidates = feature_sets(engineered)
+    steps = len(candidates) + 2
+    y = df[TARGET].to_numpy()
+    best = None
+    searches = []
+    for step, features in enumerate(candidates):
+        progress(step / steps, f"하이퍼파라미터 탐색 중 ({step + 1}/{len(candidates)}): {', '.join(features)}")
+        X = prepare_features(df, features)
+        params, summary = search_features(X, y, search, cv, n_jobs, seed)
+        summary["features"] = features
+        searches.append(summary)
+        log(f"- {', '.join(features)}: 정확도 {summary['best_score']:.4f} "
+            f"(후보 {summary['n_candidates']}개, {summary['search_time']:.1f}s)")
+        if best is None or summary['best_score'] > best[2]['best_score']:
+            best = (features, params, summary)
+
+    features, params, summary = best
+    params = {**params, "random_state": seed}
+    X = prepare_features(df, features)
+    progress(len(candidates) / steps, f"{cv}-fold 교차검증 중")
+    metrics = cross_validate_params(X, y, params, cv, n_jobs, seed)
+
+    # 최종 모델은 전체 데이터로 학습 (이 때는 forest 자체를 모든 코어로 학습)
+    from sklearn.ensemble import RandomForestClassifier
+    progress((len(candidates) + 1) / steps, "전체 데이터로 재학습 중")
+    model = RandomForestClassifier(**params, n_jobs=n_jobs)
+    start = time.perf_counter()
+    with timed("model.fit"):
+        model.fit(X, y)
+    refit_time = time.perf_counter() - start
+    model.set_params(n_jobs=None)  # 예측은 요청 단위로 이뤄지므로 단일 스레드로 저장
+
+    validation = {"cv": cv, "search": search, "seed": seed}
+    key = model_registry.model_key(df, features, params, validation=validation)
+    meta = {
+        "key": key,
+        "features": features,
+        "params": params,
+        "validation": validation,
+        "n_rows": int(len(df)),
+        "data_fingerprint": data_fingerprint,
+        "trained_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        # 페이지에 표시되는 정확도는 교차검증 평균
+        "accuracy": metrics["cv_accuracy_mean"],
+        "training_time": refit_time,
+        **metrics,
+        "profile": {
+            "searches": searches,
+            "search_time_total": float(sum(s['search_time'] for s in searches)),
+            "refit_time": refit_time,
+        },
+        **(extra_meta or {}),
+    }
+    meta = model_registry.register(key, model, meta)
+    progress(1.0, "등록 완료")
+    return meta
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="타이타닉 생존 예측 모델 학습 (교차검증 + 하이퍼파라미터 탐색)")
+    parser.add_argument("--search", choices=SEARCHES, default="halving")
+    parser.add_argument("--cv", type=int, default=5, help="교차검증 fold 수")
+    parser.add_argument("--n-jobs", type=int, default=-1, help="병렬 프로세스 수 (-1: 모든 코어)")
+    parser.add_argument("--engineered", action="store_true", help="파생 피처(FamilySize, IsAlone, FarePerPerson) 조합도 탐색")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+
+    # 백그라운드 학습 서비스와 같은 경로로 실행 → 같은 설정 · 같은 데이터면 다시 학습하지 않고, 동시에 실행돼도 한 번만 학습
+    from training_worker import train_once
+    print(f"{args.cv}-fold · {args.search} 탐색")
+    config = {"search": args.search, "cv": args.cv, "engineered": args.engineered, "seed": args.seed}
+    meta = train_once(config, n_jobs=args.n_jobs, progress=lambda fraction, message: print(f"[{fraction:4.0%}] {message}"))
+    print(f"등록 완료: {meta['key']}  피처={meta['features']}")
+    print(f"교차검증 정확도 {meta['cv_accuracy_mean']:.4f} ± {meta['cv_accuracy_std']:.4f}, "
+          f"ROC AUC {meta['cv_roc_auc_mean']:.4f}")
+    print(f"파라미터 {meta['params']}  탐색 {meta['profile']['search_time_total']:.1f}s / 재학습 {meta['training_time']:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# training_worker.py
+# 백그라운드 모델 학습 서비스: 페이지는 재학습 요청만 넣고 바로 돌아가며, 진행 상황은 폴링해서 보여준다.
+# - 작업은 (학습 설정 + 학습 데이터 fingerprint) 해시로 구분 → 같은 설정의 요청은 하나의 작업으로 합쳐진다
+# - 작업은 스레드 풀에서 순서대로 실행되고, 실제 학습(train_model.train_best)은 모든 코어의 프로세스 풀을 사용한다
+# - 설정 해시별 파일 잠금 + 설정 → 모델 키 색인으로 여러 프로세스(서버 · CLI)에서도 같은 학습을 두 번 하지 않는다
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import data_store
+import model_registry
+
+CONFIG_DIR = os.path.join(model_registry.REGISTRY_DIR, "configs")
+DEFAULT_CONFIG = {"search": "halving", "cv": 5, "engineered": False, "seed": 42}
+MAX_JOBS = 20
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def normalize_config(config=None):
+    return {**DEFAULT_CONFIG, **{k: v for k, v in (config or {}).items() if k in DEFAULT_CONFIG}}
+
+
+def config_hash(config, data_fingerprint):
+    spec = json.dumps({"config": normalize_config(config), "data": data_fingerprint}, sort_keys=True)
+    return hashlib.sha256(spec.encode('utf-8')).hexdigest()[:16]
+
+
+def _config_path(h):
+    return os.path.join(CONFIG_DIR, f"{h}.json")
+
+
+def registered_meta(h):
+    # 이 설정으로 이미 학습 · 등록된 모델의 메타데이터 (없으면 None)
+    try:
+        with open(_config_path(h), encoding='utf-8') as f:
+            return model_registry.get_meta(json.load(f)["key"])
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def train_once(config=None, n_jobs=-1, progress=None, log=print):
+    # 설정 해시별 파일 잠금 안에서 학습 → 다른 프로세스가 같은 설정을 학습 중이면 끝날 때까지 기다렸다가 결과를 재사용
+    from train_model import train_best
+
+    progress = progress or (lambda fraction, message: None)
+    config = normalize_config(config)
+    # 학습할 행과 그 fingerprint 를 함께 읽는다 → 학습 중 행이 추가되어도 모델에는 실제로 학습한 버전이 기록된다
+    fingerprint, df = data_store.load_version('train')
+    h = config_hash(config, fingerprint)
+    with model_registry.file_lock(f"train-{h}"):
+        meta = registered_meta(h)
+        if meta is not None:
+            meta = model_registry.promote(meta["key"])
+            progress(1.0, "같은 설정으로 이미 학습된 모델을 사용합니다")
+            return meta
+        meta = train_best(df, fingerprint, n_jobs=n_jobs, log=log, progress=progress,
+                          extra_meta={"config_hash": h, "config": config}, **config)
+        model_registry._write_json(_config_path(h), {"key": meta["key"]})
+    return meta
+
+
+class TrainingJob:
+    def __init__(self, config, h):
+        self.config = config
+        self.config_hash = h
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = "대기 중"
+        self.log = []
+        self.meta = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def update(self, fraction, message):
+        self.progress = float(fraction)
+        self.message = message
+
+    def append_log(self, line):
+        self.log.append(line)
+
+    @property
+    def active(self):
+        return self.state in (QUEUED, RUNNING)
+
+    def as_dict(self):
+        end = self.finished_at or time.time()
+        return {
+            "config_hash": self.config_hash,
+            "config": self.config,
+            "state": self.state,
+            "progress": self.progress,
+            "message": self.message,
+            "elapsed_s": end - (self.started_at or end),
+            "model_key": self.meta["key"] if self.meta else None,
+            "accuracy": self.meta["accuracy"] if self.meta else None,
+            "error": self.error,
+        }
+
+
+class TrainingService:
+    def __init__(self, max_workers=1, n_jobs=-1):
+        # 학습 자체가 모든 코어를 쓰므로 작업은 기본적으로 한 번에 하나씩 실행
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="titanic-train")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self.n_jobs = n_jobs
+
+    def submit(self, config=None):
+        # 같은 설정 · 같은 데이터의 작업이 대기/실행 중이거나 이미 끝났으면 그 작업을 그대로 돌려준다 (실패한 작업만 다시 실행)
+        # 이미 끝난 작업은 그 모델을 다시 최신 모델로 지정한다 (A → B → A 순서로 요청하면 A 모델을 쓰도록)
+        config = normalize_config(config)
+        h = config_hash(config, data_store.fingerprint('train'))
+        with self._lock:
+            job = self._jobs.get(h)
+            if job is not None and job.state == DONE:
+                job.meta = model_registry.promote(job.meta["key"])
+                return job
+            if job is not None and job.state != FAILED:
+                return job
+            job = TrainingJob(config, h)
+            self._jobs[h] = job
+            self._jobs.move_to_end(h)
+            while len(self._jobs) > MAX_JOBS:
+                oldest = next(iter(self._jobs))
+                if self._jobs[oldest].active:
+                    break
+                self._jobs.popitem(last=False)
+        self._executor.submit(self._run, job)
+        return job
+
+    def _run(self, job):
+        job.state = RUNNING
+        job.started_at = time.time()
+        job.update(0.0, "학습 시작")
+        try:
+            job.meta = train_once(job.config, n_jobs=self.n_jobs, progress=job.update, log=job.append_log)
+            job.state = DONE
+        except Exception as e:  # 작업 실패는 상태로 보여주고 서비스는 계속 동작
+            job.error = f"{type(e).__name__}: {e}"
+            job.state = FAILED
+            job.message = "학습 실패"
+        finally:
+            job.finished_at = time.time()
+
+    def get(self, h):
+        with self._lock:
+            return self._jobs.get(h)
+
+    def jobs(self):
+        # 최근 작업부터
+        with self._lock:
+            return [job.as_dict() for job in reversed(self._jobs.values())]
+
+    def active(self):
+        with self._lock:
+            return any(job.active for job in self._jobs.values())
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
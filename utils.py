@@ -1,15 +1,175 @@
 # utils.py
+import os
+import threading
 import pandas as pd
 import streamlit as st
+import data_store
+import shared_dataset
+import features
+from query_engine import QueryEngine
+from aggregates import AggregateCube
+from summary_stats import RunningStats, NUMERIC_COLUMNS
+from chart_cache import ChartCache, chart_key
+from memory_governor import cached
+import downloads
+from instrumentation import instrument, timed
 
-@st.cache_data
+# 공유 프레임을 실수로 수정해도 다른 세션에 전파되지 않도록 Copy-on-Write 사용
+pd.set_option("mode.copy_on_write", True)
+
+# 데이터 버전(fingerprint)별로 만드는 값은 memory_governor 의 pool 에 캐시한다
+# → 모든 세션이 공유하고, pool 별 바이트 예산 / TTL 을 넘으면 오래 쓰이지 않은 버전부터 비워진다
+
+# 컬럼별 파일로 게시된 데이터셋에 mmap 으로 붙는다 → 여러 프로세스가 같은 메모리를 읽고, 세션은 복사 없이 공유
+# (원본 CSV 가 바뀌면 fingerprint 가 달라져 새 버전을 게시하고 붙는다)
+@cached("data")
+@instrument("data.load_table")
+def _load_table(name, fingerprint):
+    return shared_dataset.attach(name, fingerprint)
+
+def get_data_version():
+    return data_store.data_version()
+
+# 세션에는 얕은 복사본을 돌려준다 → 페이지에서 컬럼을 바꾸거나 추가해도 Copy-on-Write 로 공유 프레임은 그대로 유지
+@instrument("data.load_train")
 def load_train_data():
-    return pd.read_csv('data/train.csv')
+    return _load_table('train', data_store.fingerprint('train')).copy(deep=False)
 
-@st.cache_data
+@instrument("data.load_test")
 def load_test_data():
-    return pd.read_csv('data/test.csv')
+    return _load_table('test', data_store.fingerprint('test')).copy(deep=False)
 
-@st.cache_data
+@instrument("data.load_gender_submission")
 def load_gender_submission_data():
-    return pd.read_csv('data/gender_submission.csv')
+    return _load_table('gender_submission', data_store.fingerprint('gender_submission')).copy(deep=False)
+
+# 🔁 행이 추가(ingest.py)되기만 한 데이터셋은 직전 버전 결과에 추가된 행만 반영한다
+# 산출물마다 마지막으로 만든 fingerprint 만 기억하고, 그 버전의 값은 pool 에서 꺼낸다 (peek)
+# → 값은 pool 에만 있으므로 예산 / TTL 로 비워지면 실제로 놓이고, 그 뒤에는 처음부터 다시 만든다
+_latest_fingerprints = {}
+_latest_lock = threading.Lock()
+
+def _build_incremental(artifact, name, fingerprint, build, extend, peek):
+    # peek(fingerprint): 그 버전에 대해 캐시된 값 (없으면 None)
+    with _latest_lock:
+        since = _latest_fingerprints.get(artifact)
+    previous = peek(since) if since is not None else None
+    rows = data_store.appended_since(name, since, fingerprint) if previous is not None else None
+    if rows is None:
+        value = build()
+    else:
+        with timed(f"{artifact}.extend"):
+            value = extend(previous, rows)
+    with _latest_lock:
+        _latest_fingerprints[artifact] = fingerprint
+    return value
+
+# 🧩 파생 컬럼(Sex_Cat, AgeGroup, AgeGroup10, FareGroup ...)이 포함된 학습 데이터
+@cached("features")
+@instrument("features.build")
+def _build_train_features(fingerprint):
+    table = _load_table('train', fingerprint)
+    return _build_incremental("features", 'train', fingerprint, lambda: features.build_features(table),
+                              lambda previous, rows: features.extend_features(previous, table), _build_train_features.peek)
+
+# 📊 차트용 집계 큐브 (데이터셋 버전 당 한 번 생성, 페이지는 셀만 다시 묶어 사용)
+@cached("features")
+@instrument("aggregates.build")
+def _build_aggregates(fingerprint):
+    return _build_incremental("aggregates", 'train', fingerprint,
+                              lambda: AggregateCube.from_frame(_build_train_features(fingerprint)),
+                              lambda cube, rows: cube.append(rows), _build_aggregates.peek)
+
+def load_aggregates():
+    return _build_aggregates(data_store.fingerprint('train'))
+
+# 📈 수치형 요약 통계 / 상관계수 (Parquet 을 batch 단위로 스트리밍해 데이터셋 버전 당 한 번 계산)
+@cached("features")
+@instrument("stats.build")
+def _build_numeric_stats(fingerprint):
+    return _build_incremental("stats", 'train', fingerprint,
+                              lambda: RunningStats.from_chunks(data_store.iter_table('train', NUMERIC_COLUMNS)),
+                              lambda stats, rows: stats.merge(RunningStats.from_frame(rows, NUMERIC_COLUMNS)),
+                              _build_numeric_stats.peek)
+
+def load_numeric_stats():
+    return _build_numeric_stats(data_store.fingerprint('train'))
+
+# 🧠 모델 레지스트리 (학습은 train_model.py 에서 오프라인으로 수행, 페이지는 등록된 모델만 읽는다)
+@cached("models")
+def _latest_model_meta(mtime_ns):
+    import model_registry
+    return model_registry.latest_meta()
+
+def load_survival_model_meta():
+    # 새 모델이 등록되면 latest.json 의 수정 시각이 바뀌어 다시 읽는다 (없으면 None)
+    import model_registry
+    try:
+        mtime_ns = os.stat(model_registry.LATEST_PATH).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    return _latest_model_meta(mtime_ns)
+
+def is_survival_model_stale(meta):
+    # 모델을 학습한 뒤 학습 데이터에 행이 추가되었거나 바뀌었으면 True → 재학습 예약 안내
+    import model_registry
+    return model_registry.is_stale(meta, data_store.fingerprint('train'))
+
+# 🏋️ 백그라운드 학습 서비스 (프로세스 당 하나, 모든 세션이 같은 작업 큐를 공유)
+@st.cache_resource
+def get_training_service():
+    from training_worker import TrainingService
+    return TrainingService()
+
+@cached("models")
+def load_survival_model(key, engine=None):
+    # engine: model_registry.SINGLE_ENGINE (1행 예측) / BATCH_ENGINE (여러 행, 기본)
+    import model_registry
+    return model_registry.load_model(key, engine)
+
+# 💡 모델 설명 (순열 중요도 · 부분 의존도): 모델 키 · 데이터 버전별로 한 번 계산해 레지스트리에 저장하고 모든 세션이 공유
+@cached("models")
+@instrument("model.explain")
+def _model_explanation(key, features, fingerprint):
+    import explain
+    return explain.load_or_compute(key, list(features), _build_train_features(fingerprint), fingerprint)
+
+def load_model_explanation(meta):
+    return _model_explanation(meta['key'], tuple(meta['features']), data_store.fingerprint('train'))
+
+# 🔎 탑승자 검색용 비트맵 인덱스 (데이터셋 버전 당 한 번 생성)
+@cached("index")
+@instrument("query.build_index")
+def _build_query_engine(fingerprint):
+    frame = _build_train_features(fingerprint)
+    return _build_incremental("query", 'train', fingerprint, lambda: QueryEngine(frame),
+                              lambda engine, rows: engine.append(frame), _build_query_engine.peek)
+
+def load_query_engine():
+    return _build_query_engine(data_store.fingerprint('train'))
+
+# 🖼️ 차트 캐시 (모든 세션이 공유, 렌더링된 PNG 바이트를 memory_governor 의 "charts" pool 에 보관)
+@st.cache_resource
+def get_chart_cache():
+    return ChartCache()
+
+def show_chart(chart_id, build, **params):
+    # build() 는 matplotlib figure 를 만드는 함수 → 같은 데이터 버전/차트/파라미터면 캐시된 이미지를 그대로 보여준다
+    with timed(f"chart.{chart_id}"):
+        key = chart_key(get_data_version(), chart_id, params)
+        st.image(get_chart_cache().get_or_render(key, instrument(f"chart.{chart_id}.render")(build)), use_container_width=True)
+
+# 📊 Plotly 차트 (집계 값만 담은 spec 을 보내 브라우저에서 그린다 → 서버 렌더링 · 이미지 캐시 불필요)
+def show_plotly(chart_id, build):
+    with timed(f"chart.{chart_id}"):
+        st.plotly_chart(build(), use_container_width=True, key=chart_id)
+
+# 📥 다운로드 파일 내용 (데이터 버전 · 형식별로 한 번만 만들어 모든 세션이 공유)
+@cached("downloads")
+def _build_download_payload(name, fmt, fingerprint):
+    return _build_incremental(f"download.{name}.{fmt}", name, fingerprint, lambda: downloads.build_payload(name, fmt),
+                              lambda payload, rows: downloads.extend_payload(payload, fmt, rows),
+                              lambda since: _build_download_payload.peek(name, fmt, since))
+
+def load_download_payload(name, fmt='csv'):
+    return _build_download_payload(name, fmt, data_store.fingerprint(name))